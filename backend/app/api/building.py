@@ -1,6 +1,6 @@
 # app/api/building.py
 from fastapi import APIRouter, HTTPException, Query
-from app.services.building_service import fetch_nearby_buildings
+from app.services.building_service import fetch_nearby_buildings, nearby_cache
 from app.services import naver_api # 디버깅용 테스트를 위해 필요
 
 router = APIRouter(prefix="/building", tags=["building"])
@@ -20,6 +20,13 @@ async def get_nearby_buildings(latitude: float, longitude: float):
         print(f"Error in get_nearby_buildings: {e}")
         raise HTTPException(status_code=500, detail="서버 내부 오류 발생")
     
+@router.get("/cache-stats")
+async def get_nearby_cache_stats():
+    """
+    [모니터링] 주변 상가 검색 캐시 적중(fresh/stale)·미스·합쳐진 동시 요청 수
+    """
+    return nearby_cache.stats()
+
 @router.get("/test/gangnam")
 async def test_gangnam_nearby_buildings():
     """
@@ -1,48 +1,97 @@
 # app/api/coordinates.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
 import asyncio
 import json
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_async_db
 from app.services.naver_api import get_coordinates_from_address
+from app.services.db_service import zoom_band
+from app.services import coordinate_export, eligibility, eligibility_grid, geocode_backfill, geocode_cache, repository, spatial_index
 
 router = APIRouter(tags=["coordinates"])
 sub_router = APIRouter(prefix="/getcoordinates")
 
 @sub_router.get("/toORS")
-async def get_coordinates_to_ORS(db: Session = Depends(get_db)):
+async def get_coordinates_to_ORS(
+    format: str = Query("json", description="json / ndjson / f64(float64 x,y 연속 바이트) / arrow(Arrow IPC)"),
+    bbox: str | None = Query(None, description="min_x,min_y,max_x,max_y (경도/위도)"),
+    since: datetime | None = Query(None, description="이 시각 이후 추가/변경된 좌표만"),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     DB에서 유효한(변환된) WGS84 좌표(x:경도, y:위도) 목록을 조회하여 반환합니다.
     OpenRouteService 등 외부 API 활용을 위한 데이터 추출용입니다.
+    서버 측 커서로 나누어 읽으면서 바로 스트리밍하므로 행 수와 관계없이 메모리 사용량이 일정합니다.
     """
+    if not coordinate_export.is_available(format):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"지원하지 않는 형식입니다: {format} (arrow 는 pyarrow 설치 필요)")
     try:
-        # x, y가 -1.0(유효하지 않음)이 아닌 데이터만 조회
-        query = text("SELECT x, y FROM address WHERE x != -1 AND y != -1")
-        # 동기 DB 실행을 비동기로 감쌈
-        rows = await asyncio.to_thread(lambda: db.execute(query).fetchall())
-        
-        # 결과 변환 (경도: x, 위도: y)
-        results = [{"x": row[0], "y": row[1]} for row in rows]
-        return results
+        bounds = coordinate_export.parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    try:
+        chunks = await coordinate_export.stream_coordinates(db, format, bounds, since)
     except Exception as e:
-        print(f"Error in get_coordinates_to_ORS: {e}")
-        # 에러 발생 시 빈 리스트 반환 또는 HTTPException 발생 고려
-        return []
+        print(f"좌표 내보내기 중 오류 발생: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"좌표 내보내기 중 서버 오류 발생: {e}")
+
+    return StreamingResponse(chunks, media_type=coordinate_export.MEDIA_TYPES[format])
 
 
 @sub_router.get("/getPolygon")
-async def get_impossible_polygons(db: Session = Depends(get_db)):
+async def get_impossible_polygons(
+    min_x: float | None = Query(None, description="화면 영역 최소 경도"),
+    min_y: float | None = Query(None, description="화면 영역 최소 위도"),
+    max_x: float | None = Query(None, description="화면 영역 최대 경도"),
+    max_y: float | None = Query(None, description="화면 영역 최대 위도"),
+    zoom: int | None = Query(None, description="지도 줌 레벨 (단순화 정도 결정)"),
+    cursor: int = Query(0, description="이전 응답의 next_cursor"),
+    limit: int = Query(settings.POLYGON_PAGE_SIZE, ge=1, le=settings.POLYGON_PAGE_SIZE_MAX),
+    dissolved: bool = Query(False, description="겹치는 구역을 합친 합집합 레이어 사용 (화면 영역 필요)"),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
-    DB의 impossible 테이블에 있는 모든 다각형 좌표(vertices) 반환
+    DB의 impossible 테이블에 있는 다각형 좌표(vertices) 반환
     지도에 다각형 그리기용
+    - 화면 영역(min_x, min_y, max_x, max_y)을 주면 영역과 겹치는 다각형만,
+      줌 레벨에 맞게 미리 단순화된 좌표로 limit 개씩 반환 (next_cursor 로 다음 페이지 조회)
+    - dissolved=true 이면 구역마다 겹친 원본 대신 합집합 조각(impossible_coverage)의 ring 들을 반환
+      (외곽 ring 반시계, 구멍 ring 시계 방향 → nonzero 채우기로 그리면 구멍이 유지됨,
+       조각끼리 경계가 어긋나지 않도록 줌 레벨과 관계없이 단순화하지 않은 좌표)
+    - 영역을 주지 않으면 전체 다각형 원본 반환
     """
     try:
-        query = text("SELECT vertices FROM impossible")
-        rows = await asyncio.to_thread(lambda: db.execute(query).fetchall())
-        polygons = [row[0] for row in rows]
-        return {"polygons": polygons}
+        if dissolved and None not in (min_x, min_y, max_x, max_y):
+            params = {"min_x": min_x, "min_y": min_y, "max_x": max_x, "max_y": max_y,
+                      "cursor": cursor, "limit": limit}
+            rows = (await db.execute(repository.COVERAGE_IN_BBOX, params)).fetchall()
+            next_cursor = rows[-1][0] if len(rows) == limit else None
+            return {"polygons": [ring for row in rows for ring in row[1]], "next_cursor": next_cursor}
+
+        if None in (min_x, min_y, max_x, max_y):
+            query = text("SELECT vertices FROM impossible")
+            rows = (await db.execute(query)).fetchall()
+            polygons = [row[0] for row in rows]
+            return {"polygons": polygons}
+
+        band = zoom_band(zoom)
+        params = {"min_x": min_x, "min_y": min_y, "max_x": max_x, "max_y": max_y,
+                  "cursor": cursor, "limit": limit, "band": band}
+        query = repository.ZONES_IN_BBOX if band is None else repository.ZONE_LOD_IN_BBOX
+        rows = (await db.execute(query, params)).fetchall()
+        next_cursor = rows[-1][0] if len(rows) == limit else None
+        return {"polygons": [row[1] for row in rows], "next_cursor": next_cursor}
     except Exception as e:
         print(f"Error in get_impossible_polygons: {e}")
         return {"polygons": []}
@@ -55,31 +104,44 @@ router.include_router(sub_router)
 async def check_impossible(
     x: float = Query(..., description="경도 (Longitude)"),
     y: float = Query(..., description="위도 (Latitude)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     입력 좌표(x:경도, y:위도)가 DB의 impossible 다각형 중
     하나라도 포함되는지 확인하여 boolean 반환
+    (앱 시작 시 만든 메모리 인덱스로 즉시 응답, 인덱스가 없을 때만 DB 의 합집합 레이어 조회)
     """
+    index = spatial_index.get_zone_index()
+    if index is not None:
+        return {"is_inside": index.contains(x, y)}
+
     try:
-        query = text("""
-            SELECT EXISTS(
-                SELECT 1
-                FROM impossible
-                WHERE ST_Within(
-                    ST_SetSRID(ST_Point(:x, :y), 4326),
-                    polygon_geom
-                )
-            )
-        """)
-        result = await asyncio.to_thread(lambda: db.execute(query, {"x": x, "y": y}).scalar())
+        result = (await db.execute(repository.COVERAGE_CONTAINS_POINT, {"x": x, "y": y})).scalar()
         return {"is_inside": result}
     except Exception as e:
         print(f"Error in check_impossible: {e}")
         return {"is_inside": False}
 
+class PointBatch(BaseModel):
+    points: list[tuple[float, float]] = Field(..., description="[[경도, 위도], ...]")
+
+@router.post("/checkImpossible/batch")
+async def check_impossible_batch(body: PointBatch):
+    """
+    여러 좌표([경도, 위도] 목록)를 한 번에 검사하여 각 좌표의 제한 구역 포함 여부(boolean 배열) 반환
+    """
+    index = spatial_index.get_zone_index()
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="제한 구역 인덱스가 아직 준비되지 않았습니다.")
+    if not body.points:
+        return {"is_inside": []}
+    xs, ys = zip(*body.points)
+    return {"is_inside": index.contains_many(xs, ys).tolist()}
+
 @router.get("/geocode")
-async def geocode_address(db: Session = Depends(get_db)):
+async def geocode_address(db: AsyncSession = Depends(get_async_db)):
     """
     [테스트/유틸리티] DB의 상위 12개 주소에 대해 네이버 지도 API를 호출하여
     실제 좌표(WGS84 경도/위도)를 실시간으로 조회합니다.
@@ -88,7 +150,7 @@ async def geocode_address(db: Session = Depends(get_db)):
     try:
         # 테스트를 위해 상위 12개만 조회
         query = text("SELECT landlot_address, road_name_address, x, y FROM address LIMIT 12")
-        rows = await asyncio.to_thread(lambda: db.execute(query).fetchall())
+        rows = (await db.execute(query)).fetchall()
         
         if not rows:
             return {"message": "DB에서 데이터를 찾지 못했습니다."}
@@ -129,34 +191,92 @@ async def geocode_address(db: Session = Depends(get_db)):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"NAVER Maps API 좌표 변환 중 서버 오류 발생: {e}")
 
+@router.get("/geocode/backfill")
+async def get_geocode_backfill_progress():
+    """
+    [모니터링] 앱 시작 시 백그라운드로 실행되는 좌표 backfill 진행 상황을 반환합니다.
+    """
+    return geocode_backfill.get_progress()
+
+@router.get("/geocode/cache-stats")
+async def get_geocode_cache_stats():
+    """
+    [모니터링] geocode / reverse geocode 캐시 적중·미스 카운터 (캐시 크기 조정용)
+    """
+    return geocode_cache.get_stats()
+
+@router.post("/check-location/batch")
+async def check_location_batch(request: Request):
+    """
+    [입지 분석] 후보 좌표 목록의 입점 가능 여부를 한 번에 검사합니다.
+    - 입력: JSON({"points": [[경도, 위도], ...]}), CSV(text/csv, x/y 컬럼 또는 헤더 없이 경도,위도), NDJSON(application/x-ndjson)
+    - 본문 형식이 잘못되면 400 (개별 좌표 오류는 해당 줄에 "잘못된 좌표"로 표시)
+    - 출력: 입력 순서대로 한 줄에 한 좌표씩 NDJSON 스트리밍
+      (제한 구역 포함 여부와 겹치는 구역, 가장 가까운 기존 소매점과 거리)
+    """
+    if spatial_index.get_zone_index() is None or spatial_index.get_retailer_index() is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="제한 구역/소매점 인덱스가 아직 준비되지 않았습니다.")
+
+    # 본문 형식(JSON 전체 / CSV 헤더)은 응답을 시작하기 전에 확인 (스트리밍 도중 끊긴 응답 대신 400)
+    try:
+        blocks = await eligibility.open_point_blocks(request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def results():
+        async for xs, ys in blocks:
+            rows = await asyncio.to_thread(eligibility.evaluate_points, xs, ys)
+            yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@router.get("/check-location/grid")
+async def get_eligibility_grid_status():
+    """
+    [모니터링] 입점 가능 격자 상태 (셀 크기/범위/상태별 셀 수, 격자 응답·정확 계산 횟수)
+    """
+    return eligibility_grid.get_status()
+
 @router.get("/check-location/{latitude}/{longitude}")
-async def check_location_eligibility(
-    latitude: float,
-    longitude: float,
-    db: Session = Depends(get_db) # DB 연결 의존성 예시
-):
+async def check_location_eligibility(latitude: float, longitude: float):
     """
-    [입지 분석 예상] 주어진 좌표(위도, 경도)가 담배소매인 지정 가능 위치인지 확인합니다.
-    현재는 더미(Dummy) 로직으로 무조건 '가능'을 반환합니다.
-    추후 OSMnx, GeoPandas 등을 활용한 실제 분석 로직 구현이 필요합니다.
+    [입지 분석] 주어진 좌표(위도, 경도)가 담배소매인 지정 가능 위치인지 확인합니다.
+    - 제한 구역(impossible) 밖이고 기존 소매점과 RETAILER_MIN_DISTANCE_METER 이상 떨어져 있으면 가능
+    - 미리 계산한 격자의 셀 조회 한 번으로 응답하고, 셀 안에서 결과가 갈리는 경계 셀이거나
+      격자가 아직 준비되지 않은 경우에만 메모리 인덱스로 정확히 계산합니다.
     """
-    # TODO: 실제 입지 분석 로직 구현 필요 (OSMnx, GeoPandas 등 활용)
-    print(f"Checking location eligibility: Lat={latitude}, Lon={longitude}")
-    
-    # --- 더미 로직 ---
-    is_eligible = True 
-    
-    if is_eligible:
-        return {"status": "Access", "message": "해당 위치는 입점 가능합니다."}
+    code = eligibility_grid.lookup(longitude, latitude)
+    if code is not None and code != eligibility_grid.BOUNDARY:
+        eligibility_grid.stats["grid"] += 1
+        eligible = code == eligibility_grid.ELIGIBLE
+        is_restricted = code == eligibility_grid.RESTRICTED
+        source = "grid"
     else:
-        # 입점 불가능 시 400 Bad Request 반환
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, 
-            detail="해당 위치는 입점 제한 구역입니다 (예: 학교 정화구역 내)."
-        )
+        if spatial_index.get_zone_index() is None or spatial_index.get_retailer_index() is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="제한 구역/소매점 인덱스가 아직 준비되지 않았습니다.")
+        eligibility_grid.stats["exact"] += 1
+        result = eligibility.evaluate_points([longitude], [latitude])[0]
+        if "error" in result:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 좌표입니다.")
+        eligible = result["eligible"]
+        is_restricted = result["is_restricted"]
+        source = "exact"
+
+    if eligible:
+        return {"status": "Access", "message": "해당 위치는 입점 가능합니다.", "source": source}
+    # 입점 불가능 시 400 Bad Request 반환
+    if is_restricted:
+        detail = "해당 위치는 입점 제한 구역입니다."
+    else:
+        detail = f"기존 담배소매점과 {settings.RETAILER_MIN_DISTANCE_METER:g}m 이내입니다."
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
 
 @router.get("/restricted-zones")
-async def get_restricted_zones(db: Session = Depends(get_db)):
+async def get_restricted_zones(db: AsyncSession = Depends(get_async_db)):
     """
     [데이터 제공 예상] 지도에 표시할 모든 '입점 제한 구역'의 폴리곤 데이터를 반환합니다.
     프론트엔드에서 시각화할 때 사용됩니다. 현재는 더미 데이터를 반환합니다.
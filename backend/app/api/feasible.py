@@ -0,0 +1,76 @@
+# app/api/feasible.py
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+import asyncio
+
+from app.services import coordinate_export, feasible_region, tile_service
+
+router = APIRouter(prefix="/feasible-region", tags=["feasible-region"])
+
+
+async def _region_or_raise(geojson: dict | None = None, bbox: str | None = None):
+    try:
+        district = feasible_region.parse_district(geojson=geojson, bbox=coordinate_export.parse_bbox(bbox))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    try:
+        return await feasible_region.get_feasible_region(district)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+
+def _geojson_response(region) -> Response:
+    return Response(content=region.to_geojson(), media_type="application/geo+json")
+
+
+@router.get("")
+async def get_feasible_region(bbox: str = Query(..., description="min_x,min_y,max_x,max_y (경도/위도)")):
+    """
+    [입지 분석] bbox 영역 안에서 신규 소매점이 입점 가능한 영역을 GeoJSON Feature 로 반환합니다.
+    - 영역 = bbox - 제한 구역(impossible) 합집합 - 기존 소매점 RETAILER_MIN_DISTANCE_METER 반경
+    - properties: 면적(m²)/비율, 반영된 제한 구역·소매점 수, 데이터 version
+    같은 영역은 제한 구역/소매점 데이터가 바뀌기 전까지 캐시된 결과를 바로 반환합니다.
+    """
+    return _geojson_response(await _region_or_raise(bbox=bbox))
+
+
+@router.post("")
+async def post_feasible_region(request: Request):
+    """
+    [입지 분석] 구역 경계(GeoJSON Polygon/MultiPolygon, Feature, FeatureCollection) 안의 입점 가능 영역
+    (계산 방식/응답 형식은 GET /feasible-region 과 동일)
+    """
+    try:
+        geojson = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="본문은 GeoJSON 이어야 합니다.")
+    if not isinstance(geojson, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="본문은 GeoJSON 객체여야 합니다.")
+    return _geojson_response(await _region_or_raise(geojson=geojson))
+
+
+@router.get("/tiles/{z}/{x}/{y}.pbf")
+async def get_feasible_region_tile(
+    z: int, x: int, y: int,
+    bbox: str = Query(..., description="min_x,min_y,max_x,max_y (경도/위도)"),
+):
+    """
+    [입지 분석] bbox 영역의 입점 가능 영역을 벡터 타일(MVT, 레이어 이름 feasible)로 반환
+    영역 계산은 GET /feasible-region 과 같은 캐시를 사용하고, 타일은 캐시된 영역을 잘라서 만듭니다.
+    """
+    if not tile_service.is_valid_tile(z, x, y):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 타일 좌표입니다.")
+    region = await _region_or_raise(bbox=bbox)
+    try:
+        tile = await asyncio.to_thread(feasible_region.render_tile, region, z, x, y)
+    except Exception as e:
+        print(f"[feasible region] 타일 생성 중 오류 발생({z}/{x}/{y}): {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="타일 생성 실패")
+    return Response(content=tile, media_type=tile_service.MEDIA_TYPE)
+
+
+@router.get("/cache-stats")
+async def get_feasible_region_cache_stats():
+    """
+    [모니터링] 입점 가능 영역 결과 캐시 적중률
+    """
+    return feasible_region.get_stats()
@@ -1,17 +1,16 @@
-import asyncio
 import json
 import datetime
 import pandas as pd
-from fastapi import APIRouter, Request, HTTPException, status
+from fastapi import APIRouter, Request, HTTPException, Query, status
 from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.templating import Jinja2Templates
 
 from app.core.config import settings
-from app.services.ors_api import get_isochrone_polygon
+from app.services import isochrone, zone_job
 from app.services.db_service import (
     get_valid_address, 
-    is_empty_impossible_table, 
-    get_restricted_zone
+    get_restricted_zone,
+    get_restricted_zone_for_export
 )
 
 router = APIRouter(prefix="/restricted-zone", tags=["restricted-zone"])
@@ -62,53 +61,73 @@ async def test_map(request: Request):
         }
     )
 
-@router.get("/calculate")
-async def calculate_restricted_zone():
+@router.post("/calculate", status_code=status.HTTP_202_ACCEPTED)
+@router.get("/calculate", status_code=status.HTTP_202_ACCEPTED, deprecated=True)
+async def calculate_restricted_zone(
+    force: bool = Query(False, description="true 면 모든 주소를 다시 계산"),
+    method: str | None = Query(None, description="계산 방식 ors / local / buffer (없으면 ISOCHRONE_BACKEND 설정값)")
+):
     """
     [제한 구역 계산]
-    DB의 address 테이블에 저장된 데이터를 조회하여 ORS를 통해 제한 구역을 계산합니다.
-    계산한 전체 제한 구역 정보를 CSV 파일로 반환합니다.
+    DB의 address 테이블에서 제한 구역이 없거나 오래된 주소만 골라 제한 구역을 계산하는
+    백그라운드 작업을 시작합니다. 계산된 구역은 즉시 impossible 테이블에 저장되므로
+    중단되더라도 다시 실행하면 남은 주소부터 이어서 계산합니다.
+    - ors / local: 도보 isochrone (ORS API / 로컬 보행 그래프)
+    - buffer: 직선거리 원형 버퍼를 전체 주소에 한 번에 계산 (수 초 안에 전체 재생성하는 기준선)
+    저장된 구역에는 계산 방식(method)이 함께 기록됩니다.
+    진행 상황은 GET /restricted-zone/calculate/{job_id} 로 확인합니다.
+    여러 인스턴스 중 하나만 작업을 실행하며, 이미 실행 중인 작업이 있으면 (다른 인스턴스의 작업이라도) 그 상태를 반환합니다.
+    (GET /restricted-zone/calculate 는 기존 호출 호환용으로 유지하며, 같은 작업을 시작하고 상태를 반환합니다)
+    """
+    if method is not None and method not in isochrone.BACKENDS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"지원하지 않는 계산 방식입니다: {method} ({', '.join(isochrone.BACKENDS)})")
+    job = await zone_job.start_job(force=force, method=method)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                            detail="다른 인스턴스에서 제한 구역 계산 작업을 시작/종료하는 중입니다. 잠시 후 다시 시도하세요.")
+    return job.to_dict()
+
+@router.get("/calculate/{job_id}")
+async def get_calculate_job(job_id: str):
+    """
+    [제한 구역 계산] 작업 상태 및 진행률 조회 (어느 인스턴스에서 실행 중인 작업이든 조회 가능)
+    """
+    job = await zone_job.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="해당 작업을 찾을 수 없습니다.")
+    return job.to_dict()
+
+@router.delete("/calculate/{job_id}")
+async def cancel_calculate_job(job_id: str):
+    """
+    [제한 구역 계산] 실행 중인 작업 취소 (이미 저장된 구역은 유지)
+    다른 인스턴스에서 실행 중인 작업이면 취소 요청만 기록하고(cancel_requested), 실행 중인 인스턴스가 곧 취소합니다.
+    """
+    job = await zone_job.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="해당 작업을 찾을 수 없습니다.")
+    return job.to_dict()
+
+@router.get("/jobs")
+async def list_calculate_jobs():
+    """
+    [제한 구역 계산] 최근 작업 목록
+    """
+    return {"jobs": [job.to_dict() for job in await zone_job.list_jobs()]}
+
+@router.get("/export")
+async def export_restricted_zone():
+    """
+    [제한 구역 내보내기]
+    impossible 테이블의 전체 제한 구역 정보를 CSV 파일(restricted_zone.csv 형식)로 반환합니다.
     """
     try:
-        # address 테이블 데이터 조회
-        rows = await get_valid_address()
-        
+        rows = await get_restricted_zone_for_export()
         if not rows:
-            return {"message": "address 테이블에서 데이터를 찾지 못했습니다."}
-        
-        print(f"[restricted zone] address 테이블에서 총 {len(rows)}개의 위치 데이터를 가져왔습니다.")
-        
-        # impossible 테이블 데이터 존재 여부 확인
-        if not await is_empty_impossible_table():
-            return {"message": "이미 제한 구역 데이터가 존재합니다. 기존 데이터 삭제 후 다시 시도하세요."}
-        
-        csv_results = []
-        
-        for landlot_addr, longitude, latitude in rows:
-            await asyncio.sleep(3)
-            
-            # ORS를 사용해 Polygon 계산 (Shapely 객체)
-            shapely_poly = await get_isochrone_polygon(latitude, longitude)
-        
-            if shapely_poly is None:
-                print(f"[restricted zone] 제한 구역 계산 실패: address={landlot_addr}")
-                continue
-            
-            centroid = shapely_poly.centroid
-            vertices = json.dumps(list(shapely_poly.exterior.coords))
-            csv_results.append({
-                "landlot_address": landlot_addr,
-                "centroid_x": centroid.x,
-                "centroid_y": centroid.y,
-                "polygon_geom": shapely_poly.wkt,
-                "vertices": vertices
-            })
-        
-        if not csv_results:
             return {"message": "생성된 제한 구역 데이터가 없습니다."}
 
-        # CSV 파일 생성
-        df = pd.DataFrame(csv_results)
+        df = pd.DataFrame(rows, columns=["landlot_address", "centroid_x", "centroid_y", "polygon_geom", "vertices", "method"])
         timestmap = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"restricted_zone_{timestmap}.csv"
         
@@ -122,8 +141,8 @@ async def calculate_restricted_zone():
         )
     
     except Exception as e:
-        print(f"[restricted zone] 제한 구역 계산 중 오류 발생: {e}")
+        print(f"[restricted zone] 제한 구역 내보내기 중 오류 발생: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"제한 구역 계산 중 서버 오류 발생: {e}"
-        )
\ No newline at end of file
+            detail=f"제한 구역 내보내기 중 서버 오류 발생: {e}"
+        )
@@ -0,0 +1,34 @@
+# app/api/tiles.py
+from fastapi import APIRouter, HTTPException, Request, Response, status
+import asyncio
+
+from app.services import tile_service
+
+router = APIRouter(prefix="/tiles", tags=["tiles"])
+
+
+@router.get("/{layer}/{z}/{x}/{y}.pbf")
+async def get_tile(layer: str, z: int, x: int, y: int, request: Request):
+    """
+    벡터 타일(MVT) 반환
+    - layer: retailers (기존 담배소매점, address) / zones (제한 구역, impossible)
+             / coverage (겹치는 제한 구역을 합친 조각, impossible_coverage)
+    - z/x/y: XYZ 타일 좌표 (EPSG:3857)
+    테이블이 바뀌지 않은 동안은 디스크 캐시에서 바로 반환하며, ETag(데이터 version)로 304 응답을 지원합니다.
+    """
+    if layer not in tile_service.LAYERS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail=f"지원하지 않는 레이어입니다: {layer} ({', '.join(tile_service.LAYERS)})")
+    if not tile_service.is_valid_tile(z, x, y):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 타일 좌표입니다.")
+
+    try:
+        tile, version = await asyncio.to_thread(tile_service.get_tile, layer, z, x, y)
+    except Exception as e:
+        print(f"[tiles] 타일 생성 중 오류 발생({layer}/{z}/{x}/{y}): {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="타일 생성 실패")
+
+    headers = {"ETag": f'"{layer}-{version}"', "Cache-Control": "public, max-age=60"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=tile, media_type=tile_service.MEDIA_TYPE, headers=headers)
@@ -5,18 +5,75 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     # DB 설정
     DATABASE_URL: str = os.getenv("DATABASE_URL", "postgresql://Team_ten:1234@db:5432/tabaco_retail")
+    # 연결 풀: 비동기(asyncpg, API 요청) / 동기(적재, 백그라운드 스레드)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_SYNC_POOL_SIZE: int = 5
+    DB_SYNC_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SEC: float = 10.0
+    DB_POOL_RECYCLE_SEC: int = 1_800
+    DB_STATEMENT_CACHE_SIZE: int = 500 # 연결별 prepared statement 캐시 크기
     CSV_PATH: str = "/app/data/address.csv"
     ZONE_CSV_PATH: str = "/app/data/restricted_zone.csv"
     IMPOSSIBLE_CSV_PATH: str = "/app/data/impossible.csv"
 
+    # address.csv 적재 방식 ("incremental": 변경분만 반영, "full": 매번 전체 재적재)
+    ADDRESS_INGEST_MODE: str = os.getenv("ADDRESS_INGEST_MODE", "incremental")
+    # CSV 스트리밍 적재 시 한 번에 COPY 하는 행 수 (메모리 사용량 상한)
+    CSV_CHUNK_SIZE: int = 50_000
+
     # 네이버 API 설정
     NAVER_CLIENT_ID: str | None = os.getenv("NAVER_CLIENT_ID")
     NAVER_CLIENT_SECRET: str | None = os.getenv("NAVER_CLIENT_SECRET")
     NAVER_DEV_ID: str | None = os.getenv("NAVER_DEV_ID")
     NAVER_DEV_SECRET: str | None = os.getenv("NAVER_DEV_SECRET")
+
+    # 좌표 backfill (NAVER Geocoding) 설정
+    NAVER_GEOCODE_QPS: float = 10.0       # 초당 허용 요청 수 (NAVER Maps API 할당량에 맞춤)
+    GEOCODE_CONCURRENCY: int = 8          # 동시 요청 수
+    GEOCODE_MAX_RETRIES: int = 3          # 일시적 오류(429/5xx/타임아웃) 재시도 횟수
+    GEOCODE_BACKOFF_BASE_SEC: float = 0.5 # 재시도 대기 시간 기준 (지수 백오프)
+    GEOCODE_BATCH_SIZE: int = 100         # 몇 건마다 DB 커밋할지
+
+    # geocode / reverse geocode 캐시 설정
+    GEOCODE_CACHE_SIZE: int = 10_000         # 메모리 LRU 최대 항목 수
+    GEOCODE_CACHE_TTL_SEC: float = 86_400.0  # 메모리 캐시 TTL (초)
+    GEOCODE_CACHE_DB_TTL_DAYS: int = 30      # DB 캐시 유효 기간 (일)
+    REVERSE_GEOCODE_GRID_DEG: float = 0.0005 # 역지오코딩 키 격자 크기 (도, 약 50m)
     
     # ORS API
     ORS_API_KEY: str | None = os.getenv("ORS_API_KEY")
+    ORS_ISOCHRONE_PER_MINUTE: float = 20.0 # ORS isochrone 분당 허용 요청 수 (무료 플랜 기준)
+    ORS_CONCURRENCY: int = 2               # 동시 요청 수
+    ORS_MAX_RETRIES: int = 3               # 일시적 오류(429/5xx/타임아웃) 재시도 횟수
+    ORS_BACKOFF_BASE_SEC: float = 5.0      # 재시도 대기 시간 기준 (지수 백오프, 분당 할당량이라 길게)
+    ZONE_MAX_AGE_DAYS: int = 180           # 이 기간이 지난 제한 구역은 다시 계산
+    # 제한 구역 계산 작업 상태(zone_job 테이블) 기록 간격 / 이 시간 동안 기록이 없으면 실행 인스턴스가 중단된 것으로 봄
+    ZONE_JOB_SYNC_SEC: float = 2.0
+    ZONE_JOB_STALE_SEC: float = 60.0
+    # 제한 구역 CSV 교체 적재: 새 테이블로 바꿔 끼울 때 조회 쿼리가 끝나기를 기다리는 시간/재시도 횟수
+    ZONE_SWAP_LOCK_TIMEOUT_MS: int = 3_000
+    ZONE_SWAP_RETRIES: int = 10
+
+    # isochrone 계산 방식 ("ors": OpenRouteService API, "local": 로컬 보행 그래프, "buffer": 직선거리 원형 버퍼)
+    ISOCHRONE_BACKEND: str = os.getenv("ISOCHRONE_BACKEND", "ors")
+    ISOCHRONE_GRAPH_PATH: str = "/app/data/walk_graph.graphml" # GraphML 또는 엣지 목록 CSV
+    ISOCHRONE_DISTANCE_METER: float = 100.0  # 도보 거리 (ORS range 와 동일)
+    ISOCHRONE_BUFFER_METER: float = 15.0     # 도달 가능한 도로 구간을 polygon 으로 만들 때 버퍼 폭
+    ISOCHRONE_MAX_SNAP_METER: float = 100.0  # 출발점과 가장 가까운 노드 사이 허용 거리
+    ISOCHRONE_WORKERS: int = 0               # 프로세스 풀 크기 (0: 기본값, pool_workers 참고)
+    ISOCHRONE_CHUNK_SIZE: int = 50           # 워커 1회 작업당 출발점 수
+    ISOCHRONE_BATCH_SIZE: int = 500          # 계산 작업에서 한 번에 계산/저장하는 주소 수
+    ZONE_BUFFER_QUAD_SEGS: int = 8           # buffer 방식 원의 1/4 원호당 선분 수 (꼭짓점 4n+1개)
+    ZONE_BUFFER_BATCH_SIZE: int = 20_000     # buffer 방식에서 한 번에 COPY 로 저장하는 주소 수
+
+    # 외부 API 공유 HTTP 클라이언트 설정 (호스트별)
+    HTTP2_ENABLED: bool = True
+    HTTP_TIMEOUT_SEC: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SEC: float = 3.0
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 20
+    HTTP_MAX_KEEPALIVE_PER_HOST: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SEC: float = 30.0
 
     # 상가 검색 타겟 카테고리
     TARGET_CATEGORIES: list[str] = ["편의점", "카페", "음식점", "약국", "은행", "병원"]
@@ -24,4 +81,72 @@ class Settings(BaseSettings):
     # 검색 반경 (미터)
     SEARCH_RADIUS_METER: float = 50.0
 
+    # 주변 상가 검색 결과 캐시 (검색 반경 이하 크기의 geohash 셀 단위)
+    NEARBY_CACHE_SIZE: int = 5_000
+    NEARBY_CACHE_TTL_SEC: float = 600.0     # 이 시간 동안은 캐시 값 그대로 사용
+    NEARBY_CACHE_STALE_SEC: float = 3_600.0 # TTL 이후 이 시간 동안은 이전 값을 반환하며 백그라운드 갱신
+
+    # 로컬 상가(POI) 저장소: 덤프 파일(CSV/JSON, name/category/address/x/y) 및 네이버 결과 누적
+    POI_DUMP_PATH: str = "/app/data/poi.csv"
+    POI_NAVER_MIN_SAMPLES: int = 3 # 네이버 검색을 이 횟수 이상 누적한 셀은 로컬 데이터로 응답
+
+    # 지도 polygon 단순화 줌 구간: (이 줌 이하, 단순화 허용 오차(도)), 마지막 구간보다 크면 원본 사용
+    POLYGON_ZOOM_BANDS: list[tuple[int, float]] = [(12, 0.0005), (14, 0.0001), (16, 0.00002)]
+    POLYGON_PAGE_SIZE: int = 1000      # getPolygon 한 페이지 최대 polygon 수
+    POLYGON_PAGE_SIZE_MAX: int = 5000
+    # 제한 구역 합집합 레이어(impossible_coverage) 조각당 최대 꼭짓점 수 (ST_Subdivide)
+    COVERAGE_MAX_VERTICES: int = 256
+
+    # 벡터 타일(MVT) 설정
+    TILE_CACHE_DIR: str = os.getenv("TILE_CACHE_DIR", "/app/tile_cache") # 디스크 타일 캐시 위치
+    TILE_MAX_ZOOM: int = 22
+    TILE_EXTENT: int = 4096             # 타일 내부 좌표 해상도
+    TILE_BUFFER: int = 64               # 타일 경계 바깥으로 포함할 여유 (extent 단위)
+    TILE_VERSION_CHECK_SEC: float = 2.0 # data_version 조회 결과 재사용 시간
+
+    # 좌표 내보내기(/getcoordinates/toORS) 서버 측 커서에서 한 번에 읽는 행 수
+    EXPORT_BATCH_SIZE: int = 10_000
+
+    # 제한 구역/소매점 바이너리 스냅샷 (워커들이 mmap 으로 공유)
+    SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", "/app/snapshot")
+
+    # 기존 담배소매점과의 최소 직선 거리 (미터)
+    RETAILER_MIN_DISTANCE_METER: float = 50.0
+    # 일괄 입지 검사 시 한 번에 계산하는 좌표 수
+    ELIGIBILITY_BLOCK_SIZE: int = 10_000
+
+    # 입점 가능 여부 사전 계산 격자 (/check-location/{위도}/{경도})
+    ELIGIBILITY_GRID_DIR: str = os.getenv("ELIGIBILITY_GRID_DIR", "/app/eligibility_grid")
+    ELIGIBILITY_GRID_CELL_METER: float = 5.0        # 셀 크기 (작을수록 경계 셀이 줄고 파일이 커짐)
+    ELIGIBILITY_GRID_MARGIN_METER: float = 1_000.0  # 데이터 범위 바깥 여유 (범위가 조금 넓어져도 부분 갱신)
+    ELIGIBILITY_GRID_WINDOW: int = 1_024            # 한 번에 계산하는 셀 블록 크기 (행/열, 저장은 이 높이의 행 묶음 단위)
+    ELIGIBILITY_GRID_MAX_CELLS: int = 100_000_000   # 셀 수 상한 (2비트/셀 → 약 25MB, 행 묶음은 열 수 x 1024 바이트)
+
+    # 입점 가능 영역 계산 (/feasible-region, 구역 경계 - 제한 구역 - 소매점 반경)
+    FEASIBLE_WORKERS: int = 0                # 프로세스 풀 크기 (0: 기본값, pool_workers 참고)
+    FEASIBLE_MAX_AREA_KM2: float = 1_000.0   # 한 번에 계산하는 구역 면적 상한
+    FEASIBLE_QUAD_SEGS: int = 16             # 소매점 반경 원의 1/4 원호당 선분 수
+    FEASIBLE_CACHE_SIZE: int = 64            # (구역, 데이터 version) 별 결과 캐시 개수
+    FEASIBLE_CACHE_TTL_SEC: float = 86_400.0 # version 이 키에 포함되므로 길게 유지
+
+    # 프로세스 풀 기본 크기 상한 (*_WORKERS 가 0 일 때)
+    # 파드 CPU 한도(0.5 CPU / 512Mi)는 os.cpu_count() 에 반영되지 않으므로 호스트 CPU 수를 그대로 쓰지 않음
+    PROCESS_POOL_MAX_WORKERS: int = 1
+
+    # 여러 인스턴스 시작 조정 (app/core/coordination.py, advisory lock 대기 시 재시도 간격)
+    INIT_LOCK_POLL_SEC: float = 2.0
+
+    def pool_workers(self, configured: int) -> int:
+        """
+        프로세스 풀 크기: 설정값(configured)이 있으면 그대로, 0 이면
+        이 프로세스가 쓸 수 있는 CPU 수(sched_getaffinity)를 PROCESS_POOL_MAX_WORKERS 로 자른 값
+        """
+        if configured > 0:
+            return configured
+        try:
+            available = len(os.sched_getaffinity(0))
+        except AttributeError:  # sched_getaffinity 가 없는 OS
+            available = os.cpu_count() or 1
+        return max(1, min(available, self.PROCESS_POOL_MAX_WORKERS))
+
 settings = Settings()
\ No newline at end of file
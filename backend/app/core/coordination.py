@@ -0,0 +1,283 @@
+# app/core/coordination.py
+"""
+같은 DB 를 쓰는 여러 인스턴스(replica)의 앱 시작 작업 조정 (PostgreSQL 세션 advisory lock)
+
+- 초기화(스키마 보장, address/제한 구역/POI 적재)는 init lock 을 잡은 인스턴스 하나만 실행하고
+  끝나면 init_state 에 완료 지문(스키마 정의 + 입력 파일 크기/수정 시각)을 기록합니다.
+- 다른 인스턴스는
+    * 지문이 같으면 lock 없이 바로 건너뜀 (이후 재시작은 초기화 작업 전체 생략)
+    * 이전에 완료된 데이터가 있으면 그 데이터로 먼저 서비스하고, 백그라운드에서 lock 이 풀리길 기다려 인덱스만 다시 만듦
+    * 데이터가 아직 없으면(첫 배포) lock 이 풀릴 때까지 기다린 뒤 결과를 보고 건너뜀
+  lock 을 잡은 인스턴스가 도중에 죽으면 DB 가 세션 lock 을 풀어 주므로, 기다리던 인스턴스가 이어서 실행합니다.
+- 실제 적재 여부는 단계별 ingest_state(파일 해시) 가 그대로 판단하므로, 지문은 "확인 작업까지 생략" 용도입니다.
+- SharedRateLimiter: 외부 API 할당량을 인스턴스 수와 상관없이 지키도록 요청 시각을 DB(rate_limit)에서 예약합니다.
+"""
+import asyncio
+import hashlib
+import os
+import socket
+
+from sqlalchemy import text
+
+from app.core import schema
+from app.core.config import settings
+from app.core.database import sync_engine
+
+# 초기화 로직(적재 방식 등)이 바뀌면 올려서 다음 시작 때 모든 인스턴스가 다시 확인하도록 함
+INIT_VERSION = 1
+INIT_LOCK = "startup_init"
+INIT_STATE_NAME = "startup"
+# 이 앱이 쓰는 advisory lock key 공간 (2-인자 형식, 다른 앱/단일 bigint lock 과 겹치지 않게)
+LOCK_NAMESPACE = 0x534D4B  # 'SMK'
+
+TRY_LOCK = text("SELECT pg_try_advisory_lock(:namespace, hashtext(:name))")
+UNLOCK = text("SELECT pg_advisory_unlock(:namespace, hashtext(:name))")
+# 다음 요청 시각 예약: 마지막 예약 + 간격 (이미 지났으면 지금), 반환값은 기다려야 하는 초
+RESERVE_RATE_SLOT = text("""
+    INSERT INTO public.rate_limit (name, next_at) VALUES (:name, clock_timestamp())
+    ON CONFLICT (name) DO UPDATE
+    SET next_at = GREATEST(public.rate_limit.next_at + make_interval(secs => :interval), clock_timestamp())
+    RETURNING GREATEST(EXTRACT(EPOCH FROM next_at - clock_timestamp()), 0)
+""")
+SELECT_INIT_STATE = text("SELECT fingerprint FROM public.init_state WHERE name = :name")
+UPSERT_INIT_STATE = text("""
+    INSERT INTO public.init_state (name, fingerprint, completed_at, completed_by)
+    VALUES (:name, :fingerprint, now(), :completed_by)
+    ON CONFLICT (name) DO UPDATE
+    SET fingerprint = EXCLUDED.fingerprint, completed_at = EXCLUDED.completed_at, completed_by = EXCLUDED.completed_by
+""")
+
+status = {"role": "pending", "fingerprint": None}
+
+
+class AdvisoryLock:
+    """
+    세션 단위 advisory lock. 잡고 있는 동안 전용 연결을 풀에 돌려주지 않습니다.
+    (프로세스가 죽거나 연결이 끊기면 DB 가 자동으로 해제)
+    기다릴 때는 try 를 주기적으로 반복하므로 스레드가 DB 에 묶이지 않고 종료 시 바로 취소됩니다.
+    """
+
+    def __init__(self, name: str, engine=None):
+        self.name = name
+        self._engine = engine or sync_engine
+        self._conn = None
+
+    @property
+    def held(self) -> bool:
+        return self._conn is not None
+
+    def _params(self) -> dict:
+        return {"namespace": LOCK_NAMESPACE, "name": self.name}
+
+    def try_acquire(self) -> bool:
+        if self._conn is not None:
+            return True
+        conn = self._engine.connect()
+        try:
+            acquired = conn.execute(TRY_LOCK, self._params()).scalar()
+            conn.commit()  # lock 은 세션 단위라 트랜잭션이 끝나도 유지 (idle in transaction 방지)
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    async def acquire(self, poll_sec: float | None = None):
+        """
+        lock 을 잡을 때까지 poll_sec 간격으로 다시 시도
+        """
+        while not await asyncio.to_thread(self.try_acquire):
+            await asyncio.sleep(poll_sec or settings.INIT_LOCK_POLL_SEC)
+
+    def release(self):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(UNLOCK, self._params())
+            self._conn.commit()
+        except Exception:
+            # unlock 에 실패한 연결은 풀에 돌려주지 않고 버림 (세션과 함께 lock 도 해제)
+            self._conn.invalidate()
+        finally:
+            self._conn.close()
+            self._conn = None
+
+
+class SharedRateLimiter:
+    """
+    같은 DB 를 쓰는 모든 인스턴스가 함께 쓰는 요청 제한기 (TokenBucket(rate, capacity=1) 과 같은 간격)
+    요청마다 DB 에서 다음 허용 시각을 한 칸씩 예약하고 그 시각까지 기다립니다.
+    (분당 수십 건 수준의 외부 API 용, 요청마다 DB 왕복 1회)
+    """
+
+    def __init__(self, name: str, rate: float, engine=None):
+        if rate <= 0:
+            raise ValueError("rate 는 0보다 커야 합니다.")
+        self.name = name
+        self.interval = 1.0 / rate
+        self._engine = engine or sync_engine
+
+    def _reserve(self) -> float:
+        with self._engine.begin() as conn:
+            return float(conn.execute(RESERVE_RATE_SLOT, {"name": self.name, "interval": self.interval}).scalar())
+
+    async def acquire(self):
+        """
+        다음 허용 시각을 예약하고 그 시각까지 기다립니다.
+        """
+        wait = await asyncio.to_thread(self._reserve)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def _file_signature(path: str) -> str:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return f"{path}:missing"
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def init_fingerprint() -> str | None:
+    """
+    초기화 결과를 결정하는 입력의 지문 (스키마 정의 + 마이그레이션 + 입력 파일 크기/수정 시각)
+    파일 내용 해시는 단계별 ingest_state 가 따로 확인하므로 여기서는 stat 만 봅니다. (시작할 때마다 파일 전체를 읽지 않음)
+    ADDRESS_INGEST_MODE="full" 이면 매번 다시 적재해야 하므로 None
+    """
+    if settings.ADDRESS_INGEST_MODE == "full":
+        return None
+    digest = hashlib.sha256(f"init:{INIT_VERSION}".encode())
+    for statement in schema.SCHEMA_STATEMENTS + schema.INDEX_STATEMENTS:
+        digest.update(statement.encode())
+    for version, description, statements in schema.MIGRATIONS:
+        digest.update(f"{version}:{description}:{''.join(statements)}".encode())
+    for path in (settings.CSV_PATH, settings.ZONE_CSV_PATH, settings.POI_DUMP_PATH):
+        digest.update(_file_signature(path).encode())
+    return digest.hexdigest()
+
+
+def _load_fingerprint() -> str | None:
+    """
+    마지막으로 완료된 초기화 지문 (init_state 테이블이 아직 없으면 None)
+    """
+    with sync_engine.connect() as conn:
+        if not conn.execute(text("SELECT to_regclass('public.init_state') IS NOT NULL")).scalar():
+            return None
+        return conn.execute(SELECT_INIT_STATE, {"name": INIT_STATE_NAME}).scalar()
+
+
+def _save_fingerprint(fingerprint: str):
+    with sync_engine.begin() as conn:
+        conn.execute(UPSERT_INIT_STATE, {"name": INIT_STATE_NAME, "fingerprint": fingerprint,
+                                         "completed_by": socket.gethostname()})
+
+
+async def _run_as_leader(lock: AdvisoryLock, fingerprint: str | None, initialize) -> bool:
+    """
+    lock 을 잡은 상태에서 실행. 기다리는 동안 다른 인스턴스가 끝냈으면 건너뜀
+    (완료 기록 조회/저장 오류는 기록만 하고 초기화는 그대로 진행)
+    - return: 초기화 작업을 실제로 실행했는지
+    """
+    try:
+        try:
+            done = fingerprint is not None and await asyncio.to_thread(_load_fingerprint) == fingerprint
+        except Exception as e:
+            print(f"❌ 초기화 완료 기록 조회 중 오류 발생: {e}")
+            done = False
+        if done:
+            print("⏭️ 다른 인스턴스가 초기화를 마쳤습니다. → 기존 데이터를 사용합니다.")
+            return False
+        status["role"] = "leader"
+        print(f"🔐 초기화 lock 획득 ({socket.gethostname()}) → 스키마/데이터 적재를 실행합니다.")
+        ok = await initialize()
+        if not ok:
+            print("⚠️ 초기화 단계 중 실패가 있어 완료 기록을 남기지 않습니다. (다음 시작 때 다시 실행)")
+        elif fingerprint is not None:
+            try:
+                await asyncio.to_thread(_save_fingerprint, fingerprint)
+            except Exception as e:
+                print(f"❌ 초기화 완료 기록 저장 중 오류 발생: {e}")
+        return True
+    finally:
+        await asyncio.to_thread(lock.release)
+
+
+async def _follow(lock: AdvisoryLock, fingerprint: str | None, initialize, on_updated):
+    """
+    [백그라운드] 실행 중인 인스턴스가 끝나길 기다렸다가 바뀐 데이터로 메모리 인덱스를 다시 만듦
+    """
+    try:
+        await lock.acquire()
+        await _run_as_leader(lock, fingerprint, initialize)
+        if status["role"] == "follower":
+            status["role"] = "follower-synced"
+        await on_updated()
+    except asyncio.CancelledError:
+        await asyncio.to_thread(lock.release)
+        raise
+    except Exception as e:
+        print(f"초기화 완료 대기 중 오류 발생: {e}")
+
+
+_follower_task: asyncio.Task | None = None
+
+
+async def run_initialization(initialize, on_updated) -> str:
+    """
+    [앱 시작 시 실행] 여러 인스턴스 중 하나만 initialize() 를 실행하도록 조정합니다.
+    - initialize: 모든 단계가 성공하면 True 를 반환하는 코루틴 함수
+    - on_updated: 다른 인스턴스가 데이터를 바꾼 뒤 이 인스턴스에서 실행할 코루틴 함수 (메모리 인덱스 재생성)
+    - return: skipped(지문 일치) / leader(직접 실행) / waited(기다린 뒤 결과 사용) / follower(기존 데이터로 먼저 서비스)
+              / uncoordinated(DB 오류로 lock 없이 실행)
+    """
+    global _follower_task
+    fingerprint = await asyncio.to_thread(init_fingerprint)
+    status["fingerprint"] = fingerprint
+    lock = AdvisoryLock(INIT_LOCK)
+    try:
+        previous = await asyncio.to_thread(_load_fingerprint)
+        if fingerprint is not None and previous == fingerprint:
+            print("⏭️ 스키마/입력 파일 변경 없음 (init_state) → 초기화 작업을 건너뜁니다.")
+            status["role"] = "skipped"
+            return status["role"]
+
+        if await asyncio.to_thread(lock.try_acquire):
+            status["role"] = "skipped"
+        elif previous is not None:
+            print("⏳ 다른 인스턴스가 초기화 중입니다. → 기존 데이터로 먼저 서비스하고, 완료되면 인덱스를 다시 만듭니다.")
+            status["role"] = "follower"
+            _follower_task = asyncio.create_task(_follow(lock, fingerprint, initialize, on_updated))
+            return status["role"]
+        else:
+            print("⏳ 다른 인스턴스가 첫 초기화 중입니다. → 완료될 때까지 기다립니다.")
+            await lock.acquire()
+            status["role"] = "waited"
+    except Exception as e:
+        # DB 에 접속할 수 없는 등 조정 자체가 실패하면 이전처럼 각 단계를 실행 (단계마다 오류를 기록하고 넘어감)
+        print(f"❌ 초기화 조정(advisory lock) 중 오류 발생: {e} → lock 없이 초기화 단계를 실행합니다.")
+        await asyncio.to_thread(lock.release)
+        status["role"] = "uncoordinated"
+        await initialize()
+        return status["role"]
+
+    await _run_as_leader(lock, fingerprint, initialize)
+    return status["role"]
+
+
+async def stop():
+    """
+    [앱 종료 시 실행] 완료 대기 중인 백그라운드 태스크 취소 (잡고 있던 lock 도 해제)
+    """
+    if _follower_task is not None and not _follower_task.done():
+        _follower_task.cancel()
+        try:
+            await _follower_task
+        except asyncio.CancelledError:
+            pass
+
+
+def get_status() -> dict:
+    return dict(status)
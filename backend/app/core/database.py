@@ -1,26 +1,62 @@
 # app/core/database.py
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from typing import Generator
+from typing import AsyncGenerator
 from app.core.config import settings
 
-# --- SQLAlchemy 엔진 및 세션 설정 (FastAPI 비동기 환경에 맞게 조정) ---
-# 동기 엔진 생성 (FastAPI에서 직접 사용하지 않고, asyncio.to_thread로 감싸서 사용)
-DATABASE_URL = "postgresql://Team_ten:1234@db:5432/tabaco_retail"
-sync_engine = create_engine(DATABASE_URL) 
+# --- SQLAlchemy 엔진 및 세션 설정 ---
+DATABASE_URL = settings.DATABASE_URL
+
+# 동기 엔진: 앱 시작 시 CSV COPY 적재, 백그라운드 작업(스레드)에서 사용
+sync_engine = create_engine(
+    DATABASE_URL,
+    pool_size=settings.DB_SYNC_POOL_SIZE,
+    max_overflow=settings.DB_SYNC_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SEC,
+    pool_recycle=settings.DB_POOL_RECYCLE_SEC,
+    pool_pre_ping=True,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
 
+# 비동기 엔진 (asyncpg): API 요청 처리용. 스레드 풀을 거치지 않고 이벤트 루프에서 바로 DB 호출
+ASYNC_DATABASE_URL = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SEC,
+    pool_recycle=settings.DB_POOL_RECYCLE_SEC,
+    pool_pre_ping=True,
+    # 연결별 prepared statement 캐시 (같은 쿼리 반복 시 parse/plan 생략)
+    connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
 # --- DB 의존성 주입 함수 (실제 DB 연결 사용) ---
 def get_db():
     """
-    SQLAlchemy 세션 객체를 제공하고 요청 완료 후 닫습니다.
-    비동기 컨텍스트에서 동기 DB 작업을 위해 asyncio.to_thread를 사용합니다.
+    SQLAlchemy 세션 객체를 제공하고 요청 완료 후 닫습니다. (동기, asyncio.to_thread 와 함께 사용)
     """
     db = SessionLocal()
     try:
-        # 이 시점에서 DB 연결이 실제로 이루어짐 (session.connection() 등)
-        print("Database session acquired.")
         yield db
     finally:
         db.close()
-        print("Database session closed.")
\ No newline at end of file
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    비동기 세션(asyncpg)을 제공하고 요청 완료 후 닫습니다.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_engines():
+    """
+    [앱 종료 시 실행] 연결 풀 정리
+    """
+    await async_engine.dispose()
+    sync_engine.dispose()
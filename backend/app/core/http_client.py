@@ -0,0 +1,74 @@
+# app/core/http_client.py
+import httpx
+
+from app.core.config import settings
+
+# 외부 API 호스트별 클라이언트 (호스트마다 연결 풀/연결 수 제한을 따로 둠)
+NAVER_MAPS = "naver_maps"       # maps.apigw.ntruss.com (Geocoding / Reverse Geocoding)
+NAVER_SEARCH = "naver_search"   # openapi.naver.com (지역 검색)
+ORS = "ors"                     # api.openrouteservice.org (Isochrone)
+
+CLIENT_NAMES = (NAVER_MAPS, NAVER_SEARCH, ORS)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HTTPClientManager:
+    """
+    앱 전체에서 공유하는 httpx.AsyncClient 관리자
+    - FastAPI lifespan 에서 start() / close() 호출
+    - keep-alive 연결 재사용으로 요청마다 TCP/TLS 연결 비용 제거
+    - 호스트별 연결 수 제한, HTTP/2 (h2 패키지 설치 시), 타임아웃은 settings 로 조정
+    """
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _create_client(self) -> httpx.AsyncClient:
+        http2 = settings.HTTP2_ENABLED and _http2_available()
+        return httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(settings.HTTP_TIMEOUT_SEC, connect=settings.HTTP_CONNECT_TIMEOUT_SEC),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_PER_HOST,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SEC,
+            ),
+        )
+
+    async def start(self):
+        """
+        [앱 시작 시 실행] 호스트별 클라이언트 생성
+        """
+        if settings.HTTP2_ENABLED and not _http2_available():
+            print("⚠️ h2 패키지가 없어 HTTP/1.1 로 동작합니다. (pip install 'httpx[http2]')")
+        for name in CLIENT_NAMES:
+            if name not in self._clients:
+                self._clients[name] = self._create_client()
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """
+        이름에 해당하는 공유 클라이언트 반환 (lifespan 밖에서 호출되면 그 자리에서 생성)
+        """
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create_client()
+            self._clients[name] = client
+        return client
+
+    async def close(self):
+        """
+        [앱 종료 시 실행] 모든 연결 정리
+        """
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+http_clients = HTTPClientManager()
@@ -0,0 +1,373 @@
+# app/core/schema.py
+from sqlalchemy import text
+
+from app.core.database import sync_engine
+
+# 합집합 레이어 격자 칸 크기 (도, 약 1km). 바꾸면 impossible_coverage 를 전체 다시 계산해야 합니다.
+COVERAGE_CELL_DEG = 0.01
+
+# --- 앱 시작 시 보장해야 하는 스키마 (db/db/init_db.sql 과 동일하게 유지) ---
+# 모든 구문은 멱등(IF NOT EXISTS)이어야 합니다.
+SCHEMA_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS postgis",
+    """
+    CREATE TABLE IF NOT EXISTS public.address (
+      landlot_address VARCHAR(500) NOT NULL,
+      road_name_address VARCHAR(500),
+      x DOUBLE PRECISION NOT NULL,
+      y DOUBLE PRECISION NOT NULL,
+      geom geometry(Point, 4326) GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(x, y), 4326)) STORED,
+      row_hash VARCHAR(64),
+      updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    "ALTER TABLE public.address ADD COLUMN IF NOT EXISTS row_hash VARCHAR(64)",
+    "ALTER TABLE public.address ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()",
+    """
+    CREATE TABLE IF NOT EXISTS public.impossible (
+      landlot_address VARCHAR(500) NOT NULL,
+      centroid_x DOUBLE PRECISION,
+      centroid_y DOUBLE PRECISION,
+      polygon_geom geometry(Polygon, 4326),
+      vertices JSONB
+    )
+    """,
+    "ALTER TABLE public.impossible ADD COLUMN IF NOT EXISTS origin_x DOUBLE PRECISION",
+    "ALTER TABLE public.impossible ADD COLUMN IF NOT EXISTS origin_y DOUBLE PRECISION",
+    "ALTER TABLE public.impossible ADD COLUMN IF NOT EXISTS computed_at TIMESTAMPTZ NOT NULL DEFAULT now()",
+    "ALTER TABLE public.impossible ADD COLUMN IF NOT EXISTS id BIGINT GENERATED BY DEFAULT AS IDENTITY",
+    # 계산 방식 (ors / local / buffer / csv, 이전에 저장된 구역은 NULL)
+    "ALTER TABLE public.impossible ADD COLUMN IF NOT EXISTS method VARCHAR(16)",
+    # 계산 대상 매장 (address.row_hash, 같은 지번 주소를 쓰는 매장도 구역을 따로 가짐 / CSV 로 적재한 구역은 NULL)
+    "ALTER TABLE public.impossible ADD COLUMN IF NOT EXISTS address_row_hash VARCHAR(64)",
+    """
+    CREATE TABLE IF NOT EXISTS public.impossible_lod (
+      impossible_id BIGINT NOT NULL,
+      zoom_band SMALLINT NOT NULL,
+      geom geometry(Polygon, 4326) NOT NULL,
+      PRIMARY KEY (zoom_band, impossible_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS public.ingest_state (
+      source VARCHAR(100) PRIMARY KEY,
+      content_hash VARCHAR(64) NOT NULL,
+      row_count INTEGER NOT NULL,
+      loaded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS public.geocode_cache (
+      kind VARCHAR(16) NOT NULL,
+      cache_key VARCHAR(500) NOT NULL,
+      payload JSONB NOT NULL,
+      updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+      PRIMARY KEY (kind, cache_key)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS public.poi (
+      id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+      name VARCHAR(500) NOT NULL,
+      category VARCHAR(200),
+      address VARCHAR(500) NOT NULL DEFAULT '',
+      x DOUBLE PRECISION NOT NULL,
+      y DOUBLE PRECISION NOT NULL,
+      geom geometry(Point, 4326) GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(x, y), 4326)) STORED,
+      source VARCHAR(16) NOT NULL,
+      updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS public.poi_coverage (
+      cell VARCHAR(12) PRIMARY KEY,
+      source VARCHAR(16) NOT NULL,
+      samples INTEGER NOT NULL DEFAULT 0,
+      updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS public.schema_migrations (
+      version INTEGER PRIMARY KEY,
+      description VARCHAR(200) NOT NULL,
+      applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS public.init_state (
+      name VARCHAR(100) PRIMARY KEY,
+      fingerprint VARCHAR(64) NOT NULL,
+      completed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+      completed_by VARCHAR(255)
+    )
+    """,
+    # 제한 구역 계산 작업 상태 (app/services/zone_job.py, 어느 인스턴스에서든 조회/취소 요청)
+    """
+    CREATE TABLE IF NOT EXISTS public.zone_job (
+      id VARCHAR(32) PRIMARY KEY,
+      status VARCHAR(16) NOT NULL,
+      force BOOLEAN NOT NULL DEFAULT false,
+      method VARCHAR(16) NOT NULL,
+      total INTEGER NOT NULL DEFAULT 0,
+      succeeded INTEGER NOT NULL DEFAULT 0,
+      failed INTEGER NOT NULL DEFAULT 0,
+      retried INTEGER NOT NULL DEFAULT 0,
+      error TEXT,
+      owner VARCHAR(255),
+      cancel_requested BOOLEAN NOT NULL DEFAULT false,
+      created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+      started_at TIMESTAMPTZ,
+      finished_at TIMESTAMPTZ,
+      updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    # 여러 인스턴스가 함께 쓰는 외부 API 요청 제한 (app/core/coordination.SharedRateLimiter, 다음 허용 시각)
+    """
+    CREATE TABLE IF NOT EXISTS public.rate_limit (
+      name VARCHAR(100) PRIMARY KEY,
+      next_at TIMESTAMPTZ NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS public.data_version (
+      table_name VARCHAR(100) PRIMARY KEY,
+      version BIGINT NOT NULL DEFAULT 0,
+      updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    """
+    CREATE OR REPLACE FUNCTION public.bump_data_version() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+      INSERT INTO public.data_version (table_name, version, updated_at)
+      VALUES (TG_TABLE_NAME, 1, now())
+      ON CONFLICT (table_name)
+      DO UPDATE SET version = public.data_version.version + 1, updated_at = now();
+      RETURN NULL;
+    END;
+    $$
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_address_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.address
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_data_version()
+    """,
+    # DB 별 고유 식별자 (DB 를 새로 만들면 바뀜, data_version 과 함께 스냅샷 파일 이름에 사용)
+    """
+    CREATE TABLE IF NOT EXISTS public.db_identity (
+      singleton BOOLEAN PRIMARY KEY DEFAULT true CHECK (singleton),
+      token UUID NOT NULL DEFAULT gen_random_uuid(),
+      created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+    """,
+    "INSERT INTO public.db_identity DEFAULT VALUES ON CONFLICT DO NOTHING",
+    # 제한 구역 합집합(dissolve) 레이어: COVERAGE_CELL_DEG 격자 칸별로 ST_Union 후 ST_Subdivide 한 조각
+    """
+    CREATE TABLE IF NOT EXISTS public.impossible_coverage (
+      id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+      cell_x INTEGER NOT NULL,
+      cell_y INTEGER NOT NULL,
+      geom geometry(Polygon, 4326) NOT NULL
+    )
+    """,
+    # impossible 이 바뀐 격자 칸 (트리거가 기록, db_service.refresh_coverage 가 다시 계산 후 비움)
+    """
+    CREATE TABLE IF NOT EXISTS public.impossible_coverage_dirty (
+      cell_x INTEGER NOT NULL,
+      cell_y INTEGER NOT NULL,
+      PRIMARY KEY (cell_x, cell_y)
+    )
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION public.coverage_cells(g geometry)
+    RETURNS TABLE (cell_x INTEGER, cell_y INTEGER)
+    LANGUAGE sql IMMUTABLE AS $$
+      SELECT cx, cy
+      FROM generate_series(floor(ST_XMin(g) / {COVERAGE_CELL_DEG})::int, floor(ST_XMax(g) / {COVERAGE_CELL_DEG})::int) cx,
+           generate_series(floor(ST_YMin(g) / {COVERAGE_CELL_DEG})::int, floor(ST_YMax(g) / {COVERAGE_CELL_DEG})::int) cy
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION public.mark_coverage_dirty() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+      IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.polygon_geom IS NOT NULL THEN
+        INSERT INTO public.impossible_coverage_dirty (cell_x, cell_y)
+        SELECT * FROM public.coverage_cells(OLD.polygon_geom)
+        ON CONFLICT DO NOTHING;
+      END IF;
+      IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.polygon_geom IS NOT NULL THEN
+        INSERT INTO public.impossible_coverage_dirty (cell_x, cell_y)
+        SELECT * FROM public.coverage_cells(NEW.polygon_geom)
+        ON CONFLICT DO NOTHING;
+      END IF;
+      RETURN NULL;
+    END;
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION public.clear_coverage() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+      DELETE FROM public.impossible_coverage;
+      DELETE FROM public.impossible_coverage_dirty;
+      RETURN NULL;
+    END;
+    $$
+    """,
+]
+
+# impossible 테이블 트리거 (테이블 교체 적재 후 새 테이블에 다시 만들어야 하므로 따로 둠, db_service._swap_in_impossible)
+IMPOSSIBLE_TRIGGER_STATEMENTS = [
+    """
+    CREATE OR REPLACE TRIGGER trg_impossible_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.impossible
+    FOR EACH STATEMENT EXECUTE FUNCTION public.bump_data_version()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_impossible_coverage_dirty
+    AFTER INSERT OR UPDATE OF polygon_geom OR DELETE ON public.impossible
+    FOR EACH ROW EXECUTE FUNCTION public.mark_coverage_dirty()
+    """,
+    """
+    CREATE OR REPLACE TRIGGER trg_impossible_coverage_truncate
+    AFTER TRUNCATE ON public.impossible
+    FOR EACH STATEMENT EXECUTE FUNCTION public.clear_coverage()
+    """,
+]
+SCHEMA_STATEMENTS += IMPOSSIBLE_TRIGGER_STATEMENTS
+
+
+# --- 인덱스: 스키마 보장 시 + 매 CSV 적재 후 다시 확인 (ensure_indexes) ---
+# 부분 인덱스 조건은 app/services/repository.py 의 쿼리 조건과 같아야 합니다.
+INDEX_STATEMENTS = [
+    # 유효 좌표만 (x/y = -1 은 geocoding 전 행, address 의 geom 조회는 모두 이 조건을 포함)
+    "CREATE INDEX IF NOT EXISTS idx_address_valid_geom ON public.address USING GIST (geom) WHERE x != -1 AND y != -1",
+    # 좌표 backfill 대상
+    "CREATE INDEX IF NOT EXISTS idx_address_missing_coords ON public.address (row_hash) WHERE (x = -1 OR y = -1)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_address_row_hash ON public.address (row_hash)",
+    "CREATE INDEX IF NOT EXISTS idx_address_landlot_address ON public.address (landlot_address)",
+    "CREATE INDEX IF NOT EXISTS idx_address_updated_at ON public.address (updated_at)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_impossible_id ON public.impossible (id)",
+    "CREATE INDEX IF NOT EXISTS idx_impossible_geom ON public.impossible USING GIST (polygon_geom)",
+    "CREATE INDEX IF NOT EXISTS idx_impossible_landlot_address ON public.impossible (landlot_address)",
+    "CREATE INDEX IF NOT EXISTS idx_impossible_address_row_hash ON public.impossible (address_row_hash)",
+    "CREATE INDEX IF NOT EXISTS idx_impossible_lod_geom ON public.impossible_lod USING GIST (geom)",
+    "CREATE INDEX IF NOT EXISTS idx_impossible_coverage_geom ON public.impossible_coverage USING GIST (geom)",
+    "CREATE INDEX IF NOT EXISTS idx_impossible_coverage_cell ON public.impossible_coverage (cell_x, cell_y)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_poi_name_address ON public.poi (name, address)",
+    "CREATE INDEX IF NOT EXISTS idx_poi_geom ON public.poi USING GIST (geom)",
+]
+
+# --- 버전 관리 마이그레이션 (schema_migrations 에 기록, 한 번만 실행) ---
+# IF NOT EXISTS 로 표현할 수 없는 변경(인덱스 교체, 데이터 정리 등)만 여기에 추가합니다.
+MIGRATIONS = [
+    (1, "address.row_hash 인덱스를 unique 인덱스로 교체", [
+        # 같은 지문이 여러 번 들어간 행이 있으면 하나만 남김 (unique 인덱스 생성 전)
+        """
+        DELETE FROM public.address a
+        USING public.address b
+        WHERE a.row_hash = b.row_hash AND a.ctid > b.ctid
+        """,
+        "DROP INDEX IF EXISTS public.idx_address_row_hash",
+    ]),
+    (2, "기존 제한 구역으로 합집합 레이어(impossible_coverage) 계산 예약", [
+        """
+        INSERT INTO public.impossible_coverage_dirty (cell_x, cell_y)
+        SELECT DISTINCT c.cell_x, c.cell_y
+        FROM public.impossible i, public.coverage_cells(i.polygon_geom) c
+        WHERE i.polygon_geom IS NOT NULL
+        ON CONFLICT DO NOTHING
+        """,
+    ]),
+    (3, "address 전체 GIST 인덱스 제거 (유효 좌표 부분 인덱스와 중복)", [
+        "DROP INDEX IF EXISTS public.idx_address_geom",
+    ]),
+    (4, "계산된 제한 구역을 계산 당시 좌표가 같은 매장(address.row_hash)에 연결", [
+        """
+        UPDATE public.impossible i
+        SET address_row_hash = a.row_hash
+        FROM public.address a
+        WHERE i.address_row_hash IS NULL
+          AND i.origin_x IS NOT NULL
+          AND a.row_hash IS NOT NULL
+          AND a.landlot_address = i.landlot_address
+          AND a.x = i.origin_x AND a.y = i.origin_y
+        """,
+    ]),
+]
+
+
+def _has_legacy_address_table(conn) -> bool:
+    """
+    예전 pandas.to_sql 로 만들어진 address 테이블(geom 컬럼 없음)인지 확인합니다.
+    """
+    columns = conn.execute(text("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = 'address'
+    """)).scalars().all()
+    return bool(columns) and "geom" not in columns
+
+
+def ensure_schema():
+    """
+    [앱 시작 시 실행]
+    필요한 테이블/컬럼/인덱스가 존재하도록 보장하고, 아직 적용되지 않은 마이그레이션을 실행합니다.
+    to_sql 로 재생성되어 geom 컬럼과 GIST 인덱스가 사라진 address 테이블은 한 번만 다시 만듭니다.
+    """
+    try:
+        with sync_engine.begin() as conn:
+            if _has_legacy_address_table(conn):
+                print("🛠️ geom 컬럼이 없는 address 테이블 발견 → init_db.sql 스키마로 재생성합니다.")
+                conn.execute(text("DROP TABLE public.address CASCADE"))
+                if _table_exists(conn, "ingest_state"):
+                    conn.execute(text("DELETE FROM public.ingest_state WHERE source = 'address'"))
+            for statement in SCHEMA_STATEMENTS:
+                conn.execute(text(statement))
+            _apply_migrations(conn)
+            _create_indexes(conn)
+        print("✅ DB 스키마 확인 완료.")
+        return True
+    except Exception as e:
+        print(f"❌ DB 스키마 확인 중 오류 발생: {e}")
+        return False
+
+
+def _table_exists(conn, table_name: str) -> bool:
+    return conn.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f"public.{table_name}"}
+    ).scalar()
+
+
+def _apply_migrations(conn):
+    applied = set(conn.execute(text("SELECT version FROM public.schema_migrations")).scalars().all())
+    for version, description, statements in MIGRATIONS:
+        if version in applied:
+            continue
+        for statement in statements:
+            conn.execute(text(statement))
+        conn.execute(
+            text("INSERT INTO public.schema_migrations (version, description) VALUES (:version, :description)"),
+            {"version": version, "description": description}
+        )
+        print(f"🛠️ 마이그레이션 {version} 적용: {description}")
+
+
+def _create_indexes(conn):
+    for statement in INDEX_STATEMENTS:
+        conn.execute(text(statement))
+
+
+def ensure_indexes(conn=None):
+    """
+    [CSV 적재 후 실행] 공간(GIST)/B-tree 인덱스가 모두 있는지 확인하고 없으면 만듭니다.
+    conn 을 주면 그 트랜잭션 안에서 실행합니다.
+    """
+    if conn is not None:
+        _create_indexes(conn)
+        return
+    try:
+        with sync_engine.begin() as conn:
+            _create_indexes(conn)
+    except Exception as e:
+        print(f"❌ 인덱스 확인 중 오류 발생: {e}")
@@ -3,23 +3,56 @@ from contextlib import asynccontextmanager
 import asyncio
 
 from app.core.config import settings
-from app.api import building, coordinates, restricted_zone
-from app.services import db_service
+from app.api import building, coordinates, feasible, restricted_zone, tiles
+from app.core import coordination, schema
+from app.core.database import dispose_engines
+from app.core.http_client import http_clients
+from app.services import db_service, eligibility_grid, feasible_region, geocode_backfill, local_isochrone, poi_store, spatial_index, zone_job
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 
 
+async def initialize_data() -> bool:
+    """
+    [init lock 을 잡은 인스턴스만 실행] 스키마 보장 + CSV/덤프 적재 (모든 단계가 성공하면 True)
+    """
+    ok = await asyncio.to_thread(schema.ensure_schema) # 테이블/인덱스 보장
+    ok = await asyncio.to_thread(db_service.initialize_address_table) and ok  # address 테이블 채우기
+    ok = await db_service.initialize_restricted_zone() and ok # 제한 구역 CSV 데이터 저장
+    ok = await poi_store.initialize_poi_store() and ok # 로컬 상가(POI) 덤프 적재
+    return ok
+
+
+async def reload_indexes():
+    """
+    다른 인스턴스가 적재를 마친 뒤 메모리 인덱스/격자를 새 데이터로 갱신
+    """
+    await spatial_index.rebuild_indexes()
+    eligibility_grid.request_sync()
+
+
 # --- FastAPI 이벤트 훅 (앱 시작/종료 시 실행) ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 앱 시작 시 실행
     print("🚀 FastAPI 시작!")
-    await asyncio.to_thread(db_service.initialize_address_table)  # address 테이블 채우기
-    await db_service.fill_missing_coordinates() # 비어 있는 좌표 채우기
-    await db_service.initialize_restricted_zone() # 제한 구역 CSV 데이터 저장
+    await http_clients.start() # 외부 API 공유 HTTP 클라이언트
+    # 스키마/데이터 적재: 여러 인스턴스 중 하나만 실행 (advisory lock), 완료 기록(init_state)이 같으면 생략
+    await coordination.run_initialization(initialize_data, on_updated=reload_indexes)
+    await spatial_index.rebuild_indexes() # 제한 구역/소매점 메모리 인덱스 (버전별 스냅샷 mmap)
+    eligibility_grid.request_sync() # 입점 가능 격자 (백그라운드, 바뀐 구역/소매점 주변만 다시 계산)
     # await asyncio.to_thread(db_service.initialize_impossible_table) # impossible 테이블 채우기
+    geocode_backfill.start_background_backfill() # 비어 있는 좌표 채우기 (백그라운드, 한 인스턴스만, 진행 상황: /geocode/backfill)
     yield
     # 앱 종료 시 실행
+    await coordination.stop()
+    await geocode_backfill.stop_background_backfill()
+    await zone_job.cancel_all()
+    await eligibility_grid.stop()
+    local_isochrone.shutdown_pool()
+    feasible_region.shutdown_pool()
+    await http_clients.close()
+    await dispose_engines()
     print("👋 FastAPI 종료!")
 
 app = FastAPI(title="Tobacco Retailer Location API", lifespan=lifespan)
@@ -35,7 +68,9 @@ app.add_middleware(
 # --- 라우터 등록 ---
 app.include_router(building.router)
 app.include_router(coordinates.router)
+app.include_router(feasible.router)
 app.include_router(restricted_zone.router)
+app.include_router(tiles.router)
 
 # --- API 엔드포인트 ---
 
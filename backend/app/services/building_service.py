@@ -1,17 +1,33 @@
 # app/services/building_service.py
 import asyncio
 import re
+import numpy as np
 from app.core.config import settings
-from app.services import naver_api
-from app.utils.geo import calculate_distance, convert_naver_mapcoord_to_wgs84
+from app.services import geocode_cache, naver_api, poi_store
+from app.utils.cache import SWRCache
+from app.utils.geo import (
+    calculate_distance_many,
+    convert_naver_mapcoord_to_wgs84,
+    geohash_center,
+    geohash_encode,
+)
 
-async def fetch_nearby_buildings(latitude: float, longitude: float):
+# 검색 결과 제목의 강조 태그(<b> 등) 제거용
+_TAG_PATTERN = re.compile(r'<[^<]+?>')
+
+# 위치별 주변 상가 검색 결과 캐시 (geohash 셀 단위)
+# 셀 크기는 검색 반경 이하가 되도록 정하고, 캐시에는 거리 필터 전 후보 목록만 저장
+nearby_cache = SWRCache(settings.NEARBY_CACHE_SIZE, settings.NEARBY_CACHE_TTL_SEC,
+                        settings.NEARBY_CACHE_STALE_SEC)
+
+
+async def _search_cell_places(latitude: float, longitude: float) -> dict:
     """
-    x(경도), y(위도)를 받아 50m 반경 내의 상가 건물을 그룹화하여 반환
+    한 위치의 주소(동 이름) + 카테고리별 검색 결과(좌표 변환 완료, 거리 필터 전)
+    외부 API 호출: 역지오코딩 1회 + 카테고리 수만큼 검색
     """
-    
-    # 1. 현재 위치의 주소(동 이름) 확보
-    current_address = await naver_api.get_address_from_coords(latitude, longitude)
+    # 1. 현재 위치의 주소(동 이름) 확보 (격자 단위 캐시 사용)
+    current_address = await geocode_cache.get_address(latitude, longitude)
     if not current_address:
         raise ValueError("현재 위치의 주소를 찾을 수 없습니다.")
     print(f"📍 현재 주소: {current_address}")
@@ -24,53 +40,95 @@ async def fetch_nearby_buildings(latitude: float, longitude: float):
     
     # 모든 검색 결과 수집
     results_list = await asyncio.gather(*search_tasks)
-    
-    # 3. 결과 필터링 (거리 50m 이내) 및 데이터 정제
-    valid_places = []
+
+    places = []
     for items in results_list:
         for item in items:
             # 좌표 변환 (1e7 나누기 방식 적용)
             place_lon, place_lat = convert_naver_mapcoord_to_wgs84(item.get('mapx'), item.get('mapy'))
+            title = _TAG_PATTERN.sub('', item['title'])
             
             if place_lon is None or place_lat is None:
-                title = re.sub('<[^<]+?>', '', item['title'])
                 print(f"⚠️ 좌표 파싱 실패: {title} (mapx:{item.get('mapx')}, mapy:{item.get('mapy')})")
                 continue
 
-            # 거리 계산 (Clamping 적용됨)
-            distance = calculate_distance(latitude, longitude, place_lat, place_lon)
-            
-            print(f"[DEBUG] 거리 계산: {item['title']} -> {distance:.2f}m")
+            places.append({
+                "name": title,
+                "category": item['category'],
+                "address": item['roadAddress'] if item['roadAddress'] else item['address'],
+                "lat": place_lat,
+                "lon": place_lon
+            })
+    return {"address": current_address, "places": places}
 
-            if distance <= settings.SEARCH_RADIUS_METER:
-                title = re.sub('<[^<]+?>', '', item['title'])
-                address = item['roadAddress'] if item['roadAddress'] else item['address']
-                valid_places.append({
-                    "name": title,
-                    "category": item['category'],
-                    "address": address,
-                    "distance": round(distance, 2),
-                    "lat": place_lat,
-                    "lon": place_lon
-                })
 
-    # 4. 그룹화
+def group_nearby_places(latitude: float, longitude: float, places: list[dict], radius: float) -> list[dict]:
+    """
+    후보 상가 중 반경(radius m) 이내만 골라 건물 주소별로 그룹화 (입력 순서 유지)
+    거리는 후보 전체를 한 번에 계산 (calculate_distance_many)
+    """
+    if not places:
+        return []
+    lats = np.fromiter((p['lat'] for p in places), dtype=np.float64, count=len(places))
+    lons = np.fromiter((p['lon'] for p in places), dtype=np.float64, count=len(places))
+    distances = calculate_distance_many(latitude, longitude, lats, lons)
+
     buildings = {}
-    for place in valid_places:
+    for i in np.flatnonzero(distances <= radius).tolist():
+        place = places[i]
         addr = place['address']
-        if addr not in buildings:
-            buildings[addr] = {
+        building = buildings.get(addr)
+        if building is None:
+            building = buildings[addr] = {
                 "building_address": addr,
                 "stores": [],
                 "location": {"lat": place['lat'], "lon": place['lon']}
             }
-        buildings[addr]["stores"].append({
+        building["stores"].append({
             "name": place['name'],
             "category": place['category']
         })
+    return list(buildings.values())
+
+
+async def _search_cell_with_naver(cell: str) -> dict:
+    """
+    셀 중심 기준 네이버 검색 후, 결과를 로컬 POI 저장소에 누적
+    """
+    cell_lat, cell_lon = geohash_center(cell)
+    cell_data = await _search_cell_places(cell_lat, cell_lon)
+    try:
+        await asyncio.to_thread(poi_store.save_search_results, cell, cell_data["places"])
+    except Exception as e:
+        print(f"POI 검색 결과 저장 중 오류 발생: {e}")
+    return cell_data
+
+
+async def fetch_nearby_buildings(latitude: float, longitude: float):
+    """
+    x(경도), y(위도)를 받아 50m 반경 내의 상가 건물을 그룹화하여 반환
+    - 로컬 POI 데이터가 있는 셀: poi 테이블 반경 검색 (외부 API 호출 없음)
+    - 그 외: 같은 geohash 셀 안의 요청은 셀 중심 기준 네이버 검색 결과(캐시)를 공유
+    거리는 항상 요청 좌표 기준으로 계산합니다.
+    """
+    cell = geohash_encode(latitude, longitude, poi_store.CELL_PRECISION)
+    places = None
+    try:
+        places = await asyncio.to_thread(
+            poi_store.find_nearby, latitude, longitude, cell, settings.SEARCH_RADIUS_METER)
+    except Exception as e:
+        print(f"로컬 POI 조회 중 오류 발생 (네이버 검색으로 대체): {e}")
+    source = "local"
+    if places is None:
+        source = "naver"
+        cell_data = await nearby_cache.get_or_fetch(cell, lambda: _search_cell_with_naver(cell))
+        places = cell_data["places"]
+    
+    buildings = group_nearby_places(latitude, longitude, places, settings.SEARCH_RADIUS_METER)
 
     return {
         "count": len(buildings),
         "radius_meter": settings.SEARCH_RADIUS_METER,
-        "buildings": list(buildings.values())
+        "source": source,
+        "buildings": buildings
     }
\ No newline at end of file
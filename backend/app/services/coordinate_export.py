@@ -0,0 +1,144 @@
+# app/services/coordinate_export.py
+"""
+address 좌표 스트리밍 내보내기 (/getcoordinates/toORS)
+
+요청 세션(get_async_db)의 서버 측 커서로 EXPORT_BATCH_SIZE 행씩 읽어 바로 인코딩하므로,
+테이블 크기와 관계없이 메모리 사용량이 일정하고 첫 바이트가 바로 전송됩니다.
+쿼리 실행과 첫 배치 조회는 응답을 시작하기 전에 끝내므로, DB 오류는 정상적인 오류 응답으로 반환됩니다.
+- json   : [{"x":..,"y":..}, ...] (기존 응답과 같은 형태)
+- ndjson : 한 줄에 {"x":..,"y":..}
+- f64    : little-endian float64 [x0, y0, x1, y1, ...] 연속 바이트
+- arrow  : Arrow IPC stream (x, y float64 컬럼), pyarrow 가 설치된 경우만
+"""
+import io
+import json
+from datetime import datetime
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+try:
+    import pyarrow as pa
+except ImportError:  # 선택 의존성
+    pa = None
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "f64": "application/octet-stream",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def parse_bbox(bbox: str | None) -> tuple[float, float, float, float] | None:
+    """
+    "min_x,min_y,max_x,max_y" (경도/위도) → 튜플, 형식이 잘못되면 ValueError
+    """
+    if not bbox:
+        return None
+    parts = [float(v) for v in bbox.split(",")]
+    if len(parts) != 4 or parts[0] > parts[2] or parts[1] > parts[3]:
+        raise ValueError("bbox 는 min_x,min_y,max_x,max_y 형식이어야 합니다.")
+    return tuple(parts)
+
+
+def _build_query(bbox, since: datetime | None):
+    conditions = ["x != -1", "y != -1"]
+    params = {}
+    if bbox is not None:
+        conditions.append("geom && ST_MakeEnvelope(:min_x, :min_y, :max_x, :max_y, 4326)")
+        params.update(zip(("min_x", "min_y", "max_x", "max_y"), bbox))
+    if since is not None:
+        conditions.append("updated_at > :since")
+        params["since"] = since
+    return text(f"SELECT x, y FROM address WHERE {' AND '.join(conditions)}"), params
+
+
+async def iter_coordinate_batches(db: AsyncSession, bbox=None, since: datetime | None = None,
+                                  batch_size: int | None = None):
+    """
+    조건에 맞는 좌표를 (N, 2) float64 배열 단위로 반환 (서버 측 커서)
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    query, params = _build_query(bbox, since)
+    result = await db.stream(query, params)
+    async for rows in result.partitions(batch_size):
+        yield np.asarray(rows, dtype=np.float64).reshape(-1, 2)
+
+
+async def _encode_json(batches):
+    yield b"["
+    first = True
+    async for batch in batches:
+        body = ",".join(json.dumps({"x": x, "y": y}) for x, y in batch.tolist())
+        if not body:
+            continue
+        yield body.encode() if first else b"," + body.encode()
+        first = False
+    yield b"]"
+
+
+async def _encode_ndjson(batches):
+    async for batch in batches:
+        yield "".join(json.dumps({"x": x, "y": y}) + "\n" for x, y in batch.tolist()).encode()
+
+
+async def _encode_f64(batches):
+    async for batch in batches:
+        yield batch.astype("<f8", copy=False).tobytes()
+
+
+def _drain(buffer: io.BytesIO) -> bytes:
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+async def _encode_arrow(batches):
+    # 배치마다 새로 쓰인 부분만 꺼내 보내고 버퍼를 비움 (전체 스트림을 메모리에 쌓지 않음)
+    schema = pa.schema([("x", pa.float64()), ("y", pa.float64())])
+    buffer = io.BytesIO()
+    writer = pa.ipc.new_stream(buffer, schema)
+    yield _drain(buffer)
+    async for batch in batches:
+        writer.write_batch(pa.record_batch([batch[:, 0], batch[:, 1]], schema=schema))
+        yield _drain(buffer)
+    writer.close()
+    yield _drain(buffer)
+
+
+ENCODERS = {"json": _encode_json, "ndjson": _encode_ndjson, "f64": _encode_f64, "arrow": _encode_arrow}
+
+
+async def stream_coordinates(db: AsyncSession, fmt: str, bbox=None, since: datetime | None = None):
+    """
+    쿼리를 실행해 첫 배치까지 읽은 뒤, 형식(fmt)에 맞게 인코딩된 바이트 조각을 순서대로 반환하는
+    비동기 제너레이터를 돌려줍니다. (StreamingResponse 용)
+    연결/쿼리 오류는 여기서 발생하므로 호출하는 쪽에서 응답을 시작하기 전에 오류 응답으로 바꿀 수 있습니다.
+    """
+    batches = iter_coordinate_batches(db, bbox, since)
+    try:
+        first = await anext(batches)
+    except StopAsyncIteration:
+        first = None
+
+    async def rest():
+        if first is None:
+            return
+        yield first
+        try:
+            async for batch in batches:
+                yield batch
+        except Exception as e:
+            # 이미 응답을 보내는 중이라 상태 코드를 바꿀 수 없음 → 기록 후 연결을 끊어 잘린 응답임을 알림
+            print(f"좌표 내보내기 중 오류 발생: {e}")
+            raise
+
+    return ENCODERS[fmt](rest())
+
+
+def is_available(fmt: str) -> bool:
+    return fmt in ENCODERS and (fmt != "arrow" or pa is not None)
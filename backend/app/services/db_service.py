@@ -2,222 +2,493 @@
 import pandas as pd
 import asyncio
 import os
+import time
 from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 import traceback
 
+from app.core import schema
 from app.core.config import settings
-from app.core.database import sync_engine, SessionLocal
-from app.utils.geo import convert_epsg5174_to_wgs84
-from app.services.naver_api import get_coordinates_from_address
+from app.core.database import sync_engine, AsyncSessionLocal
+from app.utils.geo import convert_epsg5174_to_wgs84_many
+from app.services import geocode_backfill, repository
+from app.services.ingest import (
+    file_sha256,
+    get_ingest_state,
+    save_ingest_state,
+    stream_csv_to_staging,
+)
+
+ADDRESS_SOURCE = "address"
+ADDRESS_COLUMNS = ["landlot_address", "road_name_address", "x", "y"]
+
+
+def _address_content_keys(df: pd.DataFrame) -> pd.Series:
+    """
+    CSV 원본 값(변환 전 좌표 포함) 기준 행 내용 키를 만듭니다.
+    중복 행 구분(등장 순번)은 전체 파일 기준이어야 하므로 staging 테이블에서 SQL 로 붙여 해시합니다.
+    (sha256(키 + "\x1f" + 등장 순번) 으로 기존에 저장된 address.row_hash 와 같은 값이 나옴)
+    """
+    return (
+        df['landlot_address'].astype(str) + "\x1f" +
+        df['road_name_address'].astype(str) + "\x1f" +
+        df['x'].map(repr) + "\x1f" +
+        df['y'].map(repr)
+    )
+
+
+def _prepare_address_chunk(df: pd.DataFrame, offset: int) -> pd.DataFrame:
+    """
+    address.csv 청크 전처리: 결측치 처리, 행 내용 키 생성, 좌표 변환(EPSG:5174 -> WGS84)
+    """
+    # 결측치 처리
+    df[['landlot_address', 'road_name_address']] = df[['landlot_address', 'road_name_address']].fillna("비어있음")
+
+    # 좌표 데이터 전처리 (숫자형 변환, 에러 시 -1.0)
+    df['x'] = pd.to_numeric(df['x'], errors='coerce').fillna(-1.0)
+    df['y'] = pd.to_numeric(df['y'], errors='coerce').fillna(-1.0)
+
+    # 행 지문은 변환 전 원본 좌표 기준 (geocoding 으로 채운 좌표가 지문을 바꾸지 않도록)
+    df['content_key'] = _address_content_keys(df)
+    df['line_no'] = range(offset, offset + len(df))
+
+    # 컬럼 배열 단위 일괄 변환 (행 단위 apply 대비 수십 배 빠름, 변환 실패: -1.0)
+    lon, lat = convert_epsg5174_to_wgs84_many(df['x'].to_numpy(), df['y'].to_numpy())
+    df['x'] = lon # 경도 (Longitude) -> 127.xxx
+    df['y'] = lat # 위도 (Latitude) -> 37.xxx
+    return df
+
 
 # --- address.csv → DB 로딩 함수 ---
 def initialize_address_table():
     """
-    앱 시작 시 실행: 기존 테이블 삭제 후 CSV 데이터를 읽어 좌표 변환(EPSG:5174 -> WGS84) 후 DB에 적재합니다.
+    [앱 시작 시 실행]
+    address.csv 를 DB 에 반영합니다. 테이블을 삭제하지 않으므로 geom 컬럼과 GIST 인덱스가 유지됩니다.
+    - 파일 해시가 마지막 적재와 같으면 적재를 건너뜀
+    - CSV 를 청크 단위 COPY 로 staging 테이블에 올린 뒤, 행 지문을 비교해
+      추가/변경/삭제된 행만 집합 연산으로 반영 (ADDRESS_INGEST_MODE="full" 이면 전체 재적재)
     """
     try:
-        print("🔄 DB 초기화 및 데이터 적재 작업을 시작합니다...")
-        
-        # sync_engine을 사용하여 DB 연결
-        with sync_engine.connect() as conn:
-            # 1. 기존 테이블 강제 삭제 (개발용 초기화 로직)
-            print("🗑️ 기존 address 테이블 삭제 중 (IF EXISTS)...")
-            conn.execute(text("DROP TABLE IF EXISTS address CASCADE"))
-            conn.commit()
-            print("✅ 기존 테이블 삭제 완료.")
-
-            # 2. CSV 로드
-            print(f"📂 CSV 파일 로드 중: {settings.CSV_PATH}")
-            df = pd.read_csv(settings.CSV_PATH)
-            
-            # 결측치 처리
-            df[['landlot_address', 'road_name_address']] = df[['landlot_address', 'road_name_address']].fillna("비어있음")
-            
-            # 좌표 데이터 전처리 (숫자형 변환, 에러 시 -1.0)
-            if 'x' in df.columns:
-                df['x'] = pd.to_numeric(df['x'], errors='coerce').fillna(-1.0)
-            if 'y' in df.columns:
-                df['y'] = pd.to_numeric(df['y'], errors='coerce').fillna(-1.0)
-
-            # 3. 메모리 상에서 좌표 변환 수행 (EPSG:5174 -> WGS84)
-            print("🌍 좌표 변환 수행 중 (EPSG:5174 -> WGS84)...")
-            
-            # 변환 로직 적용 함수
-            def apply_conversion(row):
-                orig_x = row['x']
-                orig_y = row['y']
-                
-                # utils/geo.py의 함수 사용하여 변환 (lat: 위도, lon: 경도)
-                lon, lat = convert_epsg5174_to_wgs84(orig_x, orig_y)
-                
-                if lat is not None and lon is not None:
-                    # 변환 성공: 경도(x), 위도(y) 반환
-                    return lon, lat 
-                else:
-                    # 변환 실패: -1.0 유지
-                    return -1.0, -1.0
-
-            # apply 함수 실행하여 새로운 좌표 컬럼 생성
-            converted_coords = df.apply(apply_conversion, axis=1, result_type='expand')
-            
-            # 변환된 값을 원본 df의 x, y 컬럼에 덮어쓰기
-            df['x'] = converted_coords[0] # 경도 (Longitude) -> 127.xxx
-            df['y'] = converted_coords[1] # 위도 (Latitude) -> 37.xxx
-
-            # 4. DB에 저장 (테이블 새로 생성됨)
-            df.to_sql('address', con=sync_engine, if_exists='replace', index=False)
-            print("✅ 데이터 삽입 완료! (address 테이블 재생성됨)")
+        print(f"📂 address CSV 확인 중: {settings.CSV_PATH}")
+        content_hash = file_sha256(settings.CSV_PATH)
+        full_reload = settings.ADDRESS_INGEST_MODE == "full"
+
+        with sync_engine.begin() as conn:
+            state = get_ingest_state(conn, ADDRESS_SOURCE)
+            row_count = conn.execute(text("SELECT COUNT(*) FROM address")).scalar()
+
+            if not full_reload and state and state.content_hash == content_hash and state.row_count == row_count:
+                print(f"⏭️ address.csv 변경 없음 ({row_count}행) → 적재를 건너뜁니다.")
+                return True
+
+            # 1. CSV → staging (COPY 스트리밍)
+            conn.execute(text("""
+                CREATE TEMP TABLE address_staging (
+                    line_no BIGINT,
+                    landlot_address VARCHAR(500),
+                    road_name_address VARCHAR(500),
+                    x DOUBLE PRECISION,
+                    y DOUBLE PRECISION,
+                    content_key TEXT
+                ) ON COMMIT DROP
+            """))
+            total = stream_csv_to_staging(
+                conn, settings.CSV_PATH, "address_staging",
+                ["line_no", "landlot_address", "road_name_address", "x", "y", "content_key"],
+                transform=_prepare_address_chunk
+            )
+
+            # 2. 중복 행은 파일 내 등장 순번으로 구분하여 최종 행 지문 생성 (기존 address.row_hash 와 같은 규칙)
+            conn.execute(text("""
+                CREATE TEMP TABLE address_incoming ON COMMIT DROP AS
+                SELECT landlot_address, road_name_address, x, y,
+                       encode(sha256(convert_to(
+                           content_key || chr(31) ||
+                           (row_number() OVER (PARTITION BY content_key ORDER BY line_no) - 1)::text,
+                           'UTF8')), 'hex') AS row_hash
+                FROM address_staging
+            """))
+            conn.execute(text("CREATE INDEX ON address_incoming (row_hash)"))
+
+            # 지문이 바뀌어 다시 넣는 행도 geocoding 으로 채운 좌표는 주소가 같은 기존 행에서 이어받음
+            carried = 0
+            if not full_reload:
+                carried = conn.execute(text("""
+                    UPDATE address_incoming i
+                    SET x = a.x, y = a.y
+                    FROM address a
+                    WHERE (i.x = -1 OR i.y = -1)
+                      AND a.x != -1 AND a.y != -1
+                      AND a.landlot_address = i.landlot_address
+                      AND a.road_name_address = i.road_name_address
+                      AND NOT EXISTS (SELECT 1 FROM address_incoming j WHERE j.row_hash = a.row_hash)
+                """)).rowcount
+
+            # 3. 집합 연산으로 변경분만 반영
+            if full_reload:
+                print("🗑️ 전체 재적재 모드: address 테이블 비우는 중...")
+                conn.execute(text("TRUNCATE TABLE address"))
+            removed = conn.execute(text("""
+                DELETE FROM address a
+                WHERE a.row_hash IS NULL
+                   OR NOT EXISTS (SELECT 1 FROM address_incoming i WHERE i.row_hash = a.row_hash)
+            """)).rowcount
+            added = conn.execute(text("""
+                INSERT INTO address (landlot_address, road_name_address, x, y, row_hash)
+                SELECT i.landlot_address, i.road_name_address, i.x, i.y, i.row_hash
+                FROM address_incoming i
+                WHERE NOT EXISTS (SELECT 1 FROM address a WHERE a.row_hash = i.row_hash)
+            """)).rowcount
+
+            save_ingest_state(conn, ADDRESS_SOURCE, content_hash, total)
+            schema.ensure_indexes(conn)
+            print(f"✅ address 반영 완료! (추가/변경 {added}행, 삭제 {removed}행, 좌표 이어받음 {carried}행, 전체 {total}행)")
             print("   👉 저장된 데이터 기준: x=경도(Longitude), y=위도(Latitude)")
+        return True
 
     except Exception as e:
         print(f"❌ DB 초기화 중 오류 발생: {e}")
         traceback.print_exc()
+        return False
 
 
 
 async def fill_missing_coordinates():
     """
-    [앱 시작 시 실행] 
     DB에서 좌표(x, y)가 비어 있는(-1) 레코드를 찾아 실제 좌표로 채워넣는 함수
+    (동시성/요청 제한/재시도/배치 커밋은 geocode_backfill 엔진이 담당)
     """
-    db = SessionLocal()
-    try:
-        query = text("SELECT landlot_address, road_name_address FROM address WHERE x = -1 or y = -1")
-        rows_to_update = await asyncio.to_thread(lambda: db.execute(query).fetchall())
+    await geocode_backfill.run_backfill()
         
-        if not rows_to_update:
-            print("비어 있는 좌표가 없습니다.")
+ZONE_SOURCE = "restricted_zone"
+ZONE_COLUMNS = ["landlot_address", "centroid_x", "centroid_y", "polygon_geom", "vertices"]
+
+# 같은 DB 를 쓰는 여러 인스턴스가 동시에 시작해도 제한 구역 CSV 적재는 한 번만 (트랜잭션 단위 advisory lock)
+ZONE_LOAD_LOCK = text("SELECT pg_advisory_xact_lock(hashtext('restricted_zone_load'))")
+
+# impossible 을 새 테이블로 교체: 컬럼/기본값/identity 는 그대로, 인덱스는 데이터를 넣은 뒤 만듦
+CREATE_IMPOSSIBLE_SWAP = [
+    text("DROP TABLE IF EXISTS public.impossible_swap"),
+    text("CREATE TABLE public.impossible_swap (LIKE public.impossible INCLUDING ALL EXCLUDING INDEXES)"),
+    # 이전 테이블의 id 다음 번호부터 (지도 조회 cursor 가 이전 id 와 겹치지 않도록)
+    text("""
+        SELECT setval(pg_get_serial_sequence('public.impossible_swap', 'id'),
+                      COALESCE((SELECT max(id) FROM public.impossible), 0) + 1, false)
+    """),
+]
+LIVE_IMPOSSIBLE_INDEXES = text("""
+    SELECT indexname, indexdef FROM pg_indexes
+    WHERE schemaname = 'public' AND tablename = 'impossible'
+""")
+# 트리거가 없는 새 테이블로 적재하므로 합집합 레이어 갱신 칸(이전 + 새 구역)과 data_version 은 직접 반영
+MARK_SWAP_COVERAGE_DIRTY = text("""
+    INSERT INTO impossible_coverage_dirty (cell_x, cell_y)
+    SELECT c.cell_x, c.cell_y FROM impossible i, coverage_cells(i.polygon_geom) c WHERE i.polygon_geom IS NOT NULL
+    UNION
+    SELECT c.cell_x, c.cell_y FROM impossible_swap i, coverage_cells(i.polygon_geom) c WHERE i.polygon_geom IS NOT NULL
+    ON CONFLICT DO NOTHING
+""")
+BUMP_IMPOSSIBLE_VERSION = text("""
+    INSERT INTO data_version (table_name, version, updated_at)
+    VALUES ('impossible', 1, now())
+    ON CONFLICT (table_name) DO UPDATE SET version = data_version.version + 1, updated_at = now()
+""")
+
+
+def _build_impossible_swap(conn) -> list[tuple[str, str]]:
+    """
+    impossible_staging(CSV 원본) → impossible_swap 테이블을 만들고 데이터를 넣은 뒤 인덱스를 한 번에 생성합니다.
+    (행 단위 DELETE/INSERT 가 없으므로 GIST 인덱스에 빈 페이지가 쌓이지 않음)
+    - return: (운영 인덱스 이름, 새 테이블 인덱스 이름) 목록
+    """
+    for statement in CREATE_IMPOSSIBLE_SWAP:
+        conn.execute(statement)
+    conn.execute(text("""
+        INSERT INTO impossible_swap (
+            landlot_address, centroid_x, centroid_y,
+            polygon_geom, vertices, method)
+        SELECT landlot_address, centroid_x, centroid_y,
+               ST_SetSRID(ST_GeomFromText(polygon_geom), 4326),
+               vertices::jsonb, COALESCE(method, 'csv')
+        FROM impossible_staging
+        WHERE polygon_geom IS NOT NULL
+    """))
+    # 운영 테이블에 있는 인덱스를 그대로 (이름 뒤에 _swap) 만들고, 교체 후 원래 이름으로 변경
+    renames = []
+    for name, definition in conn.execute(LIVE_IMPOSSIBLE_INDEXES).fetchall():
+        live = f"INDEX {name} ON public.impossible "
+        if live not in definition:
+            raise RuntimeError(f"인덱스 정의를 해석할 수 없습니다: {definition}")
+        conn.execute(text(definition.replace(live, f"INDEX {name}_swap ON public.impossible_swap ")))
+        renames.append((name, f"{name}_swap"))
+    conn.execute(text("ANALYZE impossible_swap"))
+    return renames
+
+
+def _is_lock_timeout(e: DBAPIError) -> bool:
+    orig = e.orig
+    return (getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)) == "55P03"
+
+
+def _swap_in_impossible(conn, index_renames: list[tuple[str, str]]):
+    """
+    impossible_swap 을 impossible 로 바꿔 끼웁니다. (이름 변경만 하므로 잠금 구간은 짧음)
+    커밋 전까지 조회 쿼리는 이전 테이블을 보고, 커밋 후에는 새 테이블 전체를 봅니다. (비어 있는 순간 없음)
+    오래 걸리는 조회 때문에 잠금을 못 얻으면 뒤에 오는 조회를 막지 않도록 포기하고 잠시 후 다시 시도합니다.
+    """
+    for attempt in range(1, settings.ZONE_SWAP_RETRIES + 1):
+        try:
+            with conn.begin_nested():
+                conn.execute(text(f"SET LOCAL lock_timeout = {int(settings.ZONE_SWAP_LOCK_TIMEOUT_MS)}"))
+                conn.execute(text("LOCK TABLE public.impossible IN ACCESS EXCLUSIVE MODE"))
+            break
+        except DBAPIError as e:
+            if not _is_lock_timeout(e) or attempt == settings.ZONE_SWAP_RETRIES:
+                raise
+            print(f"⏳ impossible 테이블 잠금 대기 시간 초과 → 다시 시도합니다. ({attempt}/{settings.ZONE_SWAP_RETRIES})")
+            time.sleep(min(attempt, 5))
+    conn.execute(text("SET LOCAL lock_timeout = 0"))
+    conn.execute(text("ALTER TABLE public.impossible RENAME TO impossible_old"))
+    conn.execute(text("ALTER TABLE public.impossible_swap RENAME TO impossible"))
+    conn.execute(text("DROP TABLE public.impossible_old"))
+    for name, swap_name in index_renames:
+        conn.execute(text(f"ALTER INDEX public.{swap_name} RENAME TO {name}"))
+    for statement in schema.IMPOSSIBLE_TRIGGER_STATEMENTS:
+        conn.execute(text(statement))
+    conn.execute(BUMP_IMPOSSIBLE_VERSION)
+
+
+def _replace_impossible_from_staging(conn) -> int:
+    """
+    impossible_staging → impossible_swap 적재, 지도용 단순화 polygon / 합집합 레이어를 새 테이블 기준으로 미리 계산한 뒤
+    (잠금 구간에 포함하지 않음) impossible 과 교체합니다. (합집합 조각 수 반환)
+    """
+    index_renames = _build_impossible_swap(conn)
+    _refresh_polygon_lod(conn, source="impossible_swap")
+    conn.execute(MARK_SWAP_COVERAGE_DIRTY)
+    pieces = _refresh_coverage(conn, source="impossible_swap")
+    _swap_in_impossible(conn, index_renames)
+    return pieces
+
+
+def _load_restricted_zone_csv():
+    """
+    restricted_zone.csv 를 COPY 로 staging 테이블에 올린 뒤, 새 테이블(impossible_swap)에 polygon 을 만들고
+    지도용 단순화 polygon / 합집합 레이어까지 미리 계산한 다음 impossible 과 이름을 바꿔 교체합니다. (단일 트랜잭션)
+    적재 중에도 조회는 이전 제한 구역을 그대로 보고, 커밋과 동시에 새 제한 구역 전체로 바뀝니다.
+    CSV 가 마지막 적재 이후 바뀌지 않았다면 건너뛰어, 계산 작업(/restricted-zone/calculate)이
+    저장한 구역이 재시작 때마다 지워지지 않도록 합니다.
+    """
+    header = pd.read_csv(settings.ZONE_CSV_PATH, nrows=0).columns
+    if not set(ZONE_COLUMNS).issubset(header):
+        print(f"restricted_zone.csv 컬럼 부족: {ZONE_COLUMNS}")
+        return
+
+    content_hash = file_sha256(settings.ZONE_CSV_PATH)
+    with sync_engine.begin() as conn:
+        # 다른 인스턴스가 적재 중이면 끝날 때까지 기다린 뒤, 그 결과(ingest_state)를 보고 건너뜀
+        conn.execute(ZONE_LOAD_LOCK)
+        state = get_ingest_state(conn, ZONE_SOURCE)
+        if state and state.content_hash == content_hash:
+            print("⏭️ restricted_zone.csv 변경 없음 → 제한 구역 적재를 건너뜁니다.")
+            if not conn.execute(text("SELECT EXISTS (SELECT 1 FROM impossible_lod)")).scalar():
+                _refresh_polygon_lod(conn)
+            _refresh_coverage(conn) # 마이그레이션 등으로 남아 있는 계산 대상 칸
             return
-        
-        print(f"총 {len(rows_to_update)}개의 좌표를 변환합니다.")
-        
-        for row in rows_to_update:
-            landlot_addr, road_addr = row
-            address = landlot_addr if landlot_addr != "비어있음" else road_addr
-            coordinates = await get_coordinates_from_address(address)
-            
-            if coordinates:
-                x, y = coordinates
-                update_query = text("UPDATE address SET x = :x, y = :y WHERE landlot_address = :landlot_address")
-                await asyncio.to_thread(
-                    db.execute, update_query, {"x": x, "y": y, "landlot_address": address}
-                )
-            else:
-                print(f"비어 있는 좌표 변환 실패: address={address}")
-            await asyncio.sleep(0.1)
-        
-        await asyncio.to_thread(db.commit)
-        print("비어 있는 좌표 업데이트 완료")
-    
+
+        conn.execute(text("""
+            CREATE TEMP TABLE impossible_staging (
+                landlot_address VARCHAR(500),
+                centroid_x DOUBLE PRECISION,
+                centroid_y DOUBLE PRECISION,
+                polygon_geom TEXT,
+                vertices TEXT,
+                method VARCHAR(16)
+            ) ON COMMIT DROP
+        """))
+        # /restricted-zone/export 로 내보낸 파일이면 계산 방식(method)도 그대로 적재
+        columns = ZONE_COLUMNS + ["method"] if "method" in header else ZONE_COLUMNS
+        total = stream_csv_to_staging(conn, settings.ZONE_CSV_PATH, "impossible_staging", columns)
+        if total == 0:
+            print("restricted_zone.csv 파일이 비어 있습니다.")
+            return
+
+        print("제한 구역 데이터 갱신 (새 테이블에 적재 후 impossible 과 교체) 중...")
+        pieces = _replace_impossible_from_staging(conn)
+        save_ingest_state(conn, ZONE_SOURCE, content_hash, total)
+        schema.ensure_indexes(conn)
+    print(f"impossible 테이블 초기화 및 CSV 데이터 저장 완료. ({total}행, 합집합 조각 {pieces}개)")
+
+
+def _refresh_polygon_lod(conn, source: str = "impossible"):
+    """
+    줌 구간별 단순화 polygon(impossible_lod)을 impossible 테이블(source: 교체 적재 중이면 impossible_swap) 기준으로
+    다시 만듭니다. (DELETE 사용: 갱신 중에도 지도 조회가 잠기지 않도록)
+    """
+    conn.execute(text("DELETE FROM impossible_lod"))
+    for band, (_, tolerance) in enumerate(settings.POLYGON_ZOOM_BANDS):
+        conn.execute(text(f"""
+            INSERT INTO impossible_lod (impossible_id, zoom_band, geom)
+            SELECT id, :band, simplified
+            FROM (
+                SELECT id, ST_SimplifyPreserveTopology(polygon_geom, :tolerance) AS simplified
+                FROM {source}
+                WHERE polygon_geom IS NOT NULL
+            ) s
+            WHERE GeometryType(simplified) = 'POLYGON' AND NOT ST_IsEmpty(simplified)
+        """), {"band": band, "tolerance": tolerance})
+
+
+# 바뀐 격자 칸의 이전 조각을 지우고, 칸 영역으로 자른 제한 구역들의 합집합을 ST_Subdivide 조각으로 다시 저장
+# (한 statement: 같은 칸을 동시에 갱신하는 트랜잭션은 dirty 행 잠금으로 순서가 정해짐)
+_REFRESH_COVERAGE_SQL = """
+    WITH cells AS (
+        DELETE FROM impossible_coverage_dirty RETURNING cell_x, cell_y
+    ), removed AS (
+        DELETE FROM impossible_coverage c
+        USING cells d
+        WHERE c.cell_x = d.cell_x AND c.cell_y = d.cell_y
+    )
+    INSERT INTO impossible_coverage (cell_x, cell_y, geom)
+    SELECT d.cell_x, d.cell_y, piece.geom
+    FROM cells d
+    CROSS JOIN LATERAL (
+        SELECT ST_MakeEnvelope(d.cell_x * :cell, d.cell_y * :cell,
+                               (d.cell_x + 1) * :cell, (d.cell_y + 1) * :cell, 4326) AS env
+    ) e
+    CROSS JOIN LATERAL (
+        SELECT ST_Union(ST_CollectionExtract(ST_Intersection(i.polygon_geom, e.env), 3)) AS geom
+        FROM {source} i
+        WHERE i.polygon_geom && e.env
+    ) u
+    CROSS JOIN LATERAL ST_Subdivide(u.geom, :max_vertices) AS sub(geom)
+    CROSS JOIN LATERAL ST_Dump(sub.geom) AS piece
+    WHERE GeometryType(piece.geom) = 'POLYGON' AND NOT ST_IsEmpty(piece.geom)
+"""
+REFRESH_COVERAGE_QUERY = text(_REFRESH_COVERAGE_SQL.format(source="impossible"))
+
+
+def _refresh_coverage(conn, source: str = "impossible") -> int:
+    """
+    impossible 이 바뀐 격자 칸(트리거가 impossible_coverage_dirty 에 기록)만 합집합 레이어를 다시 계산합니다.
+    impossible 을 바꾼 트랜잭션 안에서 호출하면 커밋 시점에 두 테이블이 항상 일치합니다. (저장한 조각 수 반환)
+    - source: 교체 적재 중이면 아직 이름을 바꾸기 전의 새 테이블(impossible_swap)
+    """
+    query = REFRESH_COVERAGE_QUERY if source == "impossible" else text(_REFRESH_COVERAGE_SQL.format(source=source))
+    return conn.execute(query, {
+        "cell": schema.COVERAGE_CELL_DEG, "max_vertices": settings.COVERAGE_MAX_VERTICES}).rowcount
+
+
+def refresh_coverage():
+    """
+    [제한 구역 변경 후 실행] 합집합 레이어 중 바뀐 칸만 갱신
+    """
+    try:
+        with sync_engine.begin() as conn:
+            _refresh_coverage(conn)
     except Exception as e:
-        print(f"비어 있는 좌표 업데이트 중 오류 발생: {e}")
-        await asyncio.to_thread(db.rollback)
-    finally:
-        db.close()
-        
+        print(f"impossible_coverage 갱신 중 오류 발생: {e}")
+
+
+def refresh_polygon_lod():
+    """
+    [제한 구역 변경 후 실행] 지도 표시용 단순화 polygon 갱신
+    """
+    try:
+        with sync_engine.begin() as conn:
+            _refresh_polygon_lod(conn)
+    except Exception as e:
+        print(f"impossible_lod 갱신 중 오류 발생: {e}")
+
+
+def zoom_band(zoom: int | None) -> int | None:
+    """
+    지도 줌 레벨 → 단순화 구간 번호 (None: 원본 polygon 사용)
+    """
+    if zoom is None:
+        return None
+    for band, (max_zoom, _) in enumerate(settings.POLYGON_ZOOM_BANDS):
+        if zoom <= max_zoom:
+            return band
+    return None
+
+
 async def initialize_restricted_zone():
     """
     [앱 시작 시 실행] 
     제한 구역 CSV 데이터를 읽어와 DB의 impossible 테이블에 저장하는 함수
+    (메모리 인덱스는 적재가 모두 끝난 뒤 spatial_index.rebuild_indexes 에서 스냅샷으로 한 번에 생성)
     """
-    db = SessionLocal()
     try:
         if not os.path.exists(settings.ZONE_CSV_PATH):
             print(f"제한 구역 CSV 파일이 없습니다: {settings.ZONE_CSV_PATH}")
-            return
+            return True
         
-        # 개발 단계에서 사용
-        print("제한 구역 데이터 갱신 (impossible 테이블 데이터 삭제) 중...")
-        await asyncio.to_thread(lambda: db.execute(text("DELETE FROM impossible")))
-        await asyncio.to_thread(db.commit)
-        
-        # if not await is_empty_impossible_table():
-        #     print("제한 구역 데이터가 이미 존재합니다. CSV 파일 저장을 건너뜁니다.")
-        #     return
-        
-        df = pd.read_csv(settings.ZONE_CSV_PATH)
-        if df.empty:
-            print("restricted_zone.csv 파일이 비어 있습니다.")
-            return
-        
-        required_cols = ["landlot_address", "centroid_x", "centroid_y", "polygon_geom", "vertices"]
-        if not set(required_cols).issubset(df.columns):
-            print(f"restricted_zone.csv 컬럼 부족: {required_cols}")
-            return
-        
-        insert_query = text("""
-            INSERT INTO impossible (
-                landlot_address, centroid_x, centroid_y,
-                polygon_geom, vertices)
-            VALUES (
-                :landlot_address, :centroid_x, :centroid_y,
-                ST_SetSRID(ST_GeomFromText(:polygon_geom), 4326),
-                :vertices);
-        """)
-        params = df[required_cols].to_dict(orient='records')
-
-        db.execute(insert_query, params)
-        db.commit()
-        print("impossible 테이블 초기화 및 CSV 데이터 저장 완료.")
+        await asyncio.to_thread(_load_restricted_zone_csv)
+        return True
     
     except Exception as e:
         print(f"impossible 테이블 정보 저장 중 오류 발생: {e}")
-        db.rollback()
-    finally:
-        db.close()
+        return False
 
 async def get_valid_address():
     """
     address 테이블에서 위치 정보를 조회하여 반환하는 함수
     """
-    db = SessionLocal()
     try:
-        rows = await asyncio.to_thread(
-            lambda: db.execute(text("""
-                     SELECT landlot_address, x, y 
-                     FROM address 
-                     WHERE x != -1 AND y != -1
-                     """)).fetchall())
-        return rows
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(repository.VALID_ADDRESSES)
+            return result.fetchall()
     
     except Exception as e:
         print(f"address 테이블 조회 중 오류 발생: {e}")
         return []
-    finally:
-        db.close()
         
 async def is_empty_impossible_table():
     """
     impossible 테이블에 저장된 제한 구역이 있는지 확인하는 함수
     """
-    db = SessionLocal()
     try:
-        count = await asyncio.to_thread(
-            lambda: db.execute(text("SELECT COUNT(*) FROM impossible")).scalar())
-        return count == 0
+        async with AsyncSessionLocal() as db:
+            exists = (await db.execute(text("SELECT EXISTS (SELECT 1 FROM impossible)"))).scalar()
+            return not exists
     
     except Exception as e:
         print(f"impossible 테이블 확인 중 오류 발생: {e}")
         return False
-    finally:
-        db.close()
 
 async def get_restricted_zone():
     """
     impossible 테이블에서 제한 구역 정보를 조회하여 반환하는 함수
     """
-    db = SessionLocal()
     try:
-        rows = await asyncio.to_thread(
-            lambda: db.execute(
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
                 text("""
                      SELECT landlot_address, vertices, centroid_x, centroid_y 
                      FROM impossible
-                     """)).fetchall())
-        return rows
+                     """))
+            return result.fetchall()
+    
+    except Exception as e:
+        print(f"impossible 테이블 조회 중 오류 발생: {e}")
+        return []
+
+async def get_restricted_zone_for_export():
+    """
+    impossible 테이블을 restricted_zone.csv 형식(WKT, vertices JSON 문자열)으로 조회하는 함수
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                text("""
+                     SELECT landlot_address, centroid_x, centroid_y,
+                            ST_AsText(polygon_geom) AS polygon_geom, vertices::text AS vertices, method
+                     FROM impossible
+                     ORDER BY landlot_address
+                     """))
+            return result.fetchall()
     
     except Exception as e:
         print(f"impossible 테이블 조회 중 오류 발생: {e}")
         return []
-    finally:
-        db.close()
\ No newline at end of file
@@ -0,0 +1,194 @@
+# app/services/eligibility.py
+import codecs
+import csv
+import json
+import numpy as np
+
+from app.core.config import settings
+from app.services import spatial_index
+
+_X_COLUMNS = ("x", "lon", "lng", "longitude")
+_Y_COLUMNS = ("y", "lat", "latitude")
+
+
+def evaluate_points(xs, ys) -> list[dict]:
+    """
+    여러 후보 좌표(x:경도, y:위도)의 입점 가능 여부를 메모리 인덱스로 한 번에 계산합니다.
+    - is_restricted: 제한 구역(impossible) 안에 있는지, zones: 겹치는 제한 구역(주소)
+    - nearest_retailer / distance_meter: 가장 가까운 기존 소매점과 직선 거리
+    - eligible: 제한 구역 밖이고 기존 소매점과 RETAILER_MIN_DISTANCE_METER 이상 떨어져 있는지
+    """
+    zone_index = spatial_index.get_zone_index()
+    retailer_index = spatial_index.get_retailer_index()
+    if zone_index is None or retailer_index is None:
+        raise RuntimeError("제한 구역/소매점 인덱스가 아직 준비되지 않았습니다.")
+
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    valid = np.isfinite(xs) & np.isfinite(ys)
+
+    zones: dict[int, list[str]] = {}
+    if len(zone_index) and valid.any():
+        valid_pos = np.flatnonzero(valid)
+        point_idx, zone_idx = zone_index.query_many(xs[valid], ys[valid])
+        for p, z in zip(valid_pos[point_idx].tolist(), zone_idx.tolist()):
+            zones.setdefault(p, []).append(zone_index.labels[z])
+
+    nearest = np.full(len(xs), -1, dtype=np.int64)
+    distance = np.full(len(xs), np.inf)
+    if valid.any():
+        nearest[valid], distance[valid] = retailer_index.nearest_many(xs[valid], ys[valid])
+
+    results = []
+    for i in range(len(xs)):
+        if not valid[i]:
+            results.append({"x": None, "y": None, "error": "잘못된 좌표"})
+            continue
+        point_zones = zones.get(i, [])
+        has_retailer = nearest[i] >= 0
+        results.append({
+            "x": float(xs[i]),
+            "y": float(ys[i]),
+            "eligible": bool(not point_zones and distance[i] >= settings.RETAILER_MIN_DISTANCE_METER),
+            "is_restricted": bool(point_zones),
+            "zones": point_zones,
+            "nearest_retailer": retailer_index.labels[nearest[i]] if has_retailer else None,
+            "distance_meter": round(float(distance[i]), 2) if has_retailer else None,
+        })
+    return results
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def parse_json_points(body: bytes) -> list:
+    """
+    JSON 본문: {"points": [[x, y], ...]} 또는 [[x, y], ...] / [{"x":.., "y":..}, ...]
+    본문 전체를 응답 전에 읽어 형식을 확인합니다. (형식이 잘못되면 ValueError)
+    """
+    try:
+        data = json.loads(body or b"[]")
+    except ValueError as e:
+        raise ValueError(f"JSON 본문을 읽을 수 없습니다: {e}")
+    points = data.get("points", []) if isinstance(data, dict) else data
+    if not isinstance(points, list):
+        raise ValueError('JSON 본문은 좌표 목록 또는 {"points": [...]} 형식이어야 합니다.')
+    return points
+
+
+def _point_from_obj(obj) -> tuple[float, float]:
+    if isinstance(obj, dict):
+        x = next((obj[k] for k in _X_COLUMNS if k in obj), None)
+        y = next((obj[k] for k in _Y_COLUMNS if k in obj), None)
+        return _to_float(x), _to_float(y)
+    if isinstance(obj, (list, tuple)) and len(obj) >= 2:
+        return _to_float(obj[0]), _to_float(obj[1])
+    return np.nan, np.nan
+
+
+async def _iter_lines(stream):
+    """
+    요청 본문 스트림을 줄 단위로 (UTF-8, BOM 제거)
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in stream:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending.strip():
+        yield pending.rstrip("\r")
+
+
+def _csv_cells(line: str) -> list[str]:
+    """
+    CSV 한 줄 → 셀 목록 (따옴표 안의 쉼표 처리)
+    """
+    return [cell.strip() for cell in next(csv.reader([line]), [])]
+
+
+def csv_columns(first_row: list[str]) -> tuple[int, int, bool]:
+    """
+    CSV 첫 줄로 x/y 컬럼 위치를 정합니다.
+    - 헤더(x/y 또는 lon/lat 컬럼 이름)면 그 위치, 첫 두 셀이 숫자면 헤더 없는 [x, y] 데이터로 봄
+    - return: (x 컬럼, y 컬럼, 첫 줄이 헤더인지) / 둘 다 아니면 ValueError
+    """
+    header = [cell.lower() for cell in first_row]
+    x_col = next((header.index(c) for c in _X_COLUMNS if c in header), None)
+    y_col = next((header.index(c) for c in _Y_COLUMNS if c in header), None)
+    if x_col is not None and y_col is not None:
+        return x_col, y_col, True
+    if len(first_row) >= 2 and np.isfinite(_to_float(first_row[0])) and np.isfinite(_to_float(first_row[1])):
+        return 0, 1, False
+    raise ValueError("CSV 첫 줄에 x/y (또는 lon/lat) 컬럼 이름이 있거나, 헤더 없이 경도,위도 값이어야 합니다.")
+
+
+def _csv_point(cells: list[str], x_col: int, y_col: int) -> tuple[float, float]:
+    return (_to_float(cells[x_col]) if x_col < len(cells) else np.nan,
+            _to_float(cells[y_col]) if y_col < len(cells) else np.nan)
+
+
+async def open_point_blocks(request, block_size: int | None = None):
+    """
+    요청 본문을 (x 배열, y 배열) 블록 단위로 읽는 비동기 이터레이터를 반환
+    응답(200)을 보내기 전에 JSON 본문 전체 / CSV 첫 줄을 읽어 형식을 확인하므로, 형식 오류는 ValueError 로 알림
+    - text/csv: 헤더에 x/y (또는 lon/lat) 컬럼, 또는 헤더 없이 경도,위도 순서. 스트리밍 처리
+    - application/x-ndjson: 한 줄에 {"x":.., "y":..} 또는 [x, y], 스트리밍 처리
+    - 그 외(JSON): 본문 전체를 읽어 처리
+    """
+    block_size = block_size or settings.ELIGIBILITY_BLOCK_SIZE
+    content_type = request.headers.get("content-type", "")
+
+    if "csv" in content_type:
+        lines = _iter_lines(request.stream())
+        first_row = None
+        async for line in lines:
+            if line.strip():
+                first_row = _csv_cells(line)
+                break
+        x_col, y_col, has_header = csv_columns(first_row) if first_row is not None else (0, 1, True)
+
+        async def points():
+            if first_row is None:
+                return
+            if not has_header:
+                yield _csv_point(first_row, x_col, y_col)
+            async for line in lines:
+                if line.strip():
+                    yield _csv_point(_csv_cells(line), x_col, y_col)
+    elif "ndjson" in content_type or "jsonl" in content_type:
+        async def points():
+            async for line in _iter_lines(request.stream()):
+                if not line.strip():
+                    continue
+                try:
+                    yield _point_from_obj(json.loads(line))
+                except ValueError:
+                    yield np.nan, np.nan
+    else:
+        json_points = parse_json_points(await request.body())
+
+        async def points():
+            for point in json_points:
+                yield _point_from_obj(point)
+
+    async def blocks():
+        xs: list[float] = []
+        ys: list[float] = []
+        async for x, y in points():
+            xs.append(x)
+            ys.append(y)
+            if len(xs) >= block_size:
+                yield np.array(xs), np.array(ys)
+                xs, ys = [], []
+        if xs:
+            yield np.array(xs), np.array(ys)
+
+    return blocks()
+
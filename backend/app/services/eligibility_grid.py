@@ -0,0 +1,539 @@
+# app/services/eligibility_grid.py
+"""
+입점 가능 여부 격자 (/check-location/{위도}/{경도} 용 사전 계산 결과)
+
+서비스 영역(소매점/제한 구역 범위)을 ELIGIBILITY_GRID_CELL_METER 크기 정사각 셀(EPSG:5186)로 나누고,
+셀마다 상태를 2비트로 저장합니다. (1바이트에 4셀, 메모리 매핑으로 읽음)
+계산/저장은 행 묶음(band) 단위로 하므로 전체 크기의 셀 배열을 메모리에 만들지 않습니다.
+- ELIGIBLE      : 셀 전체가 제한 구역 밖이고 모든 소매점과 최소 거리 이상
+- RESTRICTED    : 셀 전체가 한 제한 구역 안
+- NEAR_RETAILER : 셀 전체가 어떤 소매점과 최소 거리 미만 (제한 구역과는 겹치지 않음)
+- BOUNDARY      : 셀 안에서 결과가 갈림 → 정확한 geometry 계산(eligibility.evaluate_points)으로 판정
+
+갱신: 마지막으로 만든 격자의 제한 구역(WKB 해시, 범위)/소매점 좌표를 함께 저장해 두고,
+현재 메모리 인덱스와 비교해 추가/삭제된 구역·소매점 주변 셀만 다시 계산합니다.
+범위를 벗어나거나 설정이 바뀐 경우만 전체를 다시 만듭니다.
+
+오프라인 실행 (backend 디렉토리에서, DB 접속 가능 상태):
+    python -m app.services.eligibility_grid [--full]
+"""
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import time
+import uuid
+import numpy as np
+import shapely
+
+from app.core.config import settings
+from app.services import spatial_index
+from app.utils.geo import transformer_wgs_to_metric
+
+ELIGIBLE, RESTRICTED, NEAR_RETAILER, BOUNDARY = 0, 1, 2, 3
+STATE_NAMES = {ELIGIBLE: "eligible", RESTRICTED: "restricted", NEAR_RETAILER: "near_retailer", BOUNDARY: "boundary"}
+
+HEADER_FILE = "grid.json"
+# 데이터/상태 파일 이름: 생성 시작 시각(ns) + 임의 id. 시각이 더 큰 파일은 다른 워커가 만드는 중이거나 더 새 격자
+GRID_FILE_NAME = re.compile(r"^(?:grid|state)-(?:(\d+)-)?[0-9a-f]+\.(?:bin|npz)$")
+# 좌표 변환(WGS84 polygon → 미터 좌표) 오차를 흡수하는 여유 (m). 이 범위에 걸치는 셀은 BOUNDARY
+EDGE_EPS_METER = 0.05
+# 바뀐 셀이 전체의 이 비율을 넘으면 부분 갱신 대신 전체 재계산
+FULL_REBUILD_RATIO = 0.5
+
+
+class EligibilityGrid:
+    """
+    메모리 매핑된 2비트 셀 배열 + 격자 정보(header)
+    만들어진 격자는 수정하지 않고, 갱신 시 새 파일을 만들어 통째로 교체합니다.
+    """
+
+    def __init__(self, header: dict, packed: np.ndarray):
+        self.header = header
+        self.packed = packed
+        self.origin_x = header["origin_x"]
+        self.origin_y = header["origin_y"]
+        self.cell = header["cell_meter"]
+        self.rows = header["rows"]
+        self.cols = header["cols"]
+
+    def covers(self, bounds) -> bool:
+        minx, miny, maxx, maxy = bounds
+        return (minx >= self.origin_x and miny >= self.origin_y
+                and maxx <= self.origin_x + self.cols * self.cell
+                and maxy <= self.origin_y + self.rows * self.cell)
+
+    def cell_of(self, mx: float, my: float) -> tuple[int, int] | None:
+        col = math.floor((mx - self.origin_x) / self.cell)
+        row = math.floor((my - self.origin_y) / self.cell)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    def code_at(self, row: int, col: int) -> int:
+        i = row * self.cols + col
+        return (int(self.packed[i >> 2]) >> ((i & 3) * 2)) & 3
+
+    def lookup(self, lon: float, lat: float) -> int | None:
+        """
+        좌표(경도, 위도)의 셀 상태, 격자 밖이면 None
+        """
+        mx, my = transformer_wgs_to_metric.transform(lon, lat)
+        cell = self.cell_of(mx, my)
+        return None if cell is None else self.code_at(*cell)
+
+    def unpack_rows(self, r0: int, r1: int) -> np.ndarray:
+        """
+        r0 ~ r1 행의 셀 상태 (r1-r0, cols) uint8 배열 (r0 은 4의 배수, 부분 갱신용 복사본)
+        """
+        b0, b1 = _band_bytes(self.cols, r0, r1)
+        return unpack_codes(self.packed[b0:b1], (r1 - r0) * self.cols).reshape(r1 - r0, self.cols)
+
+
+def pack_codes(codes: np.ndarray) -> np.ndarray:
+    """
+    0~3 값 배열 → 1바이트에 4개씩 (앞 셀이 하위 비트)
+    """
+    flat = np.asarray(codes, dtype=np.uint8).ravel()
+    if len(flat) % 4:
+        flat = np.concatenate([flat, np.zeros(4 - len(flat) % 4, dtype=np.uint8)])
+    quads = flat.reshape(-1, 4)
+    packed = quads[:, 0].copy()
+    for i in (1, 2, 3):
+        packed |= quads[:, i] << (i * 2)
+    return packed
+
+
+def unpack_codes(packed: np.ndarray, count: int) -> np.ndarray:
+    packed = np.asarray(packed, dtype=np.uint8)
+    quads = np.empty((len(packed), 4), dtype=np.uint8)
+    for i in range(4):
+        np.right_shift(packed, i * 2, out=quads[:, i])
+    quads &= 3
+    return quads.ravel()[:count]
+
+
+# 바이트 값별 (셀 상태별 셀 수) 표: 압축된 배열을 풀지 않고 상태별 개수를 셈
+_BYTE_COUNTS = sum(((np.arange(256)[:, None] >> (i * 2)) & 3) == np.arange(4) for i in range(4))
+
+
+def count_codes(packed: np.ndarray, count: int) -> dict:
+    """
+    압축된 배열의 상태별 셀 수 (끝의 채움 셀 제외)
+    """
+    counts = np.bincount(np.asarray(packed), minlength=256) @ _BYTE_COUNTS
+    counts[ELIGIBLE] -= len(packed) * 4 - count
+    return {STATE_NAMES[code]: int(n) for code, n in enumerate(counts)}
+
+
+def _band_bytes(cols: int, r0: int, r1: int) -> tuple[int, int]:
+    """
+    r0 ~ r1 행이 들어 있는 압축 배열 바이트 범위 (r0 이 4의 배수면 앞 바이트를 다른 행과 나누지 않음)
+    """
+    return r0 * cols // 4, -(-r1 * cols // 4)
+
+
+def _band_size() -> int:
+    return max(4, -(-settings.ELIGIBILITY_GRID_WINDOW // 4) * 4)
+
+
+class _Sources:
+    """
+    격자 계산 입력: 미터 좌표 제한 구역 polygon / 소매점 좌표와 각각의 STRtree
+    """
+
+    def __init__(self, zone_index, retailer_index):
+        if len(zone_index):
+            self.zones = shapely.transform(zone_index.polygons, _to_metric)
+            self.zone_keys = np.array(
+                [int.from_bytes(hashlib.blake2b(wkb, digest_size=8).digest(), "little")
+                 for wkb in shapely.to_wkb(zone_index.polygons)], dtype=np.uint64)
+        else:
+            self.zones = np.empty(0, dtype=object)
+            self.zone_keys = np.empty(0, dtype=np.uint64)
+        shapely.prepare(self.zones)
+        self.zone_bounds = shapely.bounds(self.zones).reshape(-1, 4)
+        self.zone_tree = shapely.STRtree(self.zones)
+
+        self.retailers = shapely.get_coordinates(retailer_index.tree.geometries).reshape(-1, 2)
+        self.retailer_tree = shapely.STRtree(shapely.points(self.retailers))
+
+    def extent(self, margin: float):
+        parts = []
+        if len(self.zones):
+            parts.append(self.zone_bounds)
+        if len(self.retailers):
+            parts.append(np.hstack([self.retailers, self.retailers]))
+        if not parts:
+            return None
+        bounds = np.vstack(parts)
+        return (bounds[:, 0].min() - margin, bounds[:, 1].min() - margin,
+                bounds[:, 2].max() + margin, bounds[:, 3].max() + margin)
+
+
+def _to_metric(coords: np.ndarray) -> np.ndarray:
+    x, y = transformer_wgs_to_metric.transform(coords[:, 0], coords[:, 1])
+    return np.column_stack([x, y])
+
+
+def _cell_range(header: dict, bounds, window) -> tuple[int, int, int, int]:
+    """
+    미터 좌표 범위를 덮는 셀 범위 (r0, r1, c0, c1), window(r0, r1, c0, c1) 안으로 자름
+    """
+    ox, oy, s = header["origin_x"], header["origin_y"], header["cell_meter"]
+    minx, miny, maxx, maxy = bounds
+    r0 = max(window[0], math.floor((miny - oy) / s))
+    r1 = min(window[1], math.floor((maxy - oy) / s) + 1)
+    c0 = max(window[2], math.floor((minx - ox) / s))
+    c1 = min(window[3], math.floor((maxx - ox) / s) + 1)
+    return r0, r1, c0, c1
+
+
+def classify_window(header: dict, sources: _Sources, window) -> np.ndarray:
+    """
+    셀 범위 window(r0, r1, c0, c1) 의 셀 상태 (r1-r0, c1-c0) uint8 배열
+    """
+    r0, r1, c0, c1 = window
+    ox, oy, s = header["origin_x"], header["origin_y"], header["cell_meter"]
+    d = header["min_distance"]
+    shape = (r1 - r0, c1 - c0)
+    zone_full = np.zeros(shape, dtype=bool)
+    zone_touch = np.zeros(shape, dtype=bool)
+    near_full = np.zeros(shape, dtype=bool)
+    near_touch = np.zeros(shape, dtype=bool)
+    window_box = shapely.box(ox + c0 * s, oy + r0 * s, ox + c1 * s, oy + r1 * s)
+
+    # 제한 구역: 셀 사각형이 polygon 에 완전히 포함되면 full, 조금이라도 겹치면 touch
+    for zi in sources.zone_tree.query(window_box):
+        zr0, zr1, zc0, zc1 = _cell_range(header, sources.zone_bounds[zi], window)
+        if zr0 >= zr1 or zc0 >= zc1:
+            continue
+        rows, cols = np.mgrid[zr0:zr1, zc0:zc1]
+        boxes = shapely.box(ox + cols * s - EDGE_EPS_METER, oy + rows * s - EDGE_EPS_METER,
+                            ox + (cols + 1) * s + EDGE_EPS_METER, oy + (rows + 1) * s + EDGE_EPS_METER)
+        polygon = sources.zones[zi]
+        touch = shapely.intersects(polygon, boxes)
+        full = touch & shapely.contains_properly(polygon, boxes)
+        zone_touch[zr0 - r0:zr1 - r0, zc0 - c0:zc1 - c0] |= touch
+        zone_full[zr0 - r0:zr1 - r0, zc0 - c0:zc1 - c0] |= full
+
+    # 소매점: 셀에서 가장 먼 점까지 거리 < d 이면 full, 가장 가까운 점까지 거리 < d 이면 touch
+    search_box = shapely.box(ox + c0 * s - d, oy + r0 * s - d, ox + c1 * s + d, oy + r1 * s + d)
+    for px, py in sources.retailers[sources.retailer_tree.query(search_box)]:
+        pr0, pr1, pc0, pc1 = _cell_range(header, (px - d, py - d, px + d, py + d), window)
+        if pr0 >= pr1 or pc0 >= pc1:
+            continue
+        x0 = ox + np.arange(pc0, pc1) * s
+        y0 = oy + np.arange(pr0, pr1) * s
+        dx_min = np.maximum(0.0, np.maximum(x0 - px, px - (x0 + s)))
+        dy_min = np.maximum(0.0, np.maximum(y0 - py, py - (y0 + s)))
+        dx_max = np.maximum(np.abs(x0 - px), np.abs(x0 + s - px))
+        dy_max = np.maximum(np.abs(y0 - py), np.abs(y0 + s - py))
+        d_min = np.hypot(dy_min[:, None], dx_min[None, :])
+        d_max = np.hypot(dy_max[:, None], dx_max[None, :])
+        near_touch[pr0 - r0:pr1 - r0, pc0 - c0:pc1 - c0] |= d_min < d + EDGE_EPS_METER
+        near_full[pr0 - r0:pr1 - r0, pc0 - c0:pc1 - c0] |= d_max < d - EDGE_EPS_METER
+
+    codes = np.full(shape, ELIGIBLE, dtype=np.uint8)
+    codes[near_touch] = BOUNDARY
+    codes[near_full] = NEAR_RETAILER
+    codes[zone_touch] = BOUNDARY
+    codes[zone_full] = RESTRICTED
+    return codes
+
+
+def _windows(r0: int, r1: int, c0: int, c1: int, size: int):
+    for wr in range(r0, r1, size):
+        for wc in range(c0, c1, size):
+            yield wr, min(wr + size, r1), wc, min(wc + size, c1)
+
+
+def _grid_dir() -> str:
+    return settings.ELIGIBILITY_GRID_DIR
+
+
+def _open_grid() -> tuple[EligibilityGrid, dict] | None:
+    """
+    디스크의 마지막 격자와 생성 당시 입력 상태(state), 없거나 손상되었으면 None
+    """
+    try:
+        with open(os.path.join(_grid_dir(), HEADER_FILE), encoding="utf-8") as f:
+            header = json.load(f)
+        data_path = os.path.join(_grid_dir(), header["data_file"])
+        packed = np.memmap(data_path, dtype=np.uint8, mode="r")
+        with np.load(os.path.join(_grid_dir(), header["state_file"])) as state:
+            state = {key: state[key] for key in state.files}
+    except (OSError, KeyError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"입점 가능 격자 파일을 읽지 못했습니다: {e}")
+        return None
+    return EligibilityGrid(header, packed), state
+
+
+def _file_stamp(name: str) -> int:
+    """
+    데이터/상태 파일 이름의 생성 시각, 이전 형식(시각 없음)이면 0
+    """
+    match = GRID_FILE_NAME.match(name)
+    return int(match.group(1) or 0) if match else -1
+
+
+def _new_data_file(header: dict, source: str | None = None) -> tuple[dict, np.memmap]:
+    """
+    새 데이터 파일을 만들어 쓰기용으로 매핑 (source 가 있으면 그 파일을 복사해서 시작)
+    """
+    directory = _grid_dir()
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.time_ns()
+    build_id = uuid.uuid4().hex[:12]
+    header = {**header, "stamp": stamp, "data_file": f"grid-{stamp}-{build_id}.bin",
+              "state_file": f"state-{stamp}-{build_id}.npz"}
+    path = os.path.join(directory, header["data_file"])
+    size = -(-header["rows"] * header["cols"] // 4)
+    if source is None:
+        packed = np.memmap(path, dtype=np.uint8, mode="w+", shape=(size,))
+    else:
+        shutil.copyfile(source, path)
+        packed = np.memmap(path, dtype=np.uint8, mode="r+", shape=(size,))
+    return header, packed
+
+
+def _write_grid(header: dict, packed: np.memmap, sources: _Sources) -> EligibilityGrid:
+    """
+    채운 데이터 파일과 상태 파일을 저장한 뒤 header 를 원자적으로 교체하고, 이전 파일은 삭제
+    - 다른 워커가 더 나중에 시작한 격자를 이미 올렸으면 header 를 덮어쓰지 않고 그 격자를 씀
+    - 삭제는 현재 header 보다 먼저 시작한 파일만 (나중에 시작한 파일은 다른 워커가 만드는 중일 수 있음)
+    (이미 메모리 매핑된 이전 파일은 삭제 후에도 매핑이 유지됨)
+    """
+    directory = _grid_dir()
+    packed.flush()
+    header = {**header, "built_at": time.time(), "counts": count_codes(packed, header["rows"] * header["cols"])}
+    del packed
+    np.savez(os.path.join(directory, header["state_file"]), zone_keys=sources.zone_keys,
+             zone_bounds=sources.zone_bounds, retailers=sources.retailers)
+
+    current = _open_grid()
+    if current is not None and current[0].header.get("stamp", 0) > header["stamp"]:
+        _remove_older_files(current[0].header)
+        return current[0]
+
+    tmp_path = os.path.join(directory, f"{HEADER_FILE}.{header['stamp']}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(header, f)
+    os.replace(tmp_path, os.path.join(directory, HEADER_FILE))
+    _remove_older_files(header)
+    packed = np.memmap(os.path.join(directory, header["data_file"]), dtype=np.uint8, mode="r")
+    return EligibilityGrid(header, packed)
+
+
+def _remove_older_files(header: dict):
+    """
+    header 가 가리키는 파일보다 먼저 시작한 데이터/상태 파일만 삭제
+    """
+    directory = _grid_dir()
+    keep = (header["data_file"], header["state_file"])
+    for path in glob.glob(os.path.join(directory, "grid-*.bin")) + glob.glob(os.path.join(directory, "state-*.npz")):
+        name = os.path.basename(path)
+        if name in keep or _file_stamp(name) >= header["stamp"]:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # 다른 워커가 먼저 정리함
+
+
+def _new_header(extent) -> dict:
+    """
+    extent 에 여유(ELIGIBILITY_GRID_MARGIN_METER)를 더하고 셀 크기 배수로 맞춘 격자 범위
+    (조금 넓어지는 정도의 데이터 변경은 부분 갱신으로 처리되도록)
+    """
+    s = settings.ELIGIBILITY_GRID_CELL_METER
+    margin = settings.ELIGIBILITY_GRID_MARGIN_METER
+    minx, miny, maxx, maxy = extent
+    origin_x = math.floor((minx - margin) / s) * s
+    origin_y = math.floor((miny - margin) / s) * s
+    return {
+        "origin_x": origin_x,
+        "origin_y": origin_y,
+        "cell_meter": s,
+        "rows": math.ceil((maxy + margin - origin_y) / s),
+        "cols": math.ceil((maxx + margin - origin_x) / s),
+        "min_distance": settings.RETAILER_MIN_DISTANCE_METER,
+    }
+
+
+def _dirty_bounds(state: dict, sources: _Sources, d: float) -> list:
+    """
+    이전 격자 이후 추가/삭제된 제한 구역 범위와 소매점 주변(반경 d) 범위 목록
+    """
+    dirty = []
+    old_zones = dict(zip(state["zone_keys"].tolist(), state["zone_bounds"].tolist()))
+    new_zones = dict(zip(sources.zone_keys.tolist(), sources.zone_bounds.tolist()))
+    for key in old_zones.keys() ^ new_zones.keys():
+        dirty.append(old_zones.get(key) or new_zones[key])
+
+    def retailer_keys(xy):
+        return set(map(tuple, np.round(xy * 1000).astype(np.int64).tolist()))
+
+    for kx, ky in retailer_keys(state["retailers"]) ^ retailer_keys(sources.retailers):
+        x, y = kx / 1000, ky / 1000
+        dirty.append((x - d, y - d, x + d, y + d))
+    return dirty
+
+
+def build(zone_index, retailer_index, force: bool = False) -> tuple[EligibilityGrid | None, str]:
+    """
+    현재 인덱스 기준으로 격자를 갱신합니다. (동기, 스레드에서 호출)
+    반환: (격자, "full" / "incremental" / "unchanged" / "skipped")
+    """
+    sources = _Sources(zone_index, retailer_index)
+    d = settings.RETAILER_MIN_DISTANCE_METER
+    extent = sources.extent(d + settings.ELIGIBILITY_GRID_CELL_METER)
+    if extent is None:
+        print("입점 가능 격자: 소매점/제한 구역 데이터가 없어 건너뜁니다.")
+        return None, "skipped"
+
+    window_size = settings.ELIGIBILITY_GRID_WINDOW
+    band_size = _band_size()
+    existing = None if force else _open_grid()
+    if existing is not None:
+        grid, state = existing
+        same_params = (grid.cell == settings.ELIGIBILITY_GRID_CELL_METER and grid.header["min_distance"] == d)
+        if same_params and grid.covers(extent):
+            dirty = _dirty_bounds(state, sources, d)
+            if not dirty:
+                return grid, "unchanged"
+            full_window = (0, grid.rows, 0, grid.cols)
+            ranges = [_cell_range(grid.header, bounds, full_window) for bounds in dirty]
+            ranges = [(r0, r1, c0, c1) for r0, r1, c0, c1 in ranges if r0 < r1 and c0 < c1]
+            if sum((r1 - r0) * (c1 - c0) for r0, r1, c0, c1 in ranges) <= FULL_REBUILD_RATIO * grid.rows * grid.cols:
+                header, packed = _new_data_file(grid.header, os.path.join(_grid_dir(), grid.header["data_file"]))
+                bands = sorted({b for r0, r1, _, _ in ranges for b in range(r0 // band_size, (r1 - 1) // band_size + 1)})
+                for b in bands:
+                    br0, br1 = b * band_size, min((b + 1) * band_size, grid.rows)
+                    codes = grid.unpack_rows(br0, br1)
+                    for r0, r1, c0, c1 in ranges:
+                        for window in _windows(max(r0, br0), min(r1, br1), c0, c1, window_size):
+                            wr0, wr1, wc0, wc1 = window
+                            codes[wr0 - br0:wr1 - br0, wc0:wc1] = classify_window(header, sources, window)
+                    b0, b1 = _band_bytes(grid.cols, br0, br1)
+                    packed[b0:b1] = pack_codes(codes)
+                new_grid = _write_grid(header, packed, sources)
+                print(f"🧮 입점 가능 격자 부분 갱신: 변경 {len(dirty)}건, {new_grid.header['counts']}")
+                return new_grid, "incremental"
+
+    header = _new_header(extent)
+    cells = header["rows"] * header["cols"]
+    if cells > settings.ELIGIBILITY_GRID_MAX_CELLS:
+        print(f"입점 가능 격자: 셀 수 {cells}개가 상한({settings.ELIGIBILITY_GRID_MAX_CELLS})을 넘어 건너뜁니다.")
+        return None, "skipped"
+    header, packed = _new_data_file(header)
+    for br0 in range(0, header["rows"], band_size):
+        br1 = min(br0 + band_size, header["rows"])
+        codes = np.empty((br1 - br0, header["cols"]), dtype=np.uint8)
+        for window in _windows(br0, br1, 0, header["cols"], window_size):
+            r0, r1, c0, c1 = window
+            codes[r0 - br0:r1 - br0, c0:c1] = classify_window(header, sources, window)
+        b0, b1 = _band_bytes(header["cols"], br0, br1)
+        packed[b0:b1] = pack_codes(codes)
+    new_grid = _write_grid(header, packed, sources)
+    print(f"🧮 입점 가능 격자 생성 완료: {header['rows']}x{header['cols']} 셀, {new_grid.header['counts']}")
+    return new_grid, "full"
+
+
+# 현재 사용 중인 격자. _stale 이면 (인덱스가 바뀌고 격자 갱신 전) 조회하지 않고 정확한 계산으로 처리
+grid: EligibilityGrid | None = None
+_stale = True
+_pending = False
+_task: asyncio.Task | None = None
+stats = {"grid": 0, "exact": 0}
+
+
+def lookup(lon: float, lat: float) -> int | None:
+    """
+    좌표의 셀 상태 (ELIGIBLE / RESTRICTED / NEAR_RETAILER / BOUNDARY), 격자를 쓸 수 없으면 None
+    """
+    current = grid
+    if current is None or _stale or not (math.isfinite(lon) and math.isfinite(lat)):
+        return None
+    return current.lookup(lon, lat)
+
+
+def _sync():
+    global grid
+    zone_index = spatial_index.get_zone_index()
+    retailer_index = spatial_index.get_retailer_index()
+    if zone_index is None or retailer_index is None:
+        raise RuntimeError("제한 구역/소매점 인덱스가 아직 준비되지 않았습니다.")
+    new_grid, _ = build(zone_index, retailer_index)
+    grid = new_grid
+    return new_grid
+
+
+async def _sync_loop():
+    global _pending, _stale
+    while True:
+        _pending = False
+        try:
+            new_grid = await asyncio.to_thread(_sync)
+            _stale = _pending or new_grid is None
+        except Exception as e:
+            print(f"입점 가능 격자 갱신 중 오류 발생: {e}")
+        if not _pending:
+            return
+
+
+def request_sync() -> asyncio.Task:
+    """
+    제한 구역/소매점 인덱스가 바뀐 뒤 호출: 격자를 백그라운드로 갱신합니다.
+    갱신이 끝날 때까지는 격자 대신 정확한 계산으로 응답하고, 실행 중에 또 호출되면 끝난 뒤 한 번 더 갱신합니다.
+    """
+    global _task, _pending, _stale
+    _stale = True
+    if _task is not None and not _task.done():
+        _pending = True
+        return _task
+    _task = asyncio.create_task(_sync_loop())
+    return _task
+
+
+async def stop():
+    """
+    [앱 종료 시 실행] 진행 중인 갱신 태스크 취소
+    """
+    if _task is not None and not _task.done():
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+
+
+def get_status() -> dict:
+    current = grid
+    return {
+        "ready": current is not None and not _stale,
+        "header": current.header if current is not None else None,
+        "lookups": dict(stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="입점 가능 격자 생성 (DB 의 address / impossible 기준)")
+    parser.add_argument("--full", action="store_true", help="부분 갱신 없이 전체 다시 계산")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    zone_index = spatial_index._load_zone_index()
+    retailer_index = spatial_index._load_retailer_index()
+    _, mode = build(zone_index, retailer_index, force=args.full)
+    print(f"입점 가능 격자 {mode} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
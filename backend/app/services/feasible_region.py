@@ -0,0 +1,244 @@
+# app/services/feasible_region.py
+"""
+입점 가능 영역 계산 (구역 경계 - 제한 구역 합집합 - 기존 소매점 반경)
+
+- 입력: 구역 경계 polygon(GeoJSON) 또는 bbox (WGS84)
+- 메모리 인덱스(spatial_index)에서 구역과 겹치는 제한 구역 / 반경이 구역에 닿는 소매점만 골라
+  프로세스 풀 워커에 WKB / 미터 좌표 배열로 넘기고, 워커가 EPSG:5186 에서 합집합/차집합을 계산합니다.
+- 결과는 (구역 WKB 해시, impossible version, address version) 키로 캐시하여
+  데이터가 바뀌기 전까지 같은 구역 요청은 다시 계산하지 않습니다. (동시 요청은 한 번만 계산)
+"""
+import asyncio
+import hashlib
+import json
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import shapely
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import sync_engine
+from app.services import spatial_index
+from app.utils.cache import SWRCache
+from app.utils.geo import transformer_metric_to_wgs, transformer_wgs_to_metric
+
+# 계산된 영역(WKB, EPSG:4326)을 타일 하나로 인코딩 (tile_service 레이어와 같은 extent/buffer)
+TILE_QUERY = text("""
+    WITH bounds AS (SELECT ST_TileEnvelope(:z, :x, :y) AS env)
+    SELECT ST_AsMVT(mvt.*, 'feasible', :extent, 'geom')
+    FROM (
+        SELECT ST_AsMVTGeom(ST_Transform(ST_GeomFromWKB(:wkb, 4326), 3857), b.env, :extent, :buffer, true) AS geom
+        FROM bounds b
+    ) mvt
+    WHERE mvt.geom IS NOT NULL
+""")
+
+cache = SWRCache(settings.FEASIBLE_CACHE_SIZE, settings.FEASIBLE_CACHE_TTL_SEC)
+_pool: ProcessPoolExecutor | None = None
+
+
+class FeasibleRegion:
+    """
+    계산 결과 (WGS84 Polygon/MultiPolygon + 통계). 캐시에 그대로 저장되므로 수정하지 않습니다.
+    """
+
+    def __init__(self, geometry, properties: dict):
+        self.geometry = geometry
+        self.properties = properties
+        self._geojson: str | None = None
+
+    def to_geojson(self) -> str:
+        """
+        GeoJSON Feature 문자열 (처음 한 번만 만들고 재사용)
+        """
+        if self._geojson is None:
+            self._geojson = (f'{{"type": "Feature", "geometry": {shapely.to_geojson(self.geometry)}, '
+                             f'"properties": {json.dumps(self.properties, ensure_ascii=False)}}}')
+        return self._geojson
+
+
+def _to_metric(coords: np.ndarray) -> np.ndarray:
+    x, y = transformer_wgs_to_metric.transform(coords[:, 0], coords[:, 1])
+    return np.column_stack([x, y])
+
+
+def _to_wgs(coords: np.ndarray) -> np.ndarray:
+    x, y = transformer_metric_to_wgs.transform(coords[:, 0], coords[:, 1])
+    return np.column_stack([x, y])
+
+
+def parse_district(geojson: dict | None = None, bbox: tuple | None = None):
+    """
+    GeoJSON(geometry / Feature / FeatureCollection) 또는 bbox 튜플 → WGS84 Polygon/MultiPolygon
+    형식이 잘못되었거나 면적이 FEASIBLE_MAX_AREA_KM2 를 넘으면 ValueError
+    """
+    if bbox is not None:
+        min_x, min_y, max_x, max_y = bbox
+        if not (min_x < max_x and min_y < max_y):
+            raise ValueError("bbox 의 최소값이 최대값보다 작아야 합니다.")
+        district = shapely.box(min_x, min_y, max_x, max_y)
+    elif geojson:
+        if not isinstance(geojson, dict):
+            raise ValueError("구역 경계 GeoJSON 은 객체여야 합니다.")
+        if geojson.get("type") == "FeatureCollection":
+            features = geojson.get("features", [])
+            if not isinstance(features, list) or not all(isinstance(f, dict) for f in features):
+                raise ValueError("FeatureCollection 의 features 는 Feature 객체 목록이어야 합니다.")
+            geometries = [feature.get("geometry") for feature in features]
+        elif geojson.get("type") == "Feature":
+            geometries = [geojson.get("geometry")]
+        else:
+            geometries = [geojson]
+        if not all(g is None or isinstance(g, dict) for g in geometries):
+            raise ValueError("Feature 의 geometry 는 GeoJSON 객체여야 합니다.")
+        try:
+            parts = shapely.from_geojson([json.dumps(g) for g in geometries if g])
+        except Exception:
+            raise ValueError("구역 경계 GeoJSON 을 읽을 수 없습니다.")
+        parts = parts[np.isin(shapely.get_type_id(parts), (3, 6))]  # Polygon / MultiPolygon
+        if not len(parts):
+            raise ValueError("구역 경계는 Polygon 또는 MultiPolygon 이어야 합니다.")
+        district = shapely.union_all(shapely.make_valid(parts))
+    else:
+        raise ValueError("구역 경계(GeoJSON) 또는 bbox 가 필요합니다.")
+
+    district = shapely.normalize(district)
+    if district.is_empty or district.geom_type not in ("Polygon", "MultiPolygon"):
+        raise ValueError("구역 경계는 면적이 있는 Polygon 이어야 합니다.")
+    area_km2 = shapely.transform(district, _to_metric).area / 1e6
+    if not math.isfinite(area_km2) or area_km2 > settings.FEASIBLE_MAX_AREA_KM2:
+        raise ValueError(f"구역 면적이 너무 큽니다: {area_km2:.1f}km² (최대 {settings.FEASIBLE_MAX_AREA_KM2:g}km²)")
+    return district
+
+
+def district_key(district) -> str:
+    return hashlib.blake2b(shapely.to_wkb(district), digest_size=8).hexdigest()
+
+
+def _collect(district, zone_index: spatial_index.ZoneIndex, retailer_index: spatial_index.RetailerIndex):
+    """
+    구역과 겹치는 제한 구역 WKB 목록과, 반경(RETAILER_MIN_DISTANCE_METER)이 구역에 닿는 소매점 미터 좌표 (N x 2)
+    """
+    zone_wkbs = []
+    if len(zone_index):
+        hits = zone_index.tree.query(district, predicate="intersects")
+        zone_wkbs = shapely.to_wkb(zone_index.polygons[hits]).tolist()
+    retailer_xy = np.empty((0, 2))
+    if len(retailer_index):
+        hits = retailer_index.tree.query(shapely.transform(district, _to_metric), predicate="dwithin",
+                                         distance=settings.RETAILER_MIN_DISTANCE_METER)
+        retailer_xy = shapely.get_coordinates(retailer_index.tree.geometries.take(hits))
+    return zone_wkbs, retailer_xy
+
+
+def _solve(district_wkb: bytes, zone_wkbs: list[bytes], retailer_xy: np.ndarray,
+           distance: float, quad_segs: int) -> tuple[bytes, dict]:
+    """
+    [프로세스 풀 워커] 미터 좌표계에서 구역 - (제한 구역 ∪ 소매점 반경 원) 계산
+    - return: (결과 WKB (WGS84), 면적 통계)
+    """
+    district = shapely.transform(shapely.from_wkb(district_wkb), _to_metric)
+    blocked = []
+    if zone_wkbs:
+        # 구역 밖 부분은 합집합 전에 잘라내어 계산량을 줄임
+        zones = shapely.transform(shapely.from_wkb(zone_wkbs), _to_metric)
+        blocked.append(shapely.intersection(zones, district))
+    if len(retailer_xy):
+        # 다각형 원이 실제 원을 바깥에서 감싸도록 반지름을 늘림 (경계 근처 입점 불가 위치가 결과에 섞이지 않게)
+        radius = distance / math.cos(math.pi / (4 * quad_segs))
+        blocked.append(shapely.buffer(shapely.points(retailer_xy), radius, quad_segs=quad_segs))
+    region = district
+    if blocked:
+        region = shapely.difference(district, shapely.union_all(np.concatenate(blocked)))
+    # 차집합 결과가 비었거나 GeometryCollection 이면 Polygon 부분만 남김
+    polygons = [p for p in shapely.get_parts(region) if p.geom_type == "Polygon" and not p.is_empty]
+    region = shapely.MultiPolygon(polygons) if len(polygons) != 1 else polygons[0]
+    properties = {
+        "district_area_m2": round(district.area, 1),
+        "area_m2": round(region.area, 1),
+        "ratio": round(region.area / district.area, 4) if district.area else 0.0,
+        "zones": len(zone_wkbs),
+        "retailers": len(retailer_xy),
+        "polygons": len(polygons),
+    }
+    return shapely.to_wkb(shapely.transform(region, _to_wgs)), properties
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.pool_workers(settings.FEASIBLE_WORKERS))
+    return _pool
+
+
+async def get_feasible_region(district) -> FeasibleRegion:
+    """
+    구역의 입점 가능 영역 (캐시에 있으면 그대로, 없으면 프로세스 풀에서 계산)
+    인덱스가 아직 준비되지 않았으면 RuntimeError
+    """
+    zone_index = spatial_index.get_zone_index()
+    retailer_index = spatial_index.get_retailer_index()
+    if zone_index is None or retailer_index is None:
+        raise RuntimeError("제한 구역/소매점 인덱스가 아직 준비되지 않았습니다.")
+
+    async def compute():
+        start = time.perf_counter()
+        zone_wkbs, retailer_xy = await asyncio.to_thread(_collect, district, zone_index, retailer_index)
+        loop = asyncio.get_running_loop()
+        wkb, properties = await loop.run_in_executor(
+            _get_pool(), _solve, shapely.to_wkb(district), zone_wkbs, retailer_xy,
+            settings.RETAILER_MIN_DISTANCE_METER, settings.FEASIBLE_QUAD_SEGS)
+        properties.update({
+            "versions": {"impossible": zone_index.version, "address": retailer_index.version},
+            "elapsed_sec": round(time.perf_counter() - start, 3),
+        })
+        return FeasibleRegion(shapely.from_wkb(wkb), properties)
+
+    key = (district_key(district), zone_index.version, retailer_index.version)
+    return await cache.get_or_fetch(key, compute)
+
+
+def tile_bounds(z: int, x: int, y: int, margin: float = 0.0) -> tuple[float, float, float, float]:
+    """
+    XYZ 타일의 WGS84 범위 (margin: 타일 한 변 대비 여유 비율)
+    """
+    n = 2 ** z
+
+    def lon(tx):
+        return tx / n * 360.0 - 180.0
+
+    def lat(ty):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    return lon(x - margin), lat(min(y + 1 + margin, n)), lon(x + 1 + margin), lat(max(y - margin, 0))
+
+
+def render_tile(region: FeasibleRegion, z: int, x: int, y: int) -> bytes:
+    """
+    계산된 영역을 MVT 타일 하나로 인코딩 (타일과 겹치는 부분만 잘라서 PostGIS ST_AsMVT 로 전달)
+    """
+    clipped = shapely.clip_by_rect(region.geometry, *tile_bounds(z, x, y, settings.TILE_BUFFER / settings.TILE_EXTENT))
+    if clipped.is_empty:
+        return b""
+    params = {"z": z, "x": x, "y": y, "wkb": shapely.to_wkb(clipped),
+              "extent": settings.TILE_EXTENT, "buffer": settings.TILE_BUFFER}
+    with sync_engine.connect() as conn:
+        tile = conn.execute(TILE_QUERY, params).scalar()
+    return bytes(tile) if tile else b""
+
+
+def get_stats() -> dict:
+    return cache.stats()
+
+
+def shutdown_pool():
+    """
+    [앱 종료 시 실행] 프로세스 풀 정리
+    """
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
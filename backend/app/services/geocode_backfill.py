@@ -0,0 +1,231 @@
+# app/services/geocode_backfill.py
+import asyncio
+import random
+import time
+
+from app.core import coordination
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services import eligibility_grid, geocode_cache, naver_api, repository, spatial_index
+from app.utils.rate_limit import TokenBucket
+
+EMPTY_ADDRESS = "비어있음"
+BACKFILL_LOCK = "geocode_backfill"
+
+
+class BackfillProgress:
+    """
+    좌표 backfill 진행 상황 (API 로 그대로 노출)
+    """
+
+    def __init__(self):
+        self.status = "idle"    # idle / running / done / failed / cancelled / standby(다른 인스턴스가 실행 중)
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.committed = 0
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.error: str | None = None
+
+    def to_dict(self):
+        processed = self.succeeded + self.failed
+        end = self.finished_at or time.time()
+        return {
+            "status": self.status,
+            "total": self.total,
+            "processed": processed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retried": self.retried,
+            "committed": self.committed,
+            "percent": round(processed / self.total * 100, 1) if self.total else 100.0,
+            "elapsed_sec": round(end - self.started_at, 1) if self.started_at else 0.0,
+            "error": self.error,
+        }
+
+
+progress = BackfillProgress()
+_task: asyncio.Task | None = None
+
+
+def _fetch_missing_rows():
+    db = SessionLocal()
+    try:
+        return db.execute(repository.MISSING_COORDINATES).fetchall()
+    finally:
+        db.close()
+
+
+def _commit_batch(batch: list[dict]):
+    """
+    geocoding 성공 결과를 한 트랜잭션으로 반영 (행 지문 기준 UPDATE)
+    """
+    db = SessionLocal()
+    try:
+        db.execute(repository.UPDATE_COORDINATES, batch)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def _geocode_with_retry(address: str, bucket: TokenBucket):
+    """
+    토큰 버킷으로 요청 속도를 제한하고, 일시적 오류는 지수 백오프(+jitter)로 재시도합니다.
+    """
+    for attempt in range(settings.GEOCODE_MAX_RETRIES + 1):
+        try:
+            return await geocode_cache.get_coordinates(address, limiter=bucket)
+        except naver_api.NaverAPITransientError as e:
+            if attempt == settings.GEOCODE_MAX_RETRIES:
+                print(f"비어 있는 좌표 변환 재시도 초과: {e}")
+                return None
+            progress.retried += 1
+            delay = settings.GEOCODE_BACKOFF_BASE_SEC * (2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay))
+
+
+async def run_backfill():
+    """
+    DB에서 좌표(x, y)가 비어 있는(-1) 레코드를 찾아
+    제한된 동시성 + 토큰 버킷 요청 제한으로 geocoding 하고, 결과를 배치 단위로 커밋합니다.
+    """
+    global progress
+    progress = BackfillProgress()
+    progress.status = "running"
+    progress.started_at = time.time()
+
+    try:
+        rows = await asyncio.to_thread(_fetch_missing_rows)
+        progress.total = len(rows)
+        if not rows:
+            print("비어 있는 좌표가 없습니다.")
+            progress.status = "done"
+            return
+
+        print(f"총 {len(rows)}개의 좌표를 변환합니다. (동시성 {settings.GEOCODE_CONCURRENCY}, "
+              f"초당 {settings.NAVER_GEOCODE_QPS}건)")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for row in rows:
+            queue.put_nowait(row)
+
+        bucket = TokenBucket(settings.NAVER_GEOCODE_QPS)
+        pending: list[dict] = []
+        flush_lock = asyncio.Lock()
+
+        async def flush():
+            async with flush_lock:
+                if not pending:
+                    return
+                batch = pending[:]
+                pending.clear()
+                await asyncio.to_thread(_commit_batch, batch)
+                progress.committed += len(batch)
+
+        async def worker():
+            while True:
+                try:
+                    row_hash, landlot_addr, road_addr = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                address = landlot_addr if landlot_addr != EMPTY_ADDRESS else road_addr
+                try:
+                    coordinates = await _geocode_with_retry(address, bucket)
+                except Exception as e:
+                    # 응답 형식 오류 등 예상하지 못한 오류는 해당 행만 실패로 처리하고 다음 행으로 진행
+                    progress.failed += 1
+                    print(f"비어 있는 좌표 변환 중 오류 발생: address={address}, {e!r}")
+                    continue
+
+                if coordinates:
+                    x, y = coordinates
+                    pending.append({"x": x, "y": y, "row_hash": row_hash})
+                    progress.succeeded += 1
+                    if len(pending) >= settings.GEOCODE_BATCH_SIZE:
+                        await flush()
+                else:
+                    progress.failed += 1
+                    print(f"비어 있는 좌표 변환 실패: address={address}")
+
+        # HTTP 연결은 앱 공유 클라이언트(app.core.http_client)를 재사용
+        workers = [asyncio.create_task(worker()) for _ in range(settings.GEOCODE_CONCURRENCY)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            # 한 워커가 실패하거나 취소되면 나머지 워커도 정리하고, 이미 변환한 좌표는 커밋
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await flush()
+
+        progress.status = "done"
+        print(f"비어 있는 좌표 업데이트 완료: {progress.to_dict()}")
+
+    except asyncio.CancelledError:
+        progress.status = "cancelled"
+        raise
+    except Exception as e:
+        progress.status = "failed"
+        progress.error = str(e)
+        print(f"비어 있는 좌표 업데이트 중 오류 발생: {e}")
+    finally:
+        progress.finished_at = time.time()
+        # 새로 채운 좌표를 소매점 인덱스와 입점 가능 격자에 반영
+        if progress.committed:
+            await spatial_index.rebuild_retailer_index()
+            eligibility_grid.request_sync()
+
+
+async def run_exclusive_backfill():
+    """
+    같은 DB 를 쓰는 인스턴스 중 advisory lock 을 잡은 하나만 backfill 을 실행합니다. (geocoding 요청 중복 방지)
+    lock 을 못 잡으면 standby 로 두고 실행하지 않음 (실행 중인 인스턴스가 죽으면 다음 시작 때 이어서 채움)
+    """
+    lock = coordination.AdvisoryLock(BACKFILL_LOCK)
+    try:
+        acquired = await asyncio.to_thread(lock.try_acquire)
+    except Exception as e:
+        # lock 을 확인할 수 없으면 이전처럼 실행 (run_backfill 이 오류를 진행 상황에 기록)
+        print(f"좌표 backfill lock 확인 중 오류 발생: {e}")
+        await run_backfill()
+        return
+    if not acquired:
+        progress.status = "standby"
+        print("다른 인스턴스가 좌표 backfill 을 실행 중입니다. → 이 인스턴스는 건너뜁니다.")
+        return
+    try:
+        await run_backfill()
+    finally:
+        await asyncio.to_thread(lock.release)
+
+
+def start_background_backfill() -> asyncio.Task:
+    """
+    [앱 시작 시 실행]
+    backfill 을 백그라운드 태스크로 시작합니다. (이미 실행 중이면 기존 태스크 반환)
+    """
+    global _task
+    if _task is None or _task.done():
+        _task = asyncio.create_task(run_exclusive_backfill())
+    return _task
+
+
+async def stop_background_backfill():
+    """
+    [앱 종료 시 실행] 실행 중인 backfill 태스크 취소
+    """
+    if _task is not None and not _task.done():
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+
+
+def get_progress():
+    return progress.to_dict()
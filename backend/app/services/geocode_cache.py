@@ -0,0 +1,160 @@
+# app/services/geocode_cache.py
+import asyncio
+import json
+import re
+import unicodedata
+import httpx
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services import naver_api
+from app.utils.cache import TTLCache
+from app.utils.rate_limit import TokenBucket
+
+KIND_GEOCODE = "geocode"
+KIND_REVERSE = "reverse"
+
+# 1단계: 프로세스 내 LRU(+TTL) 캐시
+memory_cache = TTLCache(settings.GEOCODE_CACHE_SIZE, settings.GEOCODE_CACHE_TTL_SEC)
+
+# 2단계(DB) / 외부 API 호출 카운터
+db_stats = {"hits": 0, "misses": 0, "errors": 0}
+upstream_stats = {"calls": 0}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_address(address: str) -> str:
+    """
+    캐시 키용 주소 정규화 (유니코드 NFC, 앞뒤 공백 제거, 연속 공백 축소)
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", address)).strip()
+
+
+def snap_coords(lat: float, lon: float, grid: float | None = None) -> str:
+    """
+    역지오코딩 캐시 키: 좌표를 grid(도 단위) 격자로 반올림
+    """
+    grid = grid or settings.REVERSE_GEOCODE_GRID_DEG
+    snapped_lat = round(lat / grid) * grid
+    snapped_lon = round(lon / grid) * grid
+    return f"{snapped_lat:.6f},{snapped_lon:.6f}"
+
+
+def _db_get(kind: str, key: str):
+    db = SessionLocal()
+    try:
+        row = db.execute(
+            text("""
+                SELECT payload FROM geocode_cache
+                WHERE kind = :kind AND cache_key = :key
+                  AND updated_at > now() - make_interval(days => :ttl_days)
+            """),
+            {"kind": kind, "key": key, "ttl_days": settings.GEOCODE_CACHE_DB_TTL_DAYS}
+        ).first()
+        return row[0] if row else None
+    finally:
+        db.close()
+
+
+def _db_set(kind: str, key: str, payload):
+    db = SessionLocal()
+    try:
+        db.execute(
+            text("""
+                INSERT INTO geocode_cache (kind, cache_key, payload, updated_at)
+                VALUES (:kind, :key, CAST(:payload AS JSONB), now())
+                ON CONFLICT (kind, cache_key) DO UPDATE
+                SET payload = EXCLUDED.payload, updated_at = EXCLUDED.updated_at
+            """),
+            {"kind": kind, "key": key, "payload": json.dumps(payload, ensure_ascii=False)}
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _lookup(kind: str, key: str):
+    """
+    메모리 → DB 순으로 조회. DB 장애 시에도 외부 API 로 넘어갈 수 있도록 오류는 삼킴
+    """
+    cache_key = (kind, key)
+    value = memory_cache.get(cache_key)
+    if value is not None:
+        return value
+
+    try:
+        value = await asyncio.to_thread(_db_get, kind, key)
+    except Exception as e:
+        db_stats["errors"] += 1
+        print(f"[geocode cache] DB 캐시 조회 실패({kind}:{key}): {e}")
+        return None
+
+    if value is None:
+        db_stats["misses"] += 1
+        return None
+    db_stats["hits"] += 1
+    memory_cache.set(cache_key, value)
+    return value
+
+
+async def _store(kind: str, key: str, value):
+    memory_cache.set((kind, key), value)
+    try:
+        await asyncio.to_thread(_db_set, kind, key, value)
+    except Exception as e:
+        db_stats["errors"] += 1
+        print(f"[geocode cache] DB 캐시 저장 실패({kind}:{key}): {e}")
+
+
+async def get_coordinates(address: str, client: httpx.AsyncClient | None = None,
+                          limiter: TokenBucket | None = None):
+    """
+    캐시를 거친 주소 → 좌표 변환
+    - return: 경도(x), 위도(y) / None
+    - raise: naver_api.NaverAPITransientError (캐시 미스 후 외부 API 일시적 오류)
+    - limiter: 외부 API 호출 직전에만 토큰을 소비할 요청 제한기 (캐시 적중은 할당량을 쓰지 않음)
+    결과가 없는 주소(None)는 캐시하지 않습니다.
+    """
+    if not address:
+        return None
+    key = normalize_address(address)
+    cached = await _lookup(KIND_GEOCODE, key)
+    if cached is not None:
+        return tuple(cached)
+
+    if limiter is not None:
+        await limiter.acquire()
+    upstream_stats["calls"] += 1
+    coordinates = await naver_api.request_coordinates(address, client=client)
+    if coordinates:
+        await _store(KIND_GEOCODE, key, list(coordinates))
+    return coordinates
+
+
+async def get_address(lat: float, lon: float):
+    """
+    캐시를 거친 좌표 → 주소(시/구/동) 변환. 좌표는 격자로 반올림하여 키로 사용합니다.
+    """
+    key = snap_coords(lat, lon)
+    cached = await _lookup(KIND_REVERSE, key)
+    if cached is not None:
+        return cached
+
+    upstream_stats["calls"] += 1
+    address = await naver_api.get_address_from_coords(lat, lon)
+    if address:
+        await _store(KIND_REVERSE, key, address)
+    return address
+
+
+def get_stats():
+    """
+    캐시 크기 조정을 위한 적중/미스 카운터
+    """
+    return {
+        "memory": memory_cache.stats(),
+        "db": dict(db_stats),
+        "upstream": dict(upstream_stats),
+    }
@@ -0,0 +1,86 @@
+# app/services/ingest.py
+"""
+파일 → DB 적재 공용 도구 (address / 제한 구역 / POI 적재와 계산 결과 저장에서 함께 사용)
+
+- file_sha256 / get_ingest_state / save_ingest_state: 파일 해시가 마지막 적재와 같으면 적재 생략
+- copy_from_stdin / stream_csv_to_staging: COPY FROM STDIN 으로 staging 테이블에 스트리밍
+"""
+import hashlib
+import io
+import pandas as pd
+from sqlalchemy import text
+
+from app.core.config import settings
+
+
+def file_sha256(path: str) -> str:
+    """
+    파일 내용 전체의 SHA-256 해시 (적재 생략 여부 판단용)
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def copy_from_stdin(cursor, copy_sql: str, buffer: io.StringIO):
+    """
+    DB 드라이버(psycopg2 / psycopg3)에 맞게 COPY FROM STDIN 실행
+    """
+    if hasattr(cursor, "copy_expert"):
+        cursor.copy_expert(copy_sql, buffer)
+    else:
+        with cursor.copy(copy_sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def stream_csv_to_staging(conn, csv_path: str, staging_table: str, columns: list[str],
+                          transform=None, chunksize: int | None = None) -> int:
+    """
+    [공용 대용량 적재 파이프라인]
+    CSV 를 청크 단위로 읽어 COPY FROM STDIN 으로 staging 테이블에 스트리밍합니다.
+    메모리 사용량은 청크 크기에 비례하며, 적재한 전체 행 수를 반환합니다.
+    - conn: SQLAlchemy Connection (staging 테이블과 같은 트랜잭션에서 실행)
+    - transform: (청크 DataFrame, 시작 행 번호) -> DataFrame 전처리 함수
+    """
+    chunksize = chunksize or settings.CSV_CHUNK_SIZE
+    copy_sql = f"COPY {staging_table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = conn.connection.cursor()
+    total = 0
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            if transform is not None:
+                chunk = transform(chunk, total)
+            buffer = io.StringIO()
+            chunk[columns].to_csv(buffer, index=False, header=False)
+            buffer.seek(0)
+            copy_from_stdin(cursor, copy_sql, buffer)
+            total += len(chunk)
+    finally:
+        cursor.close()
+    return total
+
+
+def get_ingest_state(conn, source: str):
+    """
+    마지막으로 적재한 CSV 의 해시/행 수 조회 (없으면 None)
+    """
+    return conn.execute(
+        text("SELECT content_hash, row_count FROM ingest_state WHERE source = :source"),
+        {"source": source}
+    ).first()
+
+
+def save_ingest_state(conn, source: str, content_hash: str, row_count: int):
+    conn.execute(
+        text("""
+            INSERT INTO ingest_state (source, content_hash, row_count, loaded_at)
+            VALUES (:source, :content_hash, :row_count, now())
+            ON CONFLICT (source) DO UPDATE
+            SET content_hash = EXCLUDED.content_hash,
+                row_count = EXCLUDED.row_count,
+                loaded_at = EXCLUDED.loaded_at
+        """),
+        {"source": source, "content_hash": content_hash, "row_count": row_count}
+    )
@@ -0,0 +1,46 @@
+# app/services/isochrone.py
+import numpy as np
+import shapely
+
+from app.core.config import settings
+from app.services import local_isochrone, ors_api
+from app.utils.geo import transformer_metric_to_wgs, transformer_wgs_to_metric
+
+BACKEND_ORS = "ors"
+BACKEND_LOCAL = "local"
+BACKEND_BUFFER = "buffer"
+BACKENDS = (BACKEND_ORS, BACKEND_LOCAL, BACKEND_BUFFER)
+
+
+def is_local_backend() -> bool:
+    return settings.ISOCHRONE_BACKEND == BACKEND_LOCAL
+
+
+def buffer_polygons(longitudes, latitudes) -> np.ndarray:
+    """
+    [기하 버퍼 방식] 매장 좌표 배열 전체를 한 번에 ISOCHRONE_DISTANCE_METER 반경 원형 Polygon 으로 변환
+    - 좌표 변환(pyproj) / 버퍼(shapely.buffer) 모두 배열 단위로 1회 호출 (매장 수만큼 반복하지 않음)
+    - 도로망을 따르지 않는 직선거리 기준이라 도보 isochrone 보다 넓거나 같음 (기준선 용도)
+    - return: Shapely Polygon(WGS84) 배열 (입력 순서 유지)
+    """
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    if len(longitudes) == 0:
+        return np.empty(0, dtype=object)
+    mx, my = transformer_wgs_to_metric.transform(longitudes, latitudes)
+    circles = shapely.buffer(shapely.points(mx, my), settings.ISOCHRONE_DISTANCE_METER,
+                             quad_segs=settings.ZONE_BUFFER_QUAD_SEGS)
+    return shapely.transform(circles, lambda xy: np.column_stack(transformer_metric_to_wgs.transform(xy[:, 0], xy[:, 1])))
+
+
+async def get_isochrone_polygon(latitude: float, longitude: float):
+    """
+    설정(ISOCHRONE_BACKEND)에 따라 ORS API, 로컬 보행 그래프, 또는 기하 버퍼로 도보 거리 기반 Polygon 계산
+    - return: Shapely Polygon (WGS84) / None
+    - raise: ors_api.ORSAPITransientError (ORS 할당량 초과 등 재시도 가능한 오류)
+    """
+    if is_local_backend():
+        return await local_isochrone.get_isochrone_polygon(latitude, longitude)
+    if settings.ISOCHRONE_BACKEND == BACKEND_BUFFER:
+        return buffer_polygons([longitude], [latitude])[0]
+    return await ors_api.get_isochrone_polygon(latitude, longitude)
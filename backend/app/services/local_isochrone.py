@@ -0,0 +1,272 @@
+# app/services/local_isochrone.py
+"""
+로컬 보행 네트워크 기반 isochrone 엔진 (ORS API 대체)
+
+- 그래프 파일: OSMnx 로 저장한 GraphML, 또는 엣지 목록 CSV (u, v, u_x, u_y, v_x, v_y[, length])
+  좌표는 WGS84(경도 x, 위도 y), length 는 미터 (없으면 평면 좌표로 계산)
+- 출발점에서 가장 가까운 노드부터 거리 제한 Dijkstra 로 도달 가능한 도로 구간을 구하고,
+  그 구간을 버퍼링하여 ORS 와 같은 Shapely Polygon(WGS84)을 반환합니다.
+"""
+import asyncio
+import heapq
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry import Point, Polygon
+from shapely.ops import unary_union
+
+from app.core.config import settings
+from app.utils.geo import transformer_metric_to_wgs, transformer_wgs_to_metric
+
+_GRAPHML_NS = "{http://graphml.graphdrawing.org/xmlns}"
+
+
+class WalkGraph:
+    """
+    무방향 보행 그래프 (CSR 인접 리스트, 노드 좌표는 미터 단위 평면 좌표)
+    """
+
+    def __init__(self, node_x: np.ndarray, node_y: np.ndarray, edge_u: np.ndarray,
+                 edge_v: np.ndarray, edge_length: np.ndarray):
+        self.x = node_x
+        self.y = node_y
+
+        # 무방향: (u, v) 와 (v, u) 를 모두 넣고 출발 노드 기준으로 정렬
+        src = np.concatenate([edge_u, edge_v])
+        dst = np.concatenate([edge_v, edge_u])
+        weight = np.concatenate([edge_length, edge_length])
+        order = np.argsort(src, kind="stable")
+        self.indices = dst[order]
+        self.weights = weight[order]
+        self.indptr = np.zeros(len(node_x) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(node_x)), out=self.indptr[1:])
+
+        self.tree = shapely.STRtree(shapely.points(node_x, node_y))
+
+    @property
+    def node_count(self) -> int:
+        return len(self.x)
+
+    def nearest_node(self, x: float, y: float) -> tuple[int, float]:
+        """
+        평면 좌표 (x, y) 에서 가장 가까운 노드 번호와 거리(m)
+        """
+        index = int(self.tree.nearest(Point(x, y)))
+        return index, float(np.hypot(self.x[index] - x, self.y[index] - y))
+
+    def bounded_dijkstra(self, source: int, limit: float) -> dict[int, float]:
+        """
+        source 에서 limit(m) 이내로 도달 가능한 노드와 최단 거리
+        """
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist.get(node, np.inf):
+                continue
+            for k in range(self.indptr[node], self.indptr[node + 1]):
+                nd = d + self.weights[k]
+                if nd > limit:
+                    continue
+                neighbor = int(self.indices[k])
+                if nd < dist.get(neighbor, np.inf):
+                    dist[neighbor] = nd
+                    heapq.heappush(heap, (nd, neighbor))
+        return dist
+
+    def reachable_segments(self, dist: dict[int, float], limit: float) -> list[list[tuple[float, float]]]:
+        """
+        도달 가능한 도로 구간 (끝까지 못 가는 엣지는 남은 거리만큼만 잘라서 포함)
+        """
+        segments = []
+        for node, d in dist.items():
+            remaining = limit - d
+            start = (self.x[node], self.y[node])
+            for k in range(self.indptr[node], self.indptr[node + 1]):
+                neighbor = int(self.indices[k])
+                length = self.weights[k]
+                end = (self.x[neighbor], self.y[neighbor])
+                if length <= remaining:
+                    if node < neighbor or neighbor not in dist:
+                        segments.append([start, end])
+                elif length > 0:
+                    ratio = remaining / length
+                    segments.append([start, (start[0] + (end[0] - start[0]) * ratio,
+                                             start[1] + (end[1] - start[1]) * ratio)])
+        return segments
+
+
+def _graph_from_edges(u_ids, v_ids, u_x, u_y, v_x, v_y, length=None) -> WalkGraph:
+    """
+    노드 id / WGS84 좌표가 붙은 엣지 목록으로 WalkGraph 생성
+    """
+    ids = pd.Index(pd.unique(np.concatenate([np.asarray(u_ids), np.asarray(v_ids)])))
+    u = ids.get_indexer(u_ids)
+    v = ids.get_indexer(v_ids)
+
+    lon = np.empty(len(ids))
+    lat = np.empty(len(ids))
+    lon[u], lat[u] = u_x, u_y
+    lon[v], lat[v] = v_x, v_y
+    mx, my = transformer_wgs_to_metric.transform(lon, lat)
+    mx, my = np.asarray(mx), np.asarray(my)
+
+    if length is None:
+        length = np.hypot(mx[u] - mx[v], my[u] - my[v])
+    return WalkGraph(mx, my, u.astype(np.int64), v.astype(np.int64), np.asarray(length, dtype=np.float64))
+
+
+def _load_edge_csv(path: str) -> WalkGraph:
+    df = pd.read_csv(path)
+    length = df["length"].to_numpy(dtype=np.float64) if "length" in df.columns else None
+    return _graph_from_edges(df["u"].to_numpy(), df["v"].to_numpy(),
+                             df["u_x"].to_numpy(dtype=np.float64), df["u_y"].to_numpy(dtype=np.float64),
+                             df["v_x"].to_numpy(dtype=np.float64), df["v_y"].to_numpy(dtype=np.float64),
+                             length)
+
+
+def _load_graphml(path: str) -> WalkGraph:
+    """
+    OSMnx GraphML (노드 속성 x, y / 엣지 속성 length) 읽기
+    """
+    root = ET.parse(path).getroot()
+    keys = {(key.get("for"), key.get("attr.name")): key.get("id") for key in root.iter(f"{_GRAPHML_NS}key")}
+    x_key, y_key = keys.get(("node", "x")), keys.get(("node", "y"))
+    length_key = keys.get(("edge", "length"))
+
+    coords = {}
+    for node in root.iter(f"{_GRAPHML_NS}node"):
+        data = {d.get("key"): d.text for d in node.iter(f"{_GRAPHML_NS}data")}
+        coords[node.get("id")] = (float(data[x_key]), float(data[y_key]))
+
+    rows = []
+    for edge in root.iter(f"{_GRAPHML_NS}edge"):
+        data = {d.get("key"): d.text for d in edge.iter(f"{_GRAPHML_NS}data")}
+        u, v = edge.get("source"), edge.get("target")
+        length = float(data[length_key]) if length_key and data.get(length_key) else np.nan
+        rows.append((u, v, *coords[u], *coords[v], length))
+
+    df = pd.DataFrame(rows, columns=["u", "v", "u_x", "u_y", "v_x", "v_y", "length"])
+    length = None if df["length"].isna().any() else df["length"].to_numpy()
+    return _graph_from_edges(df["u"].to_numpy(), df["v"].to_numpy(),
+                             df["u_x"].to_numpy(), df["u_y"].to_numpy(),
+                             df["v_x"].to_numpy(), df["v_y"].to_numpy(), length)
+
+
+def load_graph(path: str) -> WalkGraph:
+    """
+    확장자에 따라 GraphML(.graphml) 또는 엣지 목록 CSV 를 읽어 WalkGraph 반환
+    """
+    if path.lower().endswith(".graphml"):
+        return _load_graphml(path)
+    return _load_edge_csv(path)
+
+
+# --- 프로세스별 그래프 캐시 (메인 프로세스 / 풀 워커 각각 한 번만 로드) ---
+_graph: WalkGraph | None = None
+_pool: ProcessPoolExecutor | None = None
+
+
+def _get_graph() -> WalkGraph:
+    global _graph
+    if _graph is None:
+        _graph = load_graph(settings.ISOCHRONE_GRAPH_PATH)
+        print(f"[local isochrone] 보행 그래프 로드 완료: 노드 {_graph.node_count}개")
+    return _graph
+
+
+def _init_worker():
+    _get_graph()
+
+
+def compute_isochrone(latitude: float, longitude: float) -> Polygon | None:
+    """
+    한 지점의 도보 거리(ISOCHRONE_DISTANCE_METER) 기반 Polygon(WGS84) 계산
+    """
+    graph = _get_graph()
+    limit = settings.ISOCHRONE_DISTANCE_METER
+    ox, oy = transformer_wgs_to_metric.transform(longitude, latitude)
+
+    source, snap_distance = graph.nearest_node(ox, oy)
+    if snap_distance > settings.ISOCHRONE_MAX_SNAP_METER:
+        print(f"[local isochrone] 가까운 보행 도로가 없습니다: latitude={latitude}, longitude={longitude}")
+        return None
+
+    budget = limit - snap_distance
+    dist = graph.bounded_dijkstra(source, budget)
+    lines = [[(ox, oy), (graph.x[source], graph.y[source])]]
+    lines.extend(graph.reachable_segments(dist, budget))
+
+    reached = unary_union(shapely.linestrings(lines)).buffer(settings.ISOCHRONE_BUFFER_METER)
+    if reached.geom_type == "MultiPolygon":
+        reached = max(reached.geoms, key=lambda g: g.area)
+    reached = Polygon(reached.exterior).simplify(1.0)
+
+    # 평면 좌표 → WGS84
+    return shapely.transform(reached, lambda xy: np.column_stack(
+        transformer_metric_to_wgs.transform(xy[:, 0], xy[:, 1])))
+
+
+def _compute_batch(origins: list[tuple[float, float]]) -> list[str | None]:
+    # 프로세스 간 전달은 WKT 로 (Polygon 피클보다 가볍고 버전 의존성 없음)
+    results = []
+    for latitude, longitude in origins:
+        try:
+            poly = compute_isochrone(latitude, longitude)
+        except Exception as e:
+            print(f"[local isochrone] 계산 오류(latitude={latitude}, longitude={longitude}): {e}")
+            poly = None
+        results.append(poly.wkt if poly is not None else None)
+    return results
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.pool_workers(settings.ISOCHRONE_WORKERS),
+                                    initializer=_init_worker)
+    return _pool
+
+
+async def compute_isochrones(origins: list[tuple[float, float]]) -> list[Polygon | None]:
+    """
+    여러 출발점 (위도, 경도) 을 프로세스 풀에서 나누어 계산 (입력 순서대로 결과 반환)
+    """
+    if not origins:
+        return []
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    chunk = max(1, settings.ISOCHRONE_CHUNK_SIZE)
+    futures = [loop.run_in_executor(pool, _compute_batch, origins[i:i + chunk])
+               for i in range(0, len(origins), chunk)]
+    results = []
+    for wkts in await asyncio.gather(*futures):
+        results.extend(shapely.from_wkt(wkt) if wkt else None for wkt in wkts)
+    return results
+
+
+async def get_isochrone_polygon(latitude: float, longitude: float):
+    """
+    ors_api.get_isochrone_polygon 과 같은 계약: Shapely Polygon / 실패 시 None
+    """
+    if not latitude or not longitude:
+        print(f"[local isochrone] 제한 구역 계산에 실패했습니다: latitude={latitude}, longitude={longitude}")
+        return None
+    try:
+        return (await compute_isochrones([(latitude, longitude)]))[0]
+    except Exception as e:
+        print(f"[local isochrone] 계산 중 오류 발생(latitude={latitude}, longitude={longitude}): {e}")
+        return None
+
+
+def shutdown_pool():
+    """
+    [앱 종료 시 실행] 프로세스 풀 정리
+    """
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
@@ -1,16 +1,26 @@
 # app/services/naver_api.py
 import httpx
 from app.core.config import settings
+from app.core.http_client import http_clients, NAVER_MAPS, NAVER_SEARCH
 
 NAVER_GEOCODING_URL = "https://maps.apigw.ntruss.com/map-geocode/v2/geocode"
+NAVER_REVERSE_GEOCODING_URL = "https://maps.apigw.ntruss.com/map-reversegeocode/v2/gc"
+NAVER_SEARCH_URL = "https://openapi.naver.com/v1/search/local.json"
 
 
-async def get_coordinates_from_address(address: str):
+class NaverAPITransientError(Exception):
     """
-    NAVER Maps API(Geocoding)를 사용하여 주소를 경도와 위도 좌표로 변환하는 함수
-    - return: 경도(x), 위도(y) / None
+    재시도하면 성공할 수 있는 NAVER API 오류 (429, 5xx, 타임아웃, 네트워크 오류)
+    """
+
+
+async def request_coordinates(address: str, client: httpx.AsyncClient | None = None):
+    """
+    NAVER Maps API(Geocoding) 단일 요청
+    - return: 경도(x), 위도(y) / None (결과 없음, 인증 정보 없음 등 재시도해도 소용없는 경우)
+    - raise: NaverAPITransientError (재시도 가능한 오류)
+    - client: 사용할 httpx.AsyncClient (없으면 앱 공유 클라이언트)
     """
-    
     if not address:
         print(f"주소 변환에 실패했습니다: address={address}")
         return None
@@ -29,35 +39,50 @@ async def get_coordinates_from_address(address: str):
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(NAVER_GEOCODING_URL, headers=headers, params=params, timeout=5.0)
-            
-            if response.status_code != 200:
-                print(f"NAVER Maps API 요청 실패(address={address}): [{response.status_code}] {response.text}")
-                return None
-            
-            data = response.json()
-            status = data.get("status", "UNKNOWN")
-            
-            if status == "OK" and data.get("addresses"):
-                addr = data["addresses"][0]
-                x = float(addr.get("x", -1.0)) # 경도
-                y = float(addr.get("y", -1.0)) # 위도
-                return x, y
-            else:
-                message = data.get("errorMessage", "-")
-                print(f"NAVER Maps API 주소 변환 실패(address={address}): status={status}, error={message}")
-                return None
-    
-    except httpx.ReadTimeout:
-        print(f"NAVER Maps API 타임아웃(address={address})")
-        return None
+        client = client or http_clients.get(NAVER_MAPS)
+        response = await client.get(NAVER_GEOCODING_URL, headers=headers, params=params)
+    except httpx.TimeoutException as e:
+        raise NaverAPITransientError(f"NAVER Maps API 타임아웃(address={address})") from e
     except httpx.RequestError as e:
-        print(f"네트워크 오류 발생(address={address}): {e}")
+        raise NaverAPITransientError(f"네트워크 오류 발생(address={address}): {e}") from e
+
+    if response.status_code == 429 or response.status_code >= 500:
+        raise NaverAPITransientError(
+            f"NAVER Maps API 일시적 오류(address={address}): [{response.status_code}] {response.text}")
+    
+    if response.status_code != 200:
+        print(f"NAVER Maps API 요청 실패(address={address}): [{response.status_code}] {response.text}")
         return None
+    
+    try:
+        data = response.json()
     except ValueError as e:
         print(f"JSON 파싱 오류(address={address}): {e}")
         return None
+    
+    status = data.get("status", "UNKNOWN")
+    
+    if status == "OK" and data.get("addresses"):
+        addr = data["addresses"][0]
+        x = float(addr.get("x", -1.0)) # 경도
+        y = float(addr.get("y", -1.0)) # 위도
+        return x, y
+    else:
+        message = data.get("errorMessage", "-")
+        print(f"NAVER Maps API 주소 변환 실패(address={address}): status={status}, error={message}")
+        return None
+
+
+async def get_coordinates_from_address(address: str):
+    """
+    NAVER Maps API(Geocoding)를 사용하여 주소를 경도와 위도 좌표로 변환하는 함수
+    - return: 경도(x), 위도(y) / None
+    """
+    try:
+        return await request_coordinates(address)
+    except NaverAPITransientError as e:
+        print(e)
+        return None
     except Exception as e:
         print(f"NAVER Maps API 요청 중 알 수 없는 오류 발생(address={address}): {e}")
         return None
@@ -70,7 +95,6 @@ async def get_address_from_coords(lat: float, lon: float):
         print("❌ ERROR: Ncloud API 키 누락")
         return None
 
-    url = "https://maps.apigw.ntruss.com/map-reversegeocode/v2/gc"
     headers = {
         "X-NCP-APIGW-API-KEY-ID": settings.NAVER_CLIENT_ID,
         "X-NCP-APIGW-API-KEY": settings.NAVER_CLIENT_SECRET,
@@ -83,28 +107,28 @@ async def get_address_from_coords(lat: float, lon: float):
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, headers=headers, params=params)
-            data = response.json()
-            
-            # 2. HTTP 상태 코드 확인 (200 OK가 아니면 에러)
-            if response.status_code != 200:
-                 print(f"⚠️ Geocoding API HTTP 오류: Status={response.status_code}, Body={data}")
-                 return None
-            
-            # 3. 안전하게 응답 데이터 확인 (.get 사용)
-            # 'status' 키가 없거나, 'status' 안에 'code'가 0이 아니거나, 'results'가 비어있으면 실패로 간주
-            status_data = data.get("status")
-            if status_data and status_data.get("code") == 0 and data.get("results"):
-                region = data["results"][0]["region"]
-                area1 = region["area1"]["name"]
-                area2 = region["area2"]["name"]
-                area3 = region["area3"]["name"]
-                return f"{area1} {area2} {area3}"
-            else:
-                # 정상 응답 구조가 아니거나 에러 코드가 반환된 경우
-                print(f"⚠️ Geocoding API 응답 오류: {data}")
-                return None
+        client = http_clients.get(NAVER_MAPS)
+        response = await client.get(NAVER_REVERSE_GEOCODING_URL, headers=headers, params=params)
+        data = response.json()
+        
+        # 2. HTTP 상태 코드 확인 (200 OK가 아니면 에러)
+        if response.status_code != 200:
+             print(f"⚠️ Geocoding API HTTP 오류: Status={response.status_code}, Body={data}")
+             return None
+        
+        # 3. 안전하게 응답 데이터 확인 (.get 사용)
+        # 'status' 키가 없거나, 'status' 안에 'code'가 0이 아니거나, 'results'가 비어있으면 실패로 간주
+        status_data = data.get("status")
+        if status_data and status_data.get("code") == 0 and data.get("results"):
+            region = data["results"][0]["region"]
+            area1 = region["area1"]["name"]
+            area2 = region["area2"]["name"]
+            area3 = region["area3"]["name"]
+            return f"{area1} {area2} {area3}"
+        else:
+            # 정상 응답 구조가 아니거나 에러 코드가 반환된 경우
+            print(f"⚠️ Geocoding API 응답 오류: {data}")
+            return None
     except httpx.RequestError as e:
          print(f"❌ Geocoding 네트워크 요청 에러: {e}")
          return None
@@ -121,7 +145,6 @@ async def search_places(query: str):
         print(f"[DEBUG] ❌ 검색 실패: Developers API 키가 없습니다. (Query: {query})")
         return []
 
-    url = "https://openapi.naver.com/v1/search/local.json"
     headers = {
         "X-Naver-Client-Id": settings.NAVER_DEV_ID,
         "X-Naver-Client-Secret": settings.NAVER_DEV_SECRET
@@ -135,22 +158,22 @@ async def search_places(query: str):
     print(f"[DEBUG] 🔎 검색 요청 시작: Query='{query}'") # 요청 시작 로그
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, headers=headers, params=params)
-            
-            # 응답 상태 코드 및 바디 확인
-            print(f"[DEBUG] 📩 검색 응답 수신: Status={response.status_code}, Query='{query}'")
+        client = http_clients.get(NAVER_SEARCH)
+        response = await client.get(NAVER_SEARCH_URL, headers=headers, params=params)
+        
+        # 응답 상태 코드 및 바디 확인
+        print(f"[DEBUG] 📩 검색 응답 수신: Status={response.status_code}, Query='{query}'")
 
-            if response.status_code == 200:
-                data = response.json()
-                items = data.get("items", [])
-                print(f"[DEBUG] ✅ 검색 성공: {len(items)}건 발견 (Query='{query}')")
-                return items
-            else:
-                # 200 OK가 아닌 경우 응답 본문(에러 메시지) 출력
-                print(f"[DEBUG] ⚠️ 검색 API 오류 응답: Body={response.text}")
-                return []
-                
+        if response.status_code == 200:
+            data = response.json()
+            items = data.get("items", [])
+            print(f"[DEBUG] ✅ 검색 성공: {len(items)}건 발견 (Query='{query}')")
+            return items
+        else:
+            # 200 OK가 아닌 경우 응답 본문(에러 메시지) 출력
+            print(f"[DEBUG] ⚠️ 검색 API 오류 응답: Body={response.text}")
+            return []
+            
     except httpx.RequestError as e:
         # 네트워크 레벨의 에러 (연결 실패, 타임아웃 등)
         print(f"[DEBUG] ❌ 검색 네트워크 요청 에러: {e} (Query='{query}')")
@@ -1,13 +1,23 @@
 import httpx
 from shapely.geometry import shape
 from app.core.config import settings
+from app.core.http_client import http_clients, ORS
 
 ORS_API_KEY = settings.ORS_API_KEY
 ORS_URL = "https://api.openrouteservice.org/v2/isochrones/foot-walking"
 
+
+class ORSAPITransientError(Exception):
+    """
+    재시도하면 성공할 수 있는 ORS API 오류 (429, 5xx, 타임아웃, 네트워크 오류)
+    """
+
+
 async def get_isochrone_polygon(latitude: float, longitude: float):
     """
     ORS API를 통해 도보 거리(100m) 기반 Shapely Polygon을 반환하는 함수
+    - return: Shapely Polygon / None (결과 없음, 인증 정보 없음 등 재시도해도 소용없는 경우)
+    - raise: ORSAPITransientError (재시도 가능한 오류)
     """
     if not latitude or not longitude:
         print(f"[ORS API] 제한 구역 계산에 실패했습니다: latitude={latitude}, longitude={longitude}")
@@ -28,26 +38,35 @@ async def get_isochrone_polygon(latitude: float, longitude: float):
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(ORS_URL, headers=headers, json=payload)
-            response.raise_for_status() # 오류 발생하면 예외 발생
-            
-            if response.status_code != 200:
-                print(f"[ORS API] ORS API 요청 실패(latitude={latitude}, longitude={longitude}): [{response.status_code}] {response.text}")
-                return None
-                
-            data = response.json()
-            
-            if "features" not in data or len(data["features"]) == 0:
-                print("[ORS API] ORS 결과가 없습니다.")
-                return None
-                
-            geojson_geometry = data["features"][0]["geometry"]
-                
-            # GeoJSON → Shapely 변환
-            shapely_polygon = shape(geojson_geometry)
-            return shapely_polygon
-    
+        client = http_clients.get(ORS)
+        response = await client.post(ORS_URL, headers=headers, json=payload)
+    except httpx.TimeoutException as e:
+        raise ORSAPITransientError(f"[ORS API] 타임아웃(latitude={latitude}, longitude={longitude})") from e
+    except httpx.RequestError as e:
+        raise ORSAPITransientError(f"[ORS API] 네트워크 오류 발생(latitude={latitude}, longitude={longitude}): {e}") from e
+
+    # 할당량 초과(429) / 서버 오류는 호출한 쪽에서 대기 후 재시도
+    if response.status_code == 429 or response.status_code >= 500:
+        raise ORSAPITransientError(
+            f"[ORS API] 일시적 오류(latitude={latitude}, longitude={longitude}): [{response.status_code}] {response.text}")
+
+    if response.status_code != 200:
+        print(f"[ORS API] ORS API 요청 실패(latitude={latitude}, longitude={longitude}): [{response.status_code}] {response.text}")
+        return None
+
+    try:
+        data = response.json()
+
+        if "features" not in data or len(data["features"]) == 0:
+            print("[ORS API] ORS 결과가 없습니다.")
+            return None
+
+        geojson_geometry = data["features"][0]["geometry"]
+
+        # GeoJSON → Shapely 변환
+        shapely_polygon = shape(geojson_geometry)
+        return shapely_polygon
+
     except Exception as e:
-        print(f"[ORS API] ORS 요청 중 알 수 없는 오류 발생(latitude={latitude}, longitude={longitude}): {e}")
-        return None
\ No newline at end of file
+        print(f"[ORS API] ORS 응답 처리 중 오류 발생(latitude={latitude}, longitude={longitude}): {e}")
+        return None
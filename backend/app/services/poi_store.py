@@ -0,0 +1,161 @@
+# app/services/poi_store.py
+"""
+로컬 상가(POI) 저장소 (poi 테이블, PostGIS GIST 인덱스)
+
+- POI 덤프 파일(CSV/JSON: name, category, address, x:경도, y:위도)을 앱 시작 시 적재
+- 네이버 검색 결과도 누적 저장
+- poi_coverage: geohash 셀별 로컬 데이터 보유 여부
+  덤프로 적재된 셀이거나, 네이버 검색 결과를 POI_NAVER_MIN_SAMPLES 번 이상 누적한 셀은
+  네이버 API 없이 로컬 반경 검색으로 응답합니다.
+"""
+import asyncio
+import io
+import math
+import os
+import pandas as pd
+from sqlalchemy import text
+
+from app.core import schema
+from app.core.config import settings
+from app.core.database import sync_engine
+from app.utils.geo import geohash_precision_for
+from app.services import repository
+from app.services.ingest import (
+    copy_from_stdin,
+    file_sha256,
+    get_ingest_state,
+    save_ingest_state,
+    stream_csv_to_staging,
+)
+
+POI_SOURCE = "poi"
+POI_COLUMNS = ["name", "category", "address", "x", "y"]
+# 커버리지/검색 캐시 공용 셀 크기: 검색 반경 이하가 되는 geohash 자릿수
+CELL_PRECISION = geohash_precision_for(settings.SEARCH_RADIUS_METER)
+
+UPSERT_POI_QUERY = text("""
+    INSERT INTO poi (name, category, address, x, y, source, updated_at)
+    VALUES (:name, :category, :address, :x, :y, :source, now())
+    ON CONFLICT (name, address) DO UPDATE
+    SET category = EXCLUDED.category, x = EXCLUDED.x, y = EXCLUDED.y, source = EXCLUDED.source, updated_at = now()
+""")
+
+# 덤프로 적재된 셀은 source 를 import 로 유지 (네이버 결과가 덮어쓰지 않음)
+SAMPLE_COVERAGE_QUERY = text("""
+    INSERT INTO poi_coverage (cell, source, samples, updated_at)
+    VALUES (:cell, 'naver', 1, now())
+    ON CONFLICT (cell) DO UPDATE
+    SET samples = poi_coverage.samples + 1, updated_at = now()
+""")
+
+
+def _clean_dump(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.reindex(columns=POI_COLUMNS)
+    df['x'] = pd.to_numeric(df['x'], errors='coerce')
+    df['y'] = pd.to_numeric(df['y'], errors='coerce')
+    df = df.dropna(subset=['name', 'x', 'y']).copy()
+    df[['category', 'address']] = df[['category', 'address']].fillna("")
+    return df
+
+
+def _load_poi_dump():
+    """
+    POI 덤프를 COPY 로 staging 테이블에 올린 뒤 poi 테이블에 upsert 하고,
+    POI 가 있는 geohash 셀을 덤프 적재 셀로 표시합니다. (파일이 바뀌지 않았으면 건너뜀)
+    """
+    path = settings.POI_DUMP_PATH
+    content_hash = file_sha256(path)
+    with sync_engine.begin() as conn:
+        state = get_ingest_state(conn, POI_SOURCE)
+        if state and state.content_hash == content_hash:
+            print("⏭️ POI 덤프 변경 없음 → 적재를 건너뜁니다.")
+            return
+
+        conn.execute(text("""
+            CREATE TEMP TABLE poi_staging (
+                name VARCHAR(500),
+                category VARCHAR(200),
+                address VARCHAR(500),
+                x DOUBLE PRECISION,
+                y DOUBLE PRECISION
+            ) ON COMMIT DROP
+        """))
+        if path.lower().endswith(".json"):
+            df = _clean_dump(pd.read_json(path))
+            buffer = io.StringIO()
+            df.to_csv(buffer, index=False, header=False)
+            buffer.seek(0)
+            cursor = conn.connection.cursor()
+            try:
+                copy_from_stdin(cursor, f"COPY poi_staging ({', '.join(POI_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+            finally:
+                cursor.close()
+            total = len(df)
+        else:
+            total = stream_csv_to_staging(conn, path, "poi_staging", POI_COLUMNS,
+                                          transform=lambda chunk, _offset: _clean_dump(chunk))
+
+        conn.execute(text("""
+            INSERT INTO poi (name, category, address, x, y, source, updated_at)
+            SELECT DISTINCT ON (name, address) name, category, address, x, y, 'import', now()
+            FROM poi_staging
+            ORDER BY name, address
+            ON CONFLICT (name, address) DO UPDATE
+            SET category = EXCLUDED.category, x = EXCLUDED.x, y = EXCLUDED.y,
+                source = 'import', updated_at = now()
+        """))
+        conn.execute(text("""
+            INSERT INTO poi_coverage (cell, source, samples, updated_at)
+            SELECT DISTINCT ST_GeoHash(ST_SetSRID(ST_MakePoint(x, y), 4326), :precision), 'import', 0, now()
+            FROM poi_staging
+            ON CONFLICT (cell) DO UPDATE SET source = 'import', updated_at = now()
+        """), {"precision": CELL_PRECISION})
+        save_ingest_state(conn, POI_SOURCE, content_hash, total)
+        schema.ensure_indexes(conn)
+    print(f"🏬 POI 덤프 적재 완료. ({total}행)")
+
+
+async def initialize_poi_store():
+    """
+    [앱 시작 시 실행] POI 덤프 파일이 있으면 poi 테이블에 적재
+    """
+    if not os.path.exists(settings.POI_DUMP_PATH):
+        print(f"POI 덤프 파일이 없습니다 (네이버 검색 결과만 누적): {settings.POI_DUMP_PATH}")
+        return True
+    try:
+        await asyncio.to_thread(_load_poi_dump)
+        return True
+    except Exception as e:
+        print(f"POI 덤프 적재 중 오류 발생: {e}")
+        return False
+
+
+def find_nearby(latitude: float, longitude: float, cell: str, radius: float) -> list[dict] | None:
+    """
+    셀에 로컬 데이터가 있으면 반경(radius m)을 감싸는 영역의 POI 후보 목록, 없으면 None
+    (정확한 거리 필터는 호출하는 쪽에서 계산)
+    """
+    dlat = radius / 111_320.0
+    dlon = radius / (111_320.0 * max(math.cos(math.radians(latitude)), 1e-6))
+    with sync_engine.connect() as conn:
+        covered = conn.execute(repository.POI_CELL_COVERED, {"cell": cell, "min_samples": settings.POI_NAVER_MIN_SAMPLES}).scalar()
+        if not covered:
+            return None
+        rows = conn.execute(repository.POIS_IN_BBOX, {"min_x": longitude - dlon, "min_y": latitude - dlat,
+               "max_x": longitude + dlon, "max_y": latitude + dlat}).fetchall()
+    return [{"name": row.name, "category": row.category, "address": row.address,
+             "lat": row.y, "lon": row.x} for row in rows]
+
+
+def save_search_results(cell: str, places: list[dict]):
+    """
+    네이버 검색 결과를 poi 테이블에 누적하고 셀의 검색 횟수를 1 증가
+    """
+    with sync_engine.begin() as conn:
+        if places:
+            conn.execute(UPSERT_POI_QUERY, [
+                {"name": p["name"], "category": p["category"], "address": p["address"],
+                 "x": p["lon"], "y": p["lat"], "source": "naver"}
+                for p in places
+            ])
+        conn.execute(SAMPLE_COVERAGE_QUERY, {"cell": cell})
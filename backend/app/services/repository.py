@@ -0,0 +1,148 @@
+# app/services/repository.py
+"""
+자주 실행되는 조회/갱신 쿼리 모음 (재사용 statement)
+
+- 쿼리 문자열을 한 곳에서 만들어 두고 재사용하므로, 드라이버의 prepared statement 캐시
+  (asyncpg statement cache, psycopg 자동 prepare)가 같은 statement 로 인식합니다.
+- WHERE 조건은 app/core/schema.py 의 (부분) 인덱스 조건과 글자 그대로 맞춰야 인덱스를 탑니다.
+  예: 유효 좌표는 항상 "x != -1 AND y != -1"
+- HOT_QUERIES: 인덱스 사용 회귀 테스트(EXPLAIN) 대상 목록
+"""
+from datetime import datetime, timezone
+from sqlalchemy import text
+
+# --- address ---
+VALID_ADDRESSES = text("""
+    SELECT landlot_address, x, y
+    FROM address
+    WHERE x != -1 AND y != -1
+""")
+
+VALID_ADDRESSES_IN_BBOX = text("""
+    SELECT landlot_address, x, y
+    FROM address
+    WHERE x != -1 AND y != -1
+      AND geom && ST_MakeEnvelope(:min_x, :min_y, :max_x, :max_y, 4326)
+""")
+
+MISSING_COORDINATES = text("""
+    SELECT row_hash, landlot_address, road_name_address
+    FROM address
+    WHERE (x = -1 OR y = -1) AND row_hash IS NOT NULL
+""")
+
+UPDATE_COORDINATES = text("""
+    UPDATE address SET x = :x, y = :y, updated_at = now()
+    WHERE row_hash = :row_hash
+""")
+
+ADDRESSES_UPDATED_SINCE = text("""
+    SELECT x, y
+    FROM address
+    WHERE x != -1 AND y != -1 AND updated_at > :since
+""")
+
+# --- impossible (제한 구역) ---
+ZONE_CONTAINS_POINT = text("""
+    SELECT EXISTS(
+        SELECT 1
+        FROM impossible
+        WHERE ST_Within(
+            ST_SetSRID(ST_Point(:x, :y), 4326),
+            polygon_geom
+        )
+    )
+""")
+
+ZONE_POLYGONS = text("""
+    SELECT landlot_address, ST_AsBinary(polygon_geom)
+    FROM impossible
+    WHERE polygon_geom IS NOT NULL
+""")
+
+ZONES_IN_BBOX = text("""
+    SELECT i.id, ST_AsGeoJSON(ST_ExteriorRing(i.polygon_geom), 6)::json -> 'coordinates'
+    FROM impossible i
+    WHERE i.polygon_geom && ST_MakeEnvelope(:min_x, :min_y, :max_x, :max_y, 4326)
+      AND i.id > :cursor
+    ORDER BY i.id
+    LIMIT :limit
+""")
+
+ZONE_LOD_IN_BBOX = text("""
+    SELECT l.impossible_id, ST_AsGeoJSON(ST_ExteriorRing(l.geom), 6)::json -> 'coordinates'
+    FROM impossible_lod l
+    WHERE l.zoom_band = :band
+      AND l.geom && ST_MakeEnvelope(:min_x, :min_y, :max_x, :max_y, 4326)
+      AND l.impossible_id > :cursor
+    ORDER BY l.impossible_id
+    LIMIT :limit
+""")
+
+# 매장(address.row_hash) 단위 교체. 매장과 연결되지 않은 이전/CSV 구역은 지번 주소로 찾아 함께 교체
+DELETE_ZONES_FOR_STORE = text("""
+    DELETE FROM impossible
+    WHERE address_row_hash = :address_row_hash
+       OR (address_row_hash IS NULL AND landlot_address = :landlot_address)
+""")
+
+# --- impossible_coverage (제한 구역 합집합 조각, 겹침 없음) ---
+# ZONE_CONTAINS_POINT / ZoneIndex.contains 와 같은 ST_Within(경계 위는 밖) 기준
+# 조각마다 ST_Within 을 하면 칸/분할 경계(조각끼리 맞닿은 선) 위의 점이 밖으로 판정되므로,
+# ST_Intersects 로는 점에 닿는 조각만 고르고(인덱스 사전 필터), 그 조각들의 합집합(점 주변의 합집합과 같음)에
+# ST_Within 으로 포함 여부를 판정
+COVERAGE_CONTAINS_POINT = text("""
+    SELECT COALESCE((
+        SELECT ST_Within(ST_SetSRID(ST_Point(:x, :y), 4326), ST_Union(geom))
+        FROM impossible_coverage
+        WHERE ST_Intersects(geom, ST_SetSRID(ST_Point(:x, :y), 4326))
+    ), false)
+""")
+
+# 외곽 ring 은 반시계, 구멍은 시계 방향 (지도 nonzero 채우기에서 구멍이 뚫리도록)
+# 조각마다 따로 단순화하면 맞닿은 경계가 서로 다르게 움직여 틈이 생기므로 저장된 좌표 그대로 반환
+COVERAGE_IN_BBOX = text("""
+    SELECT c.id, ST_AsGeoJSON(ST_ForcePolygonCCW(c.geom), 6)::json -> 'coordinates'
+    FROM impossible_coverage c
+    WHERE c.geom && ST_MakeEnvelope(:min_x, :min_y, :max_x, :max_y, 4326)
+      AND c.id > :cursor
+    ORDER BY c.id
+    LIMIT :limit
+""")
+
+# --- poi ---
+POIS_IN_BBOX = text("""
+    SELECT name, category, address, x, y
+    FROM poi
+    WHERE geom && ST_MakeEnvelope(:min_x, :min_y, :max_x, :max_y, 4326)
+""")
+
+POI_CELL_COVERED = text("""
+    SELECT EXISTS (
+        SELECT 1 FROM poi_coverage
+        WHERE cell = :cell AND (source = 'import' OR samples >= :min_samples)
+    )
+""")
+
+_GANGNAM_BBOX = {"min_x": 127.0166, "min_y": 37.4891, "max_x": 127.0386, "max_y": 37.5071}
+
+# (이름, statement, 예시 파라미터, 사용 가능한 인덱스 중 하나)
+HOT_QUERIES = [
+    ("valid_addresses_in_bbox", VALID_ADDRESSES_IN_BBOX, _GANGNAM_BBOX, ("idx_address_valid_geom",)),
+    ("missing_coordinates", MISSING_COORDINATES, {}, ("idx_address_missing_coords",)),
+    ("update_coordinates", UPDATE_COORDINATES, {"x": 127.0, "y": 37.5, "row_hash": "h"}, ("uq_address_row_hash",)),
+    ("addresses_updated_since", ADDRESSES_UPDATED_SINCE, {"since": datetime(2024, 1, 1, tzinfo=timezone.utc)}, ("idx_address_updated_at",)),
+    ("zone_contains_point", ZONE_CONTAINS_POINT, {"x": 127.027610, "y": 37.498095}, ("idx_impossible_geom",)),
+    ("zones_in_bbox", ZONES_IN_BBOX, {**_GANGNAM_BBOX, "cursor": 0, "limit": 1000},
+     ("idx_impossible_geom", "idx_impossible_id")),
+    ("zone_lod_in_bbox", ZONE_LOD_IN_BBOX, {**_GANGNAM_BBOX, "band": 1, "cursor": 0, "limit": 1000},
+     ("idx_impossible_lod_geom", "impossible_lod_pkey")),
+    ("coverage_contains_point", COVERAGE_CONTAINS_POINT, {"x": 127.027610, "y": 37.498095},
+     ("idx_impossible_coverage_geom",)),
+    ("coverage_in_bbox", COVERAGE_IN_BBOX, {**_GANGNAM_BBOX, "cursor": 0, "limit": 1000},
+     ("idx_impossible_coverage_geom", "impossible_coverage_pkey")),
+    ("delete_zones_for_store", DELETE_ZONES_FOR_STORE, {"address_row_hash": "0" * 64, "landlot_address": "가"},
+     ("idx_impossible_address_row_hash", "idx_impossible_landlot_address")),
+    ("pois_in_bbox", POIS_IN_BBOX, _GANGNAM_BBOX, ("idx_poi_geom",)),
+    ("poi_cell_covered", POI_CELL_COVERED, {"cell": "wydm6", "min_samples": 3}, ("poi_coverage_pkey",)),
+]
@@ -0,0 +1,286 @@
+# app/services/snapshot.py
+"""
+제한 구역 / 소매점 바이너리 스냅샷 (워커 시작 시 메모리 인덱스 원본)
+
+DB 의 address(유효 좌표) / impossible(polygon) 을 버전별 파일 하나로 만들어 두고,
+워커는 파일을 mmap 해서 배열을 복사 없이 그대로 사용합니다.
+같은 파일을 매핑한 프로세스(uvicorn 워커)들은 OS 페이지 캐시를 공유하므로,
+소매점 좌표/라벨 배열은 워커마다 따로 복사하거나 문자열 객체를 만들지 않습니다.
+제한 구역 polygon 은 공유되지 않습니다: GEOS geometry 는 좌표를 자체 메모리로 복사하므로
+워커마다 WKB 를 파싱해 shapely 객체를 따로 만들고, 공유되는 것은 WKB 바이트와 범위 배열뿐입니다.
+
+파일: SNAPSHOT_DIR/snapshot-<DB 식별자>-<address version>-<impossible version>.bin
+    (버전은 data_version 테이블 값, DB 식별자는 db_identity.token 앞부분
+     → DB 를 새로 만들어 버전이 처음부터 다시 올라가도 이전 DB 의 파일을 재사용하지 않음)
+    MAGIC(8) | header 길이(uint64 LE) | header JSON | 64바이트 정렬된 배열들
+배열:
+- retailer_lon / retailer_lat        : 소매점 경도/위도 (float64)
+- retailer_mx / retailer_my          : EPSG:5186 미터 좌표 (float64, 워커마다 좌표 변환하지 않도록)
+- zone_bounds                        : polygon 별 (min_x, min_y, max_x, max_y) float64
+- zone_wkb_offsets / zone_wkb_data   : polygon WKB 를 이어 붙인 바이트 + 시작 위치
+  (좌표 배열 + ring/polygon offset 으로 저장해도 shapely.polygons / from_ragged_array 가 좌표를 복사하므로
+   공유 효과는 같고, WKB 파싱이 더 빠름, benchmarks/bench_snapshot.py)
+- *_label_offsets / *_label_data     : 문자열 테이블 (UTF-8 바이트 + 시작 위치)
+
+오프라인 실행 (backend 디렉토리에서, DB 접속 가능 상태):
+    python -m app.services.snapshot
+"""
+import glob
+import json
+import os
+import re
+import struct
+import time
+import uuid
+import numpy as np
+import shapely
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import sync_engine
+from app.services import repository
+from app.utils.geo import transformer_wgs_to_metric
+
+MAGIC = b"SMKSNAP1"
+FORMAT_VERSION = 1
+ALIGN = 64
+RETAILER_ARRAYS = ("retailer_lon", "retailer_lat", "retailer_mx", "retailer_my",
+                   "retailer_label_offsets", "retailer_label_data")
+ZONE_ARRAYS = ("zone_bounds", "zone_wkb_offsets", "zone_wkb_data", "zone_label_offsets", "zone_label_data")
+
+
+class StringTable:
+    """
+    mmap 된 UTF-8 바이트 + 시작 위치 배열 위의 읽기 전용 문자열 목록 (조회할 때만 디코딩)
+    """
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return bytes(self.data[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+def encode_blobs(blobs) -> tuple[np.ndarray, np.ndarray]:
+    """
+    바이트열 목록 → (시작 위치 배열, 이어 붙인 바이트 배열)
+    """
+    blobs = list(blobs)
+    offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in blobs], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(blobs), dtype=np.uint8)
+
+
+def decode_blobs(offsets: np.ndarray, data: np.ndarray) -> list[bytes]:
+    raw = data.tobytes()
+    bounds = offsets.tolist()
+    return [raw[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def encode_strings(values) -> tuple[np.ndarray, np.ndarray]:
+    return encode_blobs(str(v).encode("utf-8") for v in values)
+
+
+def retailer_arrays(lon, lat, labels) -> dict:
+    lon = np.asarray(lon, dtype=np.float64)
+    lat = np.asarray(lat, dtype=np.float64)
+    mx, my = transformer_wgs_to_metric.transform(lon, lat)
+    offsets, data = encode_strings(labels)
+    return {"retailer_lon": lon, "retailer_lat": lat,
+            "retailer_mx": np.asarray(mx, dtype=np.float64), "retailer_my": np.asarray(my, dtype=np.float64),
+            "retailer_label_offsets": offsets, "retailer_label_data": data}
+
+
+def zone_arrays(polygons, labels) -> dict:
+    polygons = np.asarray(polygons, dtype=object)
+    wkb_offsets, wkb_data = encode_blobs(shapely.to_wkb(polygons).tolist() if len(polygons) else [])
+    offsets, data = encode_strings(labels)
+    return {"zone_bounds": shapely.bounds(polygons).reshape(-1, 4),
+            "zone_wkb_offsets": wkb_offsets, "zone_wkb_data": wkb_data,
+            "zone_label_offsets": offsets, "zone_label_data": data}
+
+
+class Snapshot:
+    """
+    mmap 된 스냅샷 파일. 배열 속성은 모두 파일 페이지를 그대로 가리키는 읽기 전용 view 입니다.
+    (zone_polygons() 가 만드는 shapely 객체는 호출한 프로세스 전용 메모리)
+    """
+
+    def __init__(self, path: str, header: dict, buffer: np.memmap):
+        self.path = path
+        self.header = header
+        self.versions = header["versions"]
+        self._buffer = buffer
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"]))
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=spec["offset"]) if count \
+                else np.empty(0, dtype=dtype)
+            setattr(self, name, array.reshape(spec["shape"]))
+        self.retailer_labels = StringTable(self.retailer_label_offsets, self.retailer_label_data)
+        self.zone_labels = StringTable(self.zone_label_offsets, self.zone_label_data)
+
+    def arrays(self, names) -> dict:
+        return {name: getattr(self, name) for name in names}
+
+    def zone_polygons(self) -> np.ndarray:
+        """
+        WKB 바이트 테이블 → shapely Polygon 배열 (호출할 때마다 새로 파싱, 워커 간 공유되지 않음)
+        """
+        if len(self.zone_wkb_offsets) <= 1:
+            return np.empty(0, dtype=object)
+        return shapely.from_wkb(decode_blobs(self.zone_wkb_offsets, self.zone_wkb_data))
+
+
+def _data_start(header_len: int) -> int:
+    return -(-(len(MAGIC) + 8 + header_len) // ALIGN) * ALIGN
+
+
+def write_snapshot(path: str, versions: dict, arrays: dict):
+    """
+    배열들을 스냅샷 형식으로 임시 파일에 쓴 뒤 원자적으로 교체
+    (header 의 offset 은 배열 영역 시작 기준)
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+    header = {"format": FORMAT_VERSION, "versions": versions, "created_at": time.time(), "arrays": layout}
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = _data_start(len(header_bytes))
+
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+
+
+def open_snapshot(path: str) -> Snapshot:
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"스냅샷 파일 형식이 아닙니다: {path}")
+    (header_len,) = struct.unpack("<Q", bytes(buffer[len(MAGIC):len(MAGIC) + 8]))
+    start = len(MAGIC) + 8
+    header = json.loads(bytes(buffer[start:start + header_len]).decode("utf-8"))
+    if header.get("format") != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 스냅샷 형식입니다: {header.get('format')}")
+    return Snapshot(path, header, buffer[_data_start(header_len):])
+
+
+# DB 식별자가 없는 이전 형식(snapshot-<address>-<impossible>.bin) 도 정리 대상으로 인식
+SNAPSHOT_NAME = re.compile(r"^snapshot-(?:([0-9a-f]+)-)?(\d+)-(\d+)\.bin$")
+
+
+def snapshot_path(versions: dict) -> str:
+    return os.path.join(settings.SNAPSHOT_DIR,
+                        f"snapshot-{versions['database']}-{versions['address']}-{versions['impossible']}.bin")
+
+
+def _fetch_versions(conn) -> dict:
+    rows = conn.execute(text(
+        "SELECT table_name, version FROM data_version WHERE table_name IN ('address', 'impossible')")).fetchall()
+    versions = {"database": "0", "address": 0, "impossible": 0}
+    versions.update({row[0]: int(row[1]) for row in rows})
+    # 스키마 보장 전(db_identity 없음)이면 "0" (다음 시작부터 DB 별 식별자 사용)
+    if conn.execute(text("SELECT to_regclass('public.db_identity') IS NOT NULL")).scalar():
+        token = conn.execute(text("SELECT replace(token::text, '-', '') FROM public.db_identity")).scalar()
+        if token:
+            versions["database"] = token[:16]
+    return versions
+
+
+def _remove_older_snapshots(versions: dict):
+    """
+    같은 DB 의 스냅샷 중 방금 만든 것보다 오래된(두 버전 모두 작거나 같은) 파일과 이전 형식 파일만 삭제
+    다른 워커가 먼저 만든 더 새 버전, 다른 DB 의 파일은 그대로 둡니다.
+    (다른 워커가 매핑 중인 이전 파일도 삭제해도 됨, 매핑은 닫을 때까지 유지)
+    """
+    current = snapshot_path(versions)
+    for old_path in glob.glob(os.path.join(settings.SNAPSHOT_DIR, "snapshot-*.bin")):
+        match = SNAPSHOT_NAME.match(os.path.basename(old_path))
+        if old_path == current or match is None:
+            continue
+        database, address, impossible = match.groups()
+        if database is not None and (database != versions["database"] or int(address) > versions["address"]
+                                     or int(impossible) > versions["impossible"]):
+            continue
+        try:
+            os.remove(old_path)
+        except FileNotFoundError:
+            pass  # 다른 워커가 먼저 정리함
+
+
+# 현재 프로세스가 매핑 중인 스냅샷 (버전이 같으면 다시 열지 않음)
+_current: Snapshot | None = None
+
+
+def _build_from_db(previous: Snapshot | None) -> str:
+    """
+    DB 를 읽어 현재 버전 스냅샷 파일을 만듭니다.
+    이전 스냅샷과 DB/버전이 같은 쪽(소매점/제한 구역)은 DB 를 다시 읽지 않고 이전 배열을 그대로 씁니다.
+    """
+    start = time.perf_counter()
+    # 버전과 행을 같은 시점 기준으로 읽기
+    with sync_engine.connect().execution_options(isolation_level="REPEATABLE READ") as conn:
+        versions = _fetch_versions(conn)
+        path = snapshot_path(versions)
+        if os.path.exists(path):
+            return path
+        same_database = previous is not None and previous.versions.get("database") == versions["database"]
+        if same_database and previous.versions["address"] == versions["address"]:
+            arrays = previous.arrays(RETAILER_ARRAYS)
+        else:
+            rows = conn.execute(repository.VALID_ADDRESSES).fetchall()
+            arrays = retailer_arrays([row[1] for row in rows], [row[2] for row in rows], [row[0] for row in rows])
+        if same_database and previous.versions["impossible"] == versions["impossible"]:
+            arrays.update(previous.arrays(ZONE_ARRAYS))
+        else:
+            rows = conn.execute(repository.ZONE_POLYGONS).fetchall()
+            polygons = shapely.from_wkb([bytes(row[1]) for row in rows]) if rows else []
+            arrays.update(zone_arrays(polygons, [row[0] for row in rows]))
+
+    os.makedirs(settings.SNAPSHOT_DIR, exist_ok=True)
+    write_snapshot(path, versions, arrays)
+    _remove_older_snapshots(versions)
+    size_mb = os.path.getsize(path) / 1024 / 1024
+    print(f"📦 스냅샷 생성 완료: {os.path.basename(path)} ({size_mb:.1f}MB, {time.perf_counter() - start:.2f}s)")
+    return path
+
+
+def load_current() -> Snapshot:
+    """
+    현재 DB 버전의 스냅샷을 반환 (이미 매핑했으면 그대로, 파일이 있으면 mmap, 없으면 만들어서 mmap)
+    """
+    global _current
+    with sync_engine.connect() as conn:
+        versions = _fetch_versions(conn)
+    if _current is not None and _current.versions == versions:
+        return _current
+    path = snapshot_path(versions)
+    if not os.path.exists(path):
+        path = _build_from_db(_current)
+    _current = open_snapshot(path)
+    return _current
+
+
+if __name__ == "__main__":
+    snap = load_current()
+    print(f"스냅샷: {snap.path} (소매점 {len(snap.retailer_labels)}개, 제한 구역 {len(snap.zone_labels)}개)")
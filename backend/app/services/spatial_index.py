@@ -0,0 +1,168 @@
+# app/services/spatial_index.py
+import asyncio
+import numpy as np
+import shapely
+
+from app.services import snapshot
+from app.utils.geo import transformer_wgs_to_metric
+
+
+def _labels(labels):
+    # 스냅샷 문자열 테이블은 복사하지 않고 그대로 사용
+    return labels if isinstance(labels, snapshot.StringTable) else list(labels)
+
+
+class ZoneIndex:
+    """
+    제한 구역(impossible) polygon 메모리 인덱스 (STRtree + prepared geometry)
+    STRtree 로 bbox 가 겹치는 후보만 고른 뒤, 미리 prepare 한 polygon 에 contains_xy 로 포함 여부를 확인합니다.
+    (tree.query(predicate="within") 은 조회하는 점 쪽을 prepare 하므로 polygon 을 prepare 해도 효과가 없음)
+    한 번 만들어진 인덱스는 수정하지 않고, 갱신 시 새 인덱스를 만들어 통째로 교체합니다.
+    """
+
+    def __init__(self, polygons, labels: list[str], version: int = 0):
+        self.polygons = np.asarray(polygons, dtype=object)
+        self.labels = _labels(labels)
+        self.version = version  # 원본 impossible 테이블의 data_version (결과 캐시 키)
+        shapely.prepare(self.polygons)
+        self.tree = shapely.STRtree(self.polygons)
+
+    def __len__(self):
+        return len(self.polygons)
+
+    def contains(self, x: float, y: float) -> bool:
+        """
+        좌표(x:경도, y:위도)가 하나라도 제한 구역 안에 있는지 (ST_Within 과 같은 경계 처리)
+        """
+        candidates = self.tree.query(shapely.Point(x, y))
+        return bool(shapely.contains_xy(self.polygons[candidates], x, y).any())
+
+    def query_many(self, xs, ys) -> np.ndarray:
+        """
+        여러 좌표에 대해 (좌표 번호, 제한 구역 번호) 쌍 배열(2 x N) 반환
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        point_idx, zone_idx = self.tree.query(shapely.points(xs, ys))
+        inside = shapely.contains_xy(self.polygons[zone_idx], xs[point_idx], ys[point_idx])
+        return np.vstack([point_idx[inside], zone_idx[inside]])
+
+    def contains_many(self, xs, ys) -> np.ndarray:
+        """
+        여러 좌표의 제한 구역 포함 여부 (bool 배열)
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        result = np.zeros(len(xs), dtype=bool)
+        if len(xs) and len(self):
+            result[self.query_many(xs, ys)[0]] = True
+        return result
+
+
+class RetailerIndex:
+    """
+    기존 담배소매점(address) 위치 메모리 인덱스 (미터 단위 평면 좌표 STRtree)
+    """
+
+    def __init__(self, xs, ys, labels: list[str], metric: tuple | None = None, version: int = 0):
+        self.lon = np.asarray(xs, dtype=np.float64)
+        self.lat = np.asarray(ys, dtype=np.float64)
+        self.labels = _labels(labels)
+        self.version = version  # 원본 address 테이블의 data_version (결과 캐시 키)
+        # metric: 미리 변환해 둔 (x, y) 미터 좌표 (스냅샷), 없으면 여기서 변환
+        mx, my = metric if metric is not None else transformer_wgs_to_metric.transform(self.lon, self.lat)
+        self.tree = shapely.STRtree(shapely.points(np.asarray(mx), np.asarray(my)))
+
+    def __len__(self):
+        return len(self.labels)
+
+    def nearest_many(self, xs, ys) -> tuple[np.ndarray, np.ndarray]:
+        """
+        여러 좌표(경도, 위도) 각각에서 가장 가까운 소매점 번호와 거리(m)
+        소매점이 없으면 번호 -1, 거리 inf
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        index = np.full(len(xs), -1, dtype=np.int64)
+        distance = np.full(len(xs), np.inf)
+        if not len(xs) or not len(self):
+            return index, distance
+        mx, my = transformer_wgs_to_metric.transform(xs, np.asarray(ys, dtype=np.float64))
+        points = shapely.points(np.asarray(mx), np.asarray(my))
+        pairs, dists = self.tree.query_nearest(points, return_distance=True, all_matches=False)
+        index[pairs[0]] = pairs[1]
+        distance[pairs[0]] = dists
+        return index, distance
+
+
+# 현재 사용 중인 인덱스 (교체는 참조 대입 한 번으로 이루어지므로 읽는 쪽은 잠금 불필요)
+zone_index: ZoneIndex | None = None
+retailer_index: RetailerIndex | None = None
+
+
+def _zone_index_from(snap: snapshot.Snapshot) -> ZoneIndex:
+    return ZoneIndex(snap.zone_polygons(), snap.zone_labels, version=snap.versions["impossible"])
+
+
+def _retailer_index_from(snap: snapshot.Snapshot) -> RetailerIndex:
+    return RetailerIndex(snap.retailer_lon, snap.retailer_lat, snap.retailer_labels,
+                         metric=(snap.retailer_mx, snap.retailer_my), version=snap.versions["address"])
+
+
+def _load_zone_index() -> ZoneIndex:
+    return _zone_index_from(snapshot.load_current())
+
+
+async def rebuild_zone_index():
+    """
+    impossible 테이블을 읽어 새 인덱스를 만든 뒤 원자적으로 교체합니다.
+    (initialize_restricted_zone, 제한 구역 계산 작업 이후 호출)
+    """
+    global zone_index
+    try:
+        new_index = await asyncio.to_thread(_load_zone_index)
+        zone_index = new_index
+        print(f"🗺️ 제한 구역 인덱스 갱신 완료: {len(new_index)}개")
+    except Exception as e:
+        print(f"제한 구역 인덱스 갱신 중 오류 발생: {e}")
+
+
+async def rebuild_indexes():
+    """
+    [앱 시작 시 실행] 현재 버전 스냅샷 하나로 제한 구역/소매점 인덱스를 함께 만듭니다.
+    (스냅샷 파일이 있으면 DB 를 읽지 않고 mmap 만 함)
+    """
+    global zone_index, retailer_index
+    try:
+        snap = await asyncio.to_thread(snapshot.load_current)
+        new_zones, new_retailers = await asyncio.to_thread(
+            lambda: (_zone_index_from(snap), _retailer_index_from(snap)))
+        zone_index, retailer_index = new_zones, new_retailers
+        print(f"🗺️ 메모리 인덱스 준비 완료: 제한 구역 {len(new_zones)}개, 소매점 {len(new_retailers)}개 "
+              f"({snap.path})")
+    except Exception as e:
+        print(f"메모리 인덱스 생성 중 오류 발생: {e}")
+
+
+def get_zone_index() -> ZoneIndex | None:
+    return zone_index
+
+
+def _load_retailer_index() -> RetailerIndex:
+    return _retailer_index_from(snapshot.load_current())
+
+
+async def rebuild_retailer_index():
+    """
+    address 테이블을 읽어 소매점 인덱스를 새로 만든 뒤 교체합니다.
+    (address 적재, 좌표 backfill 이후 호출)
+    """
+    global retailer_index
+    try:
+        new_index = await asyncio.to_thread(_load_retailer_index)
+        retailer_index = new_index
+        print(f"🏪 소매점 인덱스 갱신 완료: {len(new_index)}개")
+    except Exception as e:
+        print(f"소매점 인덱스 갱신 중 오류 발생: {e}")
+
+
+def get_retailer_index() -> RetailerIndex | None:
+    return retailer_index
@@ -0,0 +1,162 @@
+# app/services/tile_service.py
+"""
+벡터 타일(MVT) 생성 + 디스크 캐시
+
+- 타일은 PostGIS ST_AsMVT 로 만들고 TILE_CACHE_DIR/<layer>/<version>/<z>/<x>/<y>.pbf 에 저장합니다.
+- version 은 data_version 테이블 값 (address / impossible 변경 시 트리거가 1씩 증가)
+  테이블이 바뀌면 새 version 디렉터리에 다시 만들어지고, 이전 version 디렉터리는 삭제됩니다.
+"""
+import os
+import shutil
+import tempfile
+import time
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import sync_engine
+
+MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+# 레이어 이름 → (원본 테이블, 타일 쿼리)
+# :margin 만큼 넓힌 타일 영역(EPSG:4326)으로 GIST 인덱스를 타고, 좌표는 EPSG:3857 타일 좌표로 변환
+LAYERS = {
+    "retailers": ("address", text("""
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(:z, :x, :y) AS env,
+                   ST_Transform(ST_TileEnvelope(:z, :x, :y, margin => :margin), 4326) AS env_4326
+        ), mvt AS (
+            SELECT ST_AsMVTGeom(ST_Transform(a.geom, 3857), b.env, :extent, :buffer, true) AS geom,
+                   a.landlot_address, a.road_name_address
+            FROM address a, bounds b
+            WHERE a.geom && b.env_4326
+              AND a.x != -1 AND a.y != -1
+        )
+        SELECT ST_AsMVT(mvt.*, 'retailers', :extent, 'geom') FROM mvt
+    """)),
+    "zones": ("impossible", text("""
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(:z, :x, :y) AS env,
+                   ST_Transform(ST_TileEnvelope(:z, :x, :y, margin => :margin), 4326) AS env_4326
+        ), mvt AS (
+            SELECT ST_AsMVTGeom(ST_Transform(i.polygon_geom, 3857), b.env, :extent, :buffer, true) AS geom,
+                   i.id, i.landlot_address
+            FROM impossible i, bounds b
+            WHERE i.polygon_geom && b.env_4326
+        )
+        SELECT ST_AsMVT(mvt.*, 'zones', :extent, 'geom') FROM mvt WHERE mvt.geom IS NOT NULL
+    """)),
+    # 겹치는 제한 구역을 합친 조각 (impossible 과 같은 트랜잭션에서 갱신되므로 version 도 impossible 기준)
+    "coverage": ("impossible", text("""
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(:z, :x, :y) AS env,
+                   ST_Transform(ST_TileEnvelope(:z, :x, :y, margin => :margin), 4326) AS env_4326
+        ), mvt AS (
+            SELECT ST_AsMVTGeom(ST_Transform(c.geom, 3857), b.env, :extent, :buffer, true) AS geom
+            FROM impossible_coverage c, bounds b
+            WHERE c.geom && b.env_4326
+        )
+        SELECT ST_AsMVT(mvt.*, 'coverage', :extent, 'geom') FROM mvt WHERE mvt.geom IS NOT NULL
+    """)),
+}
+
+# 테이블별 (version, 조회 시각): 타일 요청마다 DB 를 보지 않도록 TILE_VERSION_CHECK_SEC 동안 재사용
+_versions: dict[str, tuple[int, float]] = {}
+# 레이어별 마지막으로 정리한 version (바뀌면 이전 version 디렉터리 삭제)
+_cleaned: dict[str, int] = {}
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= settings.TILE_MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+def tile_path(layer: str, version: int, z: int, x: int, y: int) -> str:
+    return os.path.join(settings.TILE_CACHE_DIR, layer, str(version), str(z), str(x), f"{y}.pbf")
+
+
+def _fetch_version(table_name: str) -> int:
+    with sync_engine.connect() as conn:
+        version = conn.execute(
+            text("SELECT version FROM data_version WHERE table_name = :t"), {"t": table_name}
+        ).scalar()
+    return version or 0
+
+
+def current_version(table_name: str) -> int:
+    cached = _versions.get(table_name)
+    now = time.monotonic()
+    if cached is not None and now - cached[1] < settings.TILE_VERSION_CHECK_SEC:
+        return cached[0]
+    version = _fetch_version(table_name)
+    _versions[table_name] = (version, now)
+    return version
+
+
+def _render_tile(layer: str, z: int, x: int, y: int) -> bytes:
+    _, query = LAYERS[layer]
+    params = {
+        "z": z, "x": x, "y": y,
+        "extent": settings.TILE_EXTENT,
+        "buffer": settings.TILE_BUFFER,
+        "margin": settings.TILE_BUFFER / settings.TILE_EXTENT,
+    }
+    with sync_engine.connect() as conn:
+        tile = conn.execute(query, params).scalar()
+    return bytes(tile) if tile else b""
+
+
+def _write_atomic(path: str, data: bytes):
+    # 동시에 같은 타일을 만드는 요청이 있어도 반쯤 쓰인 파일이 읽히지 않도록 임시 파일 → rename
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        os.unlink(tmp)
+        raise
+
+
+def _remove_old_versions(layer: str, version: int):
+    """
+    현재 version 보다 낮은 version 디렉토리만 삭제
+    (version 조회 결과가 아직 이전 값인 워커가 다른 워커가 방금 만든 새 version 캐시를 지우지 않도록)
+    """
+    if _cleaned.get(layer) == version:
+        return
+    layer_dir = os.path.join(settings.TILE_CACHE_DIR, layer)
+    if os.path.isdir(layer_dir):
+        for name in os.listdir(layer_dir):
+            if name.isdigit() and int(name) < version:
+                shutil.rmtree(os.path.join(layer_dir, name), ignore_errors=True)
+    _cleaned[layer] = version
+
+
+def get_tile(layer: str, z: int, x: int, y: int) -> tuple[bytes, int]:
+    """
+    (타일 바이트, version) 반환. 캐시에 있으면 파일을 그대로 읽고, 없으면 만들어서 저장합니다.
+    """
+    version = current_version(LAYERS[layer][0])
+    path = tile_path(layer, version, z, x, y)
+    try:
+        with open(path, "rb") as f:
+            return f.read(), version
+    except FileNotFoundError:
+        pass
+
+    tile = _render_tile(layer, z, x, y)
+    try:
+        _remove_old_versions(layer, version)
+        _write_atomic(path, tile)
+    except OSError as e:
+        print(f"[tiles] 타일 캐시 저장 실패({path}): {e}")
+    return tile, version
+
+
+def clear_cache():
+    """
+    디스크 타일 캐시 전체 삭제
+    """
+    shutil.rmtree(settings.TILE_CACHE_DIR, ignore_errors=True)
+    _versions.clear()
+    _cleaned.clear()
@@ -0,0 +1,573 @@
+# app/services/zone_job.py
+import asyncio
+import io
+import json
+import random
+import socket
+import time
+import uuid
+import numpy as np
+import pandas as pd
+import shapely
+from sqlalchemy import text
+
+from app.core import coordination
+from app.core.config import settings
+from app.core.database import SessionLocal, sync_engine
+from app.services import db_service, eligibility_grid, ingest, isochrone, local_isochrone, ors_api, repository, spatial_index
+
+# 제한 구역이 없거나(missing) 오래된(stale) 매장만 조회 (매장 = address 행, 같은 지번 주소의 매장도 따로 계산)
+# - 매장과 연결되지 않은(address_row_hash 가 NULL) CSV/이전 구역은 지번 주소가 같으면 그 매장의 구역으로 봄
+# - stale: 계산 후 ZONE_MAX_AGE_DAYS 경과, 또는 계산 당시 좌표(origin)와 현재 address 좌표가 다름
+TARGET_QUERY = text("""
+    SELECT a.row_hash, a.landlot_address, a.x, a.y
+    FROM address a
+    LEFT JOIN LATERAL (
+        SELECT i.origin_x, i.origin_y, i.computed_at
+        FROM impossible i
+        WHERE i.address_row_hash = a.row_hash
+           OR (i.address_row_hash IS NULL AND i.landlot_address = a.landlot_address)
+        ORDER BY i.computed_at DESC
+        LIMIT 1
+    ) z ON true
+    WHERE a.x != -1 AND a.y != -1 AND a.row_hash IS NOT NULL
+      AND (
+        :force
+        OR z.computed_at IS NULL
+        OR z.computed_at < now() - make_interval(days => :max_age_days)
+        OR (z.origin_x IS NOT NULL AND (abs(z.origin_x - a.x) > 1e-7 OR abs(z.origin_y - a.y) > 1e-7))
+      )
+    ORDER BY a.landlot_address, a.row_hash
+""")
+
+INSERT_ZONE_QUERY = text("""
+    INSERT INTO impossible (
+        landlot_address, address_row_hash, centroid_x, centroid_y,
+        polygon_geom, vertices, origin_x, origin_y, method, computed_at)
+    VALUES (
+        :landlot_address, :address_row_hash, :centroid_x, :centroid_y,
+        ST_SetSRID(ST_GeomFromText(:polygon_geom), 4326),
+        CAST(:vertices AS JSONB), :origin_x, :origin_y, :method, now())
+""")
+
+# buffer 방식 대량 저장: COPY 로 올린 staging 테이블(매장, 주소, 출발 좌표, WKB)에서 매장 단위로 교체
+# 중심점 / vertices(외곽선 좌표 JSON)는 DB 에서 polygon 으로부터 계산 (Python 에서 행마다 JSON 을 만들지 않음)
+ZONE_STAGING_COLUMNS = ["address_row_hash", "landlot_address", "origin_x", "origin_y", "polygon_wkb"]
+REPLACE_ZONES_FROM_STAGING = [
+    # repository.DELETE_ZONES_FOR_STORE 와 같은 조건 (OR 조인 대신 두 구문으로 나눠 각 인덱스 사용)
+    text("""
+        DELETE FROM impossible i
+        USING zone_staging s
+        WHERE i.address_row_hash = s.address_row_hash
+    """),
+    text("""
+        DELETE FROM impossible i
+        USING (SELECT DISTINCT landlot_address FROM zone_staging) s
+        WHERE i.address_row_hash IS NULL AND i.landlot_address = s.landlot_address
+    """),
+    text("""
+        INSERT INTO impossible (
+            landlot_address, address_row_hash, centroid_x, centroid_y,
+            polygon_geom, vertices, origin_x, origin_y, method, computed_at)
+        SELECT s.landlot_address, s.address_row_hash, ST_X(ST_Centroid(p.geom)), ST_Y(ST_Centroid(p.geom)),
+               p.geom, ST_AsGeoJSON(ST_ExteriorRing(p.geom), 15)::jsonb -> 'coordinates',
+               s.origin_x, s.origin_y, :method, now()
+        FROM zone_staging s
+        CROSS JOIN LATERAL (SELECT ST_GeomFromWKB(decode(s.polygon_wkb, 'hex'), 4326) AS geom) p
+    """),
+]
+
+
+ZONE_JOB_LOCK = "zone_job"
+ORS_RATE_LIMIT = "ors_isochrone"
+ACTIVE_STATUSES = ("pending", "running")
+_MAX_KEPT_JOBS = 20
+
+# 작업 상태는 zone_job 테이블에 기록 (어느 인스턴스로 요청이 가도 같은 상태를 조회/취소)
+_JOB_COLUMNS = """
+    id, status, force, method, total, succeeded, failed, retried, error, owner, cancel_requested,
+    EXTRACT(EPOCH FROM created_at) AS created_at, EXTRACT(EPOCH FROM started_at) AS started_at,
+    EXTRACT(EPOCH FROM finished_at) AS finished_at, EXTRACT(EPOCH FROM now() - updated_at) AS idle_sec
+"""
+SELECT_JOB = text(f"SELECT {_JOB_COLUMNS} FROM zone_job WHERE id = :id")
+SELECT_ACTIVE_JOB = text(f"""
+    SELECT {_JOB_COLUMNS} FROM zone_job WHERE status IN ('pending', 'running') ORDER BY created_at DESC LIMIT 1
+""")
+SELECT_RECENT_JOBS = text(f"SELECT {_JOB_COLUMNS} FROM zone_job ORDER BY created_at DESC LIMIT :limit")
+# lock 을 잡은 상태에서 남아 있는 실행 중 작업은 실행하던 인스턴스가 중단된 것
+ABANDON_ACTIVE_JOBS = text("""
+    UPDATE zone_job SET status = 'failed', error = :error, finished_at = now(), updated_at = now()
+    WHERE status IN ('pending', 'running')
+""")
+INSERT_JOB = text("""
+    INSERT INTO zone_job (id, status, force, method, owner, created_at, updated_at)
+    VALUES (:id, :status, :force, :method, :owner, to_timestamp(:created_at), now())
+""")
+TRIM_JOBS = text("""
+    DELETE FROM zone_job
+    WHERE id NOT IN (SELECT id FROM zone_job ORDER BY created_at DESC LIMIT :keep)
+""")
+UPDATE_JOB = text("""
+    UPDATE zone_job
+    SET status = :status, total = :total, succeeded = :succeeded, failed = :failed, retried = :retried,
+        error = :error, started_at = to_timestamp(:started_at), finished_at = to_timestamp(:finished_at),
+        updated_at = now()
+    WHERE id = :id
+    RETURNING cancel_requested
+""")
+REQUEST_CANCEL = text("""
+    UPDATE zone_job SET cancel_requested = true
+    WHERE id = :id AND status IN ('pending', 'running')
+""")
+
+
+class ZoneJob:
+    """
+    제한 구역 계산 작업 상태 (API 로 그대로 노출, zone_job 테이블 행과 같은 값)
+    """
+
+    def __init__(self, force: bool = False, method: str = isochrone.BACKEND_ORS):
+        self.id = uuid.uuid4().hex
+        self.force = force
+        self.method = method  # isochrone.BACKENDS 중 하나 (impossible.method 로 저장)
+        self.status = "pending"  # pending / running / done / failed / cancelled
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.owner = socket.gethostname()
+        self.cancel_requested = False
+        self.created_at = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.error: str | None = None
+        self.task: asyncio.Task | None = None
+
+    @classmethod
+    def from_row(cls, row) -> "ZoneJob":
+        """
+        zone_job 테이블 행 → 상태 객체 (다른 인스턴스에서 실행 중인 작업 조회용)
+        기록이 ZONE_JOB_STALE_SEC 이상 멈춘 실행 중 작업은 실행하던 인스턴스가 중단된 것으로 보고 failed 로 표시
+        """
+        job = cls(force=row.force, method=row.method)
+        job.id = row.id
+        job.status = row.status
+        job.total, job.succeeded, job.failed, job.retried = row.total, row.succeeded, row.failed, row.retried
+        job.error = row.error
+        job.owner = row.owner
+        job.cancel_requested = row.cancel_requested
+        job.created_at = float(row.created_at)
+        job.started_at = float(row.started_at) if row.started_at is not None else None
+        job.finished_at = float(row.finished_at) if row.finished_at is not None else None
+        if job.status in ACTIVE_STATUSES and float(row.idle_sec) > settings.ZONE_JOB_STALE_SEC:
+            job.status = "failed"
+            job.error = f"작업을 실행하던 인스턴스({job.owner})가 응답하지 않습니다."
+        return job
+
+    def to_dict(self):
+        processed = self.succeeded + self.failed
+        end = self.finished_at or time.time()
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "force": self.force,
+            "method": self.method,
+            "total": self.total,
+            "processed": processed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retried": self.retried,
+            "percent": round(processed / self.total * 100, 1) if self.total else 100.0,
+            "elapsed_sec": round(end - self.started_at, 1) if self.started_at else 0.0,
+            "owner": self.owner,
+            "cancel_requested": self.cancel_requested,
+            "error": self.error,
+        }
+
+
+# 이 인스턴스에서 실행 중인 작업 (태스크 취소용, 상태 조회는 zone_job 테이블 기준)
+_running: dict[str, ZoneJob] = {}
+
+
+def _register_job(job: ZoneJob):
+    """
+    [zone_job lock 을 잡은 상태에서 실행] 중단된 이전 작업을 정리하고 새 작업을 기록
+    """
+    with sync_engine.begin() as conn:
+        conn.execute(ABANDON_ACTIVE_JOBS, {"error": "작업을 실행하던 인스턴스가 중단되었습니다."})
+        conn.execute(INSERT_JOB, {"id": job.id, "status": job.status, "force": job.force, "method": job.method,
+                                  "owner": job.owner, "created_at": job.created_at})
+        conn.execute(TRIM_JOBS, {"keep": _MAX_KEPT_JOBS})
+
+
+def _save_job(job: ZoneJob) -> bool:
+    """
+    진행 상황 기록 (return: 다른 인스턴스에서 취소 요청이 들어왔는지)
+    """
+    with sync_engine.begin() as conn:
+        cancel = conn.execute(UPDATE_JOB, {
+            "id": job.id, "status": job.status, "total": job.total, "succeeded": job.succeeded,
+            "failed": job.failed, "retried": job.retried, "error": job.error,
+            "started_at": job.started_at, "finished_at": job.finished_at,
+        }).scalar()
+    return bool(cancel)
+
+
+def _load_job(job_id: str) -> ZoneJob | None:
+    with sync_engine.connect() as conn:
+        row = conn.execute(SELECT_JOB, {"id": job_id}).first()
+    return ZoneJob.from_row(row) if row is not None else None
+
+
+def _load_active_job() -> ZoneJob | None:
+    with sync_engine.connect() as conn:
+        row = conn.execute(SELECT_ACTIVE_JOB).first()
+    return ZoneJob.from_row(row) if row is not None else None
+
+
+def _load_recent_jobs() -> list[ZoneJob]:
+    with sync_engine.connect() as conn:
+        rows = conn.execute(SELECT_RECENT_JOBS, {"limit": _MAX_KEPT_JOBS}).fetchall()
+    return [ZoneJob.from_row(row) for row in rows]
+
+
+def _request_cancel(job_id: str) -> ZoneJob | None:
+    with sync_engine.begin() as conn:
+        conn.execute(REQUEST_CANCEL, {"id": job_id})
+    return _load_job(job_id)
+
+
+def _fetch_targets(force: bool):
+    db = SessionLocal()
+    try:
+        return db.execute(
+            TARGET_QUERY, {"force": force, "max_age_days": settings.ZONE_MAX_AGE_DAYS}
+        ).fetchall()
+    finally:
+        db.close()
+
+
+def _zone_params(row_hash: str, landlot_addr: str, longitude: float, latitude: float, shapely_poly,
+                 method: str) -> dict:
+    centroid = shapely_poly.centroid
+    return {
+        "landlot_address": landlot_addr,
+        "address_row_hash": row_hash,
+        "centroid_x": centroid.x,
+        "centroid_y": centroid.y,
+        "polygon_geom": shapely_poly.wkt,
+        "vertices": json.dumps(list(shapely_poly.exterior.coords)),
+        "origin_x": longitude,
+        "origin_y": latitude,
+        "method": method,
+    }
+
+
+def _zone_frame(rows, polygons) -> pd.DataFrame:
+    """
+    (매장 row_hash, 주소, 경도, 위도) 행 + Polygon 배열 → staging 테이블 COPY 용 DataFrame
+    (shapely.to_wkb(hex=True) 보다 바이너리 WKB + bytes.hex 가 수 배 빠름)
+    """
+    wkbs = shapely.to_wkb(np.asarray(polygons, dtype=object))
+    return pd.DataFrame({
+        "address_row_hash": [row[0] for row in rows],
+        "landlot_address": [row[1] for row in rows],
+        "origin_x": [row[2] for row in rows],
+        "origin_y": [row[3] for row in rows],
+        "polygon_wkb": [wkb.hex() for wkb in wkbs],
+    }, columns=ZONE_STAGING_COLUMNS)
+
+
+def _save_zones(params: list[dict]):
+    """
+    계산된 제한 구역을 즉시 impossible 테이블에 반영 (체크포인트)
+    중단 후 다시 실행하면 이미 저장된 매장은 건너뜁니다.
+    합집합 레이어도 같은 트랜잭션에서 바뀐 칸만 갱신합니다.
+    """
+    db = SessionLocal()
+    try:
+        db.execute(repository.DELETE_ZONES_FOR_STORE,
+                   [{"address_row_hash": p["address_row_hash"], "landlot_address": p["landlot_address"]} for p in params])
+        db.execute(INSERT_ZONE_QUERY, params)
+        db_service._refresh_coverage(db.connection())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _save_zones_bulk(frame: pd.DataFrame, method: str):
+    """
+    계산된 제한 구역을 COPY → staging 테이블 → 매장 단위 교체로 한 트랜잭션에 저장
+    (행마다 INSERT 하는 _save_zones 대신, 수만 건을 한 번에 저장하는 buffer 방식용)
+    """
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    with sync_engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TEMP TABLE zone_staging (
+                address_row_hash VARCHAR(64),
+                landlot_address VARCHAR(500),
+                origin_x DOUBLE PRECISION,
+                origin_y DOUBLE PRECISION,
+                polygon_wkb TEXT
+            ) ON COMMIT DROP
+        """))
+        cursor = conn.connection.cursor()
+        try:
+            ingest.copy_from_stdin(
+                cursor, f"COPY zone_staging ({', '.join(ZONE_STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+        for statement in REPLACE_ZONES_FROM_STAGING:
+            conn.execute(statement, {"method": method})
+        db_service._refresh_coverage(conn)
+
+
+def _ors_limiter():
+    """
+    ORS 분당 할당량을 모든 인스턴스가 함께 쓰는 요청 제한기
+    """
+    return coordination.SharedRateLimiter(ORS_RATE_LIMIT, settings.ORS_ISOCHRONE_PER_MINUTE / 60)
+
+
+async def _isochrone_with_retry(job: ZoneJob, latitude: float, longitude: float, limiter):
+    """
+    요청 제한기로 속도를 맞추고, 할당량 초과(429) 등 일시적 오류는 지수 백오프(+jitter) 후 다시 요청합니다.
+    (재시도를 모두 실패하면 None → 이번 실행에서는 실패로 세고, 구역이 없으므로 다음 실행에서 다시 계산)
+    """
+    for attempt in range(settings.ORS_MAX_RETRIES + 1):
+        await limiter.acquire()
+        try:
+            return await ors_api.get_isochrone_polygon(latitude, longitude)
+        except ors_api.ORSAPITransientError as e:
+            if attempt == settings.ORS_MAX_RETRIES:
+                print(f"[restricted zone] ORS 재시도 초과: {e}")
+                return None
+            job.retried += 1
+            delay = settings.ORS_BACKOFF_BASE_SEC * (2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay))
+
+
+async def _run_ors(job: ZoneJob, rows):
+    """
+    ORS API: 할당량(분당 요청 수)에 맞춘 공유 요청 제한 + 제한된 동시성으로 1건씩 계산/저장
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    for row in rows:
+        queue.put_nowait(row)
+    limiter = _ors_limiter()
+
+    async def worker():
+        while True:
+            try:
+                row_hash, landlot_addr, longitude, latitude = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                # ORS를 사용해 Polygon 계산 (Shapely 객체)
+                shapely_poly = await _isochrone_with_retry(job, latitude, longitude, limiter)
+                params = _zone_params(row_hash, landlot_addr, longitude, latitude, shapely_poly, job.method) \
+                    if shapely_poly else None
+            except Exception as e:
+                # 응답/polygon 형식 오류 등은 해당 주소만 실패로 처리 (저장 오류는 작업 전체 실패)
+                print(f"[restricted zone] 제한 구역 계산 중 오류 발생: address={landlot_addr}, {e!r}")
+                params = None
+            if params is None:
+                print(f"[restricted zone] 제한 구역 계산 실패: address={landlot_addr}")
+                job.failed += 1
+                continue
+            await asyncio.to_thread(_save_zones, [params])
+            job.succeeded += 1
+
+    workers = [asyncio.create_task(worker()) for _ in range(settings.ORS_CONCURRENCY)]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        # 한 워커가 실패하거나 작업이 취소되면 나머지 워커도 멈춘 뒤 작업 상태를 정함
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def _run_local(job: ZoneJob, rows):
+    """
+    로컬 보행 그래프: 요청 제한 없이 ISOCHRONE_BATCH_SIZE 단위로 프로세스 풀에서 계산 후 배치 저장
+    """
+    batch_size = settings.ISOCHRONE_BATCH_SIZE
+    for i in range(0, len(rows), batch_size):
+        batch = rows[i:i + batch_size]
+        polygons = await local_isochrone.compute_isochrones([(lat, lon) for _, _, lon, lat in batch])
+        params = []
+        for (row_hash, landlot_addr, longitude, latitude), shapely_poly in zip(batch, polygons):
+            if shapely_poly is None:
+                print(f"[restricted zone] 제한 구역 계산 실패: address={landlot_addr}")
+                job.failed += 1
+                continue
+            params.append(_zone_params(row_hash, landlot_addr, longitude, latitude, shapely_poly, job.method))
+        if params:
+            await asyncio.to_thread(_save_zones, params)
+            job.succeeded += len(params)
+
+
+async def _run_buffer(job: ZoneJob, rows):
+    """
+    기하 버퍼: 전체 대상 좌표를 한 번에 미터 좌표계로 변환/버퍼링한 뒤 ZONE_BUFFER_BATCH_SIZE 단위로 COPY 저장
+    (외부 API/보행 그래프 없이 전체 데이터를 수 초 안에 다시 만드는 기준선)
+    """
+    if not rows:
+        return
+    longitudes = np.array([row[2] for row in rows], dtype=np.float64)
+    latitudes = np.array([row[3] for row in rows], dtype=np.float64)
+    polygons = await asyncio.to_thread(isochrone.buffer_polygons, longitudes, latitudes)
+    batch_size = settings.ZONE_BUFFER_BATCH_SIZE
+    for i in range(0, len(rows), batch_size):
+        frame = await asyncio.to_thread(_zone_frame, rows[i:i + batch_size], polygons[i:i + batch_size])
+        await asyncio.to_thread(_save_zones_bulk, frame, job.method)
+        job.succeeded += len(frame)
+
+
+async def _sync_state(job: ZoneJob):
+    """
+    [백그라운드] ZONE_JOB_SYNC_SEC 마다 진행 상황을 기록하고, 다른 인스턴스로 들어온 취소 요청이 있으면 작업을 취소
+    """
+    while True:
+        await asyncio.sleep(settings.ZONE_JOB_SYNC_SEC)
+        try:
+            cancel = await asyncio.to_thread(_save_job, job)
+        except Exception as e:
+            print(f"[restricted zone] 작업 상태 기록 중 오류 발생: {e}")
+            continue
+        if cancel and job.task is not None:
+            print(f"[restricted zone] 취소 요청 수신 → 작업을 취소합니다. (job={job.id})")
+            job.cancel_requested = True
+            job.task.cancel()
+            return
+
+
+async def _run(job: ZoneJob):
+    job.status = "running"
+    job.started_at = time.time()
+    sync = asyncio.create_task(_sync_state(job))
+    try:
+        rows = await asyncio.to_thread(_fetch_targets, job.force)
+        job.total = len(rows)
+        print(f"[restricted zone] 계산 대상 {job.total}건 (job={job.id}, method={job.method})")
+        await asyncio.to_thread(_save_job, job)
+
+        if job.method == isochrone.BACKEND_BUFFER:
+            await _run_buffer(job, rows)
+        elif job.method == isochrone.BACKEND_LOCAL:
+            await _run_local(job, rows)
+        else:
+            await _run_ors(job, rows)
+        job.status = "done"
+        print(f"[restricted zone] 계산 완료: {job.to_dict()}")
+
+    except asyncio.CancelledError:
+        job.status = "cancelled"
+        raise
+    except Exception as e:
+        job.status = "failed"
+        job.error = str(e)
+        print(f"[restricted zone] 제한 구역 계산 중 오류 발생: {e}")
+    finally:
+        job.finished_at = time.time()
+        sync.cancel()
+        await asyncio.gather(sync, return_exceptions=True)
+        try:
+            await asyncio.to_thread(_save_job, job)
+        except Exception as e:
+            print(f"[restricted zone] 작업 상태 기록 중 오류 발생: {e}")
+        # 저장된 구역이 있으면 (취소/실패 포함) 지도용 단순화 polygon, /checkImpossible 인덱스, 입점 가능 격자 갱신
+        if job.succeeded:
+            await asyncio.to_thread(db_service.refresh_polygon_lod)
+            await spatial_index.rebuild_zone_index()
+            eligibility_grid.request_sync()
+
+
+async def _run_exclusive(job: ZoneJob, lock: coordination.AdvisoryLock):
+    """
+    zone_job lock 을 잡은 채로 작업을 실행하고, 끝나면(취소/실패 포함) lock 을 풀어 다음 작업을 받을 수 있게 함
+    """
+    try:
+        await _run(job)
+    finally:
+        _running.pop(job.id, None)
+        await asyncio.to_thread(lock.release)
+
+
+async def start_job(force: bool = False, method: str | None = None) -> ZoneJob | None:
+    """
+    제한 구역 계산 작업을 백그라운드로 시작합니다.
+    같은 DB 를 쓰는 인스턴스 중 zone_job advisory lock 을 잡은 하나만 실행하며,
+    이미 실행 중인 작업이 있으면 (다른 인스턴스의 작업이라도) 그 작업을 반환합니다.
+    - method: isochrone.BACKENDS 중 하나 (None 이면 ISOCHRONE_BACKEND 설정값)
+    - return: None (다른 인스턴스가 작업을 막 시작하거나 끝내는 중이라 아직 상태가 기록되지 않음)
+    """
+    for job in _running.values():
+        if job.status in ACTIVE_STATUSES:
+            return job
+
+    lock = coordination.AdvisoryLock(ZONE_JOB_LOCK)
+    if not await asyncio.to_thread(lock.try_acquire):
+        return await asyncio.to_thread(_load_active_job)
+    job = ZoneJob(force=force, method=method or settings.ISOCHRONE_BACKEND)
+    try:
+        await asyncio.to_thread(_register_job, job)
+    except Exception:
+        await asyncio.to_thread(lock.release)
+        raise
+    _running[job.id] = job
+    job.task = asyncio.create_task(_run_exclusive(job, lock))
+    return job
+
+
+async def get_job(job_id: str) -> ZoneJob | None:
+    """
+    작업 상태 조회 (이 인스턴스에서 실행 중이면 메모리 상태, 아니면 zone_job 테이블)
+    """
+    job = _running.get(job_id)
+    if job is not None:
+        return job
+    return await asyncio.to_thread(_load_job, job_id)
+
+
+async def list_jobs() -> list[ZoneJob]:
+    """
+    최근 작업 목록 (최신순, 이 인스턴스에서 실행 중인 작업은 메모리 상태로)
+    """
+    return [_running.get(job.id, job) for job in await asyncio.to_thread(_load_recent_jobs)]
+
+
+async def cancel(job_id: str) -> ZoneJob | None:
+    """
+    작업 취소. 이 인스턴스에서 실행 중이면 바로 취소하고,
+    다른 인스턴스의 작업이면 취소 요청을 기록 (실행 중인 인스턴스가 ZONE_JOB_SYNC_SEC 안에 취소)
+    """
+    job = _running.get(job_id)
+    if job is not None:
+        await cancel_job(job)
+        return job
+    return await asyncio.to_thread(_request_cancel, job_id)
+
+
+async def cancel_job(job: ZoneJob):
+    if job.task is not None and not job.task.done():
+        job.task.cancel()
+        try:
+            await job.task
+        except asyncio.CancelledError:
+            pass
+
+
+async def cancel_all():
+    """
+    [앱 종료 시 실행] 이 인스턴스에서 실행 중인 작업 취소
+    (저장된 체크포인트는 유지되어 다음 실행에서 이어서 계산, lock 이 풀리므로 다른 인스턴스가 새 작업을 받을 수 있음)
+    """
+    for job in list(_running.values()):
+        await cancel_job(job)
@@ -0,0 +1,128 @@
+# app/utils/cache.py
+import asyncio
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    만료 시간(TTL)이 있는 LRU 캐시 (프로세스 내 메모리)
+    - maxsize 초과 시 가장 오래 사용하지 않은 항목부터 제거
+    - hits / misses 카운터로 적중률 확인
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key, default=None):
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING or item[0] < time.monotonic():
+            if item is not _MISSING:
+                del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key, value, ttl: float | None = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class SWRCache:
+    """
+    비동기 조회 결과 캐시 (stale-while-revalidate + single-flight)
+    - ttl 이내: 캐시 값 그대로 반환
+    - ttl 경과 ~ ttl + stale_ttl: 이전 값을 즉시 반환하고 백그라운드에서 한 번만 갱신
+    - 그 이후/없음: 조회. 같은 키로 동시에 들어온 요청은 하나의 조회 결과를 함께 기다림
+    조회 실패는 캐시하지 않습니다.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float = 0.0):
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize, ttl + stale_ttl)
+        self._inflight: dict = {}
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_fetch(self, key, fetch):
+        """
+        fetch: 인자 없는 코루틴 함수 (캐시에 없을 때 호출)
+        """
+        item = self._cache.get(key)
+        if item is not None:
+            fetched_at, value = item
+            if time.monotonic() - fetched_at < self.ttl:
+                self.fresh_hits += 1
+            else:
+                self.stale_hits += 1
+                self._start(key, fetch)
+            return value
+        self.misses += 1
+        # shield: 먼저 요청한 클라이언트가 끊겨도 함께 기다리는 요청의 조회는 계속 진행
+        return await asyncio.shield(self._start(key, fetch))
+
+    def _start(self, key, fetch) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+        task = asyncio.create_task(self._fetch_and_store(key, fetch))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    async def _fetch_and_store(self, key, fetch):
+        value = await fetch()
+        self._cache.set(key, (time.monotonic(), value))
+        return value
+
+    def _done(self, key, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        # 백그라운드 갱신 실패는 기다리는 쪽이 없으므로 여기서 기록
+        if not task.cancelled() and task.exception() is not None:
+            print(f"캐시 조회 실패(key={key}): {task.exception()}")
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        total = self.fresh_hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._cache),
+            "maxsize": self._cache.maxsize,
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+            "hit_rate": round((self.fresh_hits + self.stale_hits) / total, 4) if total else 0.0,
+        }
@@ -1,5 +1,6 @@
 #app/utils/geo.py
 import math
+import numpy as np
 import pyproj
 
 # --- DB 좌표 변환용 (EPSG:5174 -> WGS84) ---
@@ -7,6 +8,11 @@ proj_katech = pyproj.CRS("EPSG:5174")
 proj_wgs84 = pyproj.CRS("EPSG:4326")
 transformer_epsg_to_wgs = pyproj.Transformer.from_crs(proj_katech, proj_wgs84, always_xy=True)
 
+# --- 미터 단위 거리/버퍼 계산용 평면 좌표계 (EPSG:5186, Korea 2000 중부원점) ---
+METRIC_CRS = "EPSG:5186"
+transformer_wgs_to_metric = pyproj.Transformer.from_crs(proj_wgs84, pyproj.CRS(METRIC_CRS), always_xy=True)
+transformer_metric_to_wgs = pyproj.Transformer.from_crs(pyproj.CRS(METRIC_CRS), proj_wgs84, always_xy=True)
+
 # 거리 계산 함수 (Haversine Formula)
 def calculate_distance(lat1, lon1, lat2, lon2):
     R = 6371000  # 지구 반지름 (미터)
@@ -21,6 +27,25 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
     return R * c
 
+def calculate_distance_many(lat, lon, lats, lons) -> np.ndarray:
+    """
+    한 지점(lat, lon)에서 여러 지점(lats, lons 배열)까지의 Haversine 거리(m) 배열
+    calculate_distance 와 같은 식/Clamping 을 NumPy 로 한 번에 계산합니다.
+    """
+    R = 6371000  # 지구 반지름 (미터)
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    phi1, phi2 = math.radians(lat), np.radians(lats)
+    dphi = np.radians(lats - lat)
+    dlambda = np.radians(lons - lon)
+
+    a = np.sin(dphi / 2)**2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2)**2
+
+    a = np.clip(a, 0.0, 1.0)
+
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return R * c
+
 # --- 좌표 변환 함수 ---
 def convert_epsg5174_to_wgs84(x_5174, y_5174):
     """
@@ -35,12 +60,9 @@ def convert_epsg5174_to_wgs84(x_5174, y_5174):
         return None, None
 
     try:
-        crs_5174 = pyproj.CRS("EPSG:5174")
-        crs_4326 = pyproj.CRS("EPSG:4326")
-        
-        transformer = pyproj.Transformer.from_crs(crs_5174, crs_4326, always_xy=True)
+        # 모듈 레벨 Transformer 재사용 (호출마다 CRS/Transformer 생성 비용 제거)
         # transform 결과는 (경도, 위도) 순서입니다 (always_xy=True 덕분)
-        lon_4326, lat_4326 = transformer.transform(x_5174, y_5174)
+        lon_4326, lat_4326 = transformer_epsg_to_wgs.transform(x_5174, y_5174)
         
         # 결과 유효성 검사
         if math.isnan(lat_4326) or math.isinf(lat_4326) or \
@@ -51,7 +73,38 @@ def convert_epsg5174_to_wgs84(x_5174, y_5174):
     except Exception as e:
         print(f"좌표 변환 오류: {e}")
         return None, None
-    
+
+
+def convert_epsg5174_to_wgs84_many(x_5174, y_5174):
+    """
+    EPSG:5174 좌표 배열을 WGS84(경도, 위도) 배열로 한 번에 변환합니다.
+    - 입력: x, y 배열 (NumPy 배열 / pandas Series / 리스트)
+    - 반환: (경도 배열, 위도 배열), 변환 불가 좌표(-1, NaN, inf)는 -1.0으로 채움
+    """
+    x = np.asarray(x_5174, dtype=np.float64)
+    y = np.asarray(y_5174, dtype=np.float64)
+
+    lon = np.full(x.shape, -1.0, dtype=np.float64)
+    lat = np.full(y.shape, -1.0, dtype=np.float64)
+
+    # -1 / NaN / inf 센티널을 벡터 마스크로 제외
+    valid = np.isfinite(x) & np.isfinite(y) & (x != -1.0) & (y != -1.0)
+    if not valid.any():
+        return lon, lat
+
+    lon_valid, lat_valid = transformer_epsg_to_wgs.transform(x[valid], y[valid])
+    lon_valid = np.asarray(lon_valid, dtype=np.float64)
+    lat_valid = np.asarray(lat_valid, dtype=np.float64)
+
+    # 변환 결과가 NaN/inf 인 좌표도 실패로 처리
+    ok = np.isfinite(lon_valid) & np.isfinite(lat_valid)
+    lon_valid[~ok] = -1.0
+    lat_valid[~ok] = -1.0
+
+    lon[valid] = lon_valid
+    lat[valid] = lat_valid
+    return lon, lat
+
 
 def convert_naver_mapcoord_to_wgs84(mapx_str: str | None, mapy_str: str | None) -> tuple[float | None, float | None]:
     """네이버 검색 API 좌표(문자열)를 WGS84(경도, 위도)로 변환 (1e7 나누기)"""
@@ -63,4 +116,64 @@ def convert_naver_mapcoord_to_wgs84(mapx_str: str | None, mapy_str: str | None)
         lat = float(mapy_str) / 10_000_000
         return lon, lat
     except (ValueError, TypeError):
-        return None, None
\ No newline at end of file
+        return None, None
+
+# --- geohash (위치 기반 캐시 키) ---
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_METER_PER_DEG = 111_320.0
+
+
+def geohash_encode(lat: float, lon: float, precision: int) -> str:
+    """
+    위도/경도를 precision 자리 geohash 문자열로 변환
+    """
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def geohash_center(geohash: str) -> tuple[float, float]:
+    """
+    geohash 셀 중심 (위도, 경도)
+    """
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if value >> shift & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def geohash_precision_for(meter: float) -> int:
+    """
+    셀의 가로/세로(적도 기준 미터)가 모두 meter 이하가 되는 가장 작은 geohash 자릿수
+    """
+    for precision in range(1, 13):
+        lon_bits = (5 * precision + 1) // 2
+        lat_bits = 5 * precision // 2
+        width = 360.0 / 2 ** lon_bits * _METER_PER_DEG
+        height = 180.0 / 2 ** lat_bits * _METER_PER_DEG
+        if max(width, height) <= meter:
+            return precision
+    return 12
@@ -0,0 +1,37 @@
+# app/utils/rate_limit.py
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    비동기 토큰 버킷 요청 제한기
+    - rate: 초당 충전되는 토큰 수 (외부 API 의 초당 허용 요청 수)
+    - capacity: 순간적으로 몰아서 보낼 수 있는 최대 요청 수
+    """
+
+    def __init__(self, rate: float, capacity: int | None = None):
+        if rate <= 0:
+            raise ValueError("rate 는 0보다 커야 합니다.")
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1.0):
+        """
+        토큰이 생길 때까지 기다린 뒤 소비합니다. (대기 순서는 lock 획득 순서)
+        """
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
@@ -0,0 +1,106 @@
+# benchmarks/bench_building_filter.py
+"""
+주변 상가 반경 필터 + 건물별 그룹화 마이크로벤치마크 (후보 10^5곳)
+
+- 기존: 후보마다 calculate_distance(스칼라) + 제목 태그 제거 re.sub 2회
+        (후보별 디버그 print 는 출력 비용이 결과를 왜곡하므로 제외)
+- 개선: 제목 태그 제거는 미리 컴파일한 패턴으로 1회, 거리는 calculate_distance_many 로 한 번에 계산
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_building_filter --places 100000
+"""
+import argparse
+import re
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.building_service import _TAG_PATTERN, group_nearby_places
+from app.utils.geo import calculate_distance
+
+ORIGIN = (37.498095, 127.027610)
+
+
+def make_items(n: int, seed: int = 0) -> list[dict]:
+    """
+    원점 주변 약 ±200m 에 흩어진 네이버 검색 결과 형태의 후보 n곳
+    """
+    rng = np.random.default_rng(seed)
+    lats = ORIGIN[0] + rng.uniform(-0.0018, 0.0018, n)
+    lons = ORIGIN[1] + rng.uniform(-0.0023, 0.0023, n)
+    buildings = rng.integers(0, n // 20 + 1, n)
+    return [{
+        "title": f"<b>상가</b>{i}",
+        "category": "편의점",
+        "address": f"건물{b}",
+        "lat": float(lat),
+        "lon": float(lon),
+    } for i, (lat, lon, b) in enumerate(zip(lats, lons, buildings))]
+
+
+def legacy_filter(latitude, longitude, items, radius):
+    valid_places = []
+    for item in items:
+        distance = calculate_distance(latitude, longitude, item['lat'], item['lon'])
+        if distance <= radius:
+            title = re.sub('<[^<]+?>', '', item['title'])
+            valid_places.append({"name": title, "category": item['category'],
+                                 "address": item['address'], "distance": round(distance, 2),
+                                 "lat": item['lat'], "lon": item['lon']})
+        else:
+            re.sub('<[^<]+?>', '', item['title'])  # 기존 코드는 거리와 관계없이 제목을 한 번 더 정제
+    buildings = {}
+    for place in valid_places:
+        addr = place['address']
+        if addr not in buildings:
+            buildings[addr] = {"building_address": addr, "stores": [],
+                               "location": {"lat": place['lat'], "lon": place['lon']}}
+        buildings[addr]["stores"].append({"name": place['name'], "category": place['category']})
+    return list(buildings.values())
+
+
+def vectorized_filter(latitude, longitude, items, radius):
+    places = [{"name": _TAG_PATTERN.sub('', item['title']), "category": item['category'],
+               "address": item['address'], "lat": item['lat'], "lon": item['lon']} for item in items]
+    return group_nearby_places(latitude, longitude, places, radius)
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    items = make_items(args.places)
+    radius = settings.SEARCH_RADIUS_METER
+    legacy_sec, legacy = _best_of(lambda: legacy_filter(*ORIGIN, items, radius), args.repeat)
+    new_sec, new = _best_of(lambda: vectorized_filter(*ORIGIN, items, radius), args.repeat)
+    # 요청당 비용: 정제된 후보 목록은 셀 캐시에 있으므로 필터+그룹화만
+    prepared = [{"name": _TAG_PATTERN.sub('', i['title']), "category": i['category'],
+                 "address": i['address'], "lat": i['lat'], "lon": i['lon']} for i in items]
+    cached_sec, _ = _best_of(lambda: group_nearby_places(*ORIGIN, prepared, radius), args.repeat)
+    # 거리 필터만 (태그 정제/그룹화 제외)
+    places = [{"name": "", "category": "", "address": "", "lat": i['lat'], "lon": i['lon']} for i in items]
+    dist_legacy, _ = _best_of(lambda: [calculate_distance(*ORIGIN, p['lat'], p['lon']) for p in places], args.repeat)
+    dist_new, _ = _best_of(lambda: group_nearby_places(*ORIGIN, places, -1), args.repeat)
+
+    assert legacy == new, "결과 불일치"
+    print(f"후보 {args.places:,}곳, 반경 {radius}m, 반경 이내 {sum(len(b['stores']) for b in new):,}곳")
+    print(f"  필터+그룹화  기존 {legacy_sec * 1000:8.1f} ms | 개선 {new_sec * 1000:8.1f} ms | {legacy_sec / new_sec:5.1f}x")
+    print(f"  요청당(셀 캐시 적중) 개선 {cached_sec * 1000:8.1f} ms | {legacy_sec / cached_sec:5.1f}x")
+    print(f"  거리 계산만  기존 {dist_legacy * 1000:8.1f} ms | 개선 {dist_new * 1000:8.1f} ms | {dist_legacy / dist_new:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
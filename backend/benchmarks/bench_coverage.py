@@ -0,0 +1,91 @@
+# benchmarks/bench_coverage.py
+"""
+제한 구역 원본(impossible) vs 합집합 레이어(impossible_coverage) 쿼리 비용 비교 (DB 필요)
+
+- 점 검사   : 무작위 좌표마다 ZONE_CONTAINS_POINT / COVERAGE_CONTAINS_POINT
+- 화면 조회 : 무작위 화면 영역(약 1km)마다 ZONES_IN_BBOX / COVERAGE_IN_BBOX (원본 좌표, 한 페이지)
+  걸린 시간과 함께 반환 행 수, 응답 JSON 크기를 비교합니다.
+좌표는 제한 구역이 있는 범위 안에서 뽑고, 같은 좌표/영역으로 두 쿼리를 번갈아 실행합니다.
+
+실행 (backend 디렉토리에서, impossible_coverage 가 계산된 DB):
+    python -m benchmarks.bench_coverage --points 2000 --views 200
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+from app.core.database import sync_engine
+from app.services import repository
+
+VIEW_DEG = 0.01  # 화면 영역 한 변 (도, 약 1km)
+
+
+def _table_stats(conn, table: str, column: str) -> tuple[int, int]:
+    return tuple(conn.execute(text(f"SELECT COUNT(*), COALESCE(SUM(ST_NPoints({column})), 0) FROM {table}")).one())
+
+
+def _timed(conn, statement, params_list, measure):
+    elapsed = []
+    sizes = []
+    for params in params_list:
+        start = time.perf_counter()
+        result = conn.execute(statement, params)
+        value = measure(result)
+        elapsed.append(time.perf_counter() - start)
+        sizes.append(value)
+    return np.array(elapsed), sizes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=2_000)
+    parser.add_argument("--views", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    with sync_engine.connect() as conn:
+        extent = conn.execute(text(
+            "SELECT ST_XMin(e), ST_YMin(e), ST_XMax(e), ST_YMax(e) FROM (SELECT ST_Extent(polygon_geom) e FROM impossible) s"
+        )).one()
+        if extent[0] is None:
+            print("impossible 테이블이 비어 있습니다.")
+            return
+        min_x, min_y, max_x, max_y = extent
+        raw_rows, raw_points = _table_stats(conn, "impossible", "polygon_geom")
+        cov_rows, cov_points = _table_stats(conn, "impossible_coverage", "geom")
+        print(f"원본 {raw_rows:,}개 (꼭짓점 {raw_points:,}) | 합집합 조각 {cov_rows:,}개 (꼭짓점 {cov_points:,})")
+
+        points = [{"x": x, "y": y} for x, y in zip(rng.uniform(min_x, max_x, args.points),
+                                                   rng.uniform(min_y, max_y, args.points))]
+        raw_sec, raw_hits = _timed(conn, repository.ZONE_CONTAINS_POINT, points, lambda r: r.scalar())
+        cov_sec, cov_hits = _timed(conn, repository.COVERAGE_CONTAINS_POINT, points, lambda r: r.scalar())
+        mismatch = sum(a != b for a, b in zip(raw_hits, cov_hits))
+        print(f"점 검사 {args.points:,}건 (포함 {sum(raw_hits):,}건, 불일치 {mismatch}건)")
+        print(f"  원본   평균 {raw_sec.mean() * 1000:7.3f} ms | p99 {np.percentile(raw_sec, 99) * 1000:7.3f} ms")
+        print(f"  합집합 평균 {cov_sec.mean() * 1000:7.3f} ms | p99 {np.percentile(cov_sec, 99) * 1000:7.3f} ms")
+
+        views = []
+        for x, y in zip(rng.uniform(min_x, max_x - VIEW_DEG, args.views), rng.uniform(min_y, max_y - VIEW_DEG, args.views)):
+            views.append({"min_x": x, "min_y": y, "max_x": x + VIEW_DEG, "max_y": y + VIEW_DEG,
+                          "cursor": 0, "limit": 5_000})
+
+        def response_size(result):
+            rows = result.fetchall()
+            return len(rows), len(json.dumps([row[1] for row in rows]))
+
+        raw_sec, raw_sizes = _timed(conn, repository.ZONES_IN_BBOX, views, response_size)
+        cov_sec, cov_sizes = _timed(conn, repository.COVERAGE_IN_BBOX, views, response_size)
+        print(f"화면 조회 {args.views:,}건 (영역 {VIEW_DEG}도)")
+        for name, sec, sizes in (("원본", raw_sec, raw_sizes), ("합집합", cov_sec, cov_sizes)):
+            rows = np.array([s[0] for s in sizes])
+            size_kb = np.array([s[1] for s in sizes]) / 1024
+            print(f"  {name:4s} 평균 {sec.mean() * 1000:7.2f} ms | p99 {np.percentile(sec, 99) * 1000:7.2f} ms | "
+                  f"행 {rows.mean():7.1f} | 응답 {size_kb.mean():8.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
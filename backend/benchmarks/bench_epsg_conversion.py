@@ -0,0 +1,80 @@
+# benchmarks/bench_epsg_conversion.py
+"""
+EPSG:5174 -> WGS84 좌표 변환 벤치마크 (행 단위 apply vs 배열 일괄 변환)
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_epsg_conversion --rows 1000000
+
+기존 행 단위 경로는 행마다 CRS/Transformer 를 새로 만들어 매우 느리므로,
+--legacy-sample 개수만 실제로 측정한 뒤 전체 행 수로 환산합니다.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pyproj
+
+from app.utils.geo import convert_epsg5174_to_wgs84_many
+
+
+def legacy_convert(x_5174, y_5174):
+    """변경 전 convert_epsg5174_to_wgs84 와 동일한 행 단위 변환 (호출마다 Transformer 생성)"""
+    if x_5174 == -1.0 or y_5174 == -1.0 or np.isnan(x_5174) or np.isnan(y_5174):
+        return -1.0, -1.0
+    transformer = pyproj.Transformer.from_crs(
+        pyproj.CRS("EPSG:5174"), pyproj.CRS("EPSG:4326"), always_xy=True)
+    return transformer.transform(x_5174, y_5174)
+
+
+def make_synthetic_csv(path: str, rows: int, invalid_ratio: float = 0.02):
+    """수원 인근 EPSG:5174 범위의 합성 address.csv 생성 (일부 -1 / 빈 값 포함)"""
+    rng = np.random.default_rng(42)
+    x = rng.uniform(190000, 215000, rows)
+    y = rng.uniform(405000, 430000, rows)
+    invalid = rng.random(rows) < invalid_ratio
+    x[invalid] = -1.0
+    df = pd.DataFrame({
+        "landlot_address": [f"경기도 수원시 가상동 {i}" for i in range(rows)],
+        "road_name_address": "비어있음",
+        "x": x,
+        "y": y,
+    })
+    df.to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--legacy-sample", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "address.csv")
+        make_synthetic_csv(csv_path, args.rows)
+        df = pd.read_csv(csv_path)
+
+    x = pd.to_numeric(df["x"], errors="coerce").fillna(-1.0)
+    y = pd.to_numeric(df["y"], errors="coerce").fillna(-1.0)
+
+    # 1. 기존 행 단위 경로 (샘플 측정 후 환산)
+    sample = df.head(args.legacy_sample)
+    start = time.perf_counter()
+    sample.apply(lambda row: legacy_convert(row["x"], row["y"]), axis=1, result_type="expand")
+    legacy_sec = (time.perf_counter() - start) * (args.rows / len(sample))
+
+    # 2. 배열 일괄 변환
+    start = time.perf_counter()
+    lon, lat = convert_epsg5174_to_wgs84_many(x.to_numpy(), y.to_numpy())
+    vector_sec = time.perf_counter() - start
+
+    print(f"rows={args.rows:,}")
+    print(f"per-row apply (추정): {legacy_sec:10.2f} s")
+    print(f"vectorized         : {vector_sec:10.2f} s")
+    print(f"speedup            : {legacy_sec / vector_sec:10.1f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_feasible_region.py
+"""
+입점 가능 영역 계산 비용 (DB 불필요, 합성 데이터)
+
+서울 구 하나 크기(약 6km x 6km) 영역에 isochrone 형태 제한 구역과 소매점을 흩어 놓고
+- 첫 요청: 인덱스 조회 + 프로세스 풀 워커에서 합집합/차집합 계산
+- 같은 영역 재요청: 캐시 적중
+- 서로 다른 영역 여러 개 동시 요청: 프로세스 풀 병렬 계산
+걸린 시간을 비교합니다.
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_feasible_region --zones 3000 --retailers 3000 --districts 8
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+import shapely
+
+from app.services import feasible_region, spatial_index
+
+MIN_X, MIN_Y, MAX_X, MAX_Y = 127.02, 37.47, 127.09, 37.53
+
+
+async def run(args):
+    rng = np.random.default_rng(0)
+    centers = shapely.points(rng.uniform(MIN_X, MAX_X, args.zones), rng.uniform(MIN_Y, MAX_Y, args.zones))
+    spatial_index.zone_index = spatial_index.ZoneIndex(shapely.buffer(centers, 0.001, quad_segs=16),
+                                                       [f"구역{i}" for i in range(args.zones)], version=1)
+    spatial_index.retailer_index = spatial_index.RetailerIndex(
+        rng.uniform(MIN_X, MAX_X, args.retailers), rng.uniform(MIN_Y, MAX_Y, args.retailers),
+        [f"매장{i}" for i in range(args.retailers)], version=1)
+
+    district = feasible_region.parse_district(bbox=(MIN_X, MIN_Y, MAX_X, MAX_Y))
+    await feasible_region.get_feasible_region(feasible_region.parse_district(bbox=(MIN_X, MIN_Y, MIN_X + 0.001, MIN_Y + 0.001)))
+
+    start = time.perf_counter()
+    region = await feasible_region.get_feasible_region(district)
+    cold_sec = time.perf_counter() - start
+    start = time.perf_counter()
+    await feasible_region.get_feasible_region(feasible_region.parse_district(bbox=(MIN_X, MIN_Y, MAX_X, MAX_Y)))
+    warm_sec = time.perf_counter() - start
+    props = region.properties
+    print(f"영역 {props['district_area_m2'] / 1e6:.1f}km² | 제한 구역 {props['zones']:,}개, 소매점 {props['retailers']:,}개 "
+          f"→ 입점 가능 {props['ratio'] * 100:.1f}% ({props['polygons']:,}조각)")
+    print(f"  첫 요청   {cold_sec * 1000:9.1f} ms")
+    print(f"  캐시 적중 {warm_sec * 1000:9.3f} ms | GeoJSON {len(region.to_geojson()) / 1024:.0f} KB")
+
+    step = (MAX_X - MIN_X) / args.districts
+    districts = [feasible_region.parse_district(bbox=(MIN_X + i * step, MIN_Y, MIN_X + (i + 1) * step, MAX_Y))
+                 for i in range(args.districts)]
+    start = time.perf_counter()
+    await asyncio.gather(*(feasible_region.get_feasible_region(d) for d in districts))
+    print(f"  서로 다른 영역 {args.districts}개 동시 요청 {(time.perf_counter() - start) * 1000:9.1f} ms")
+    feasible_region.shutdown_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zones", type=int, default=3_000)
+    parser.add_argument("--retailers", type=int, default=3_000)
+    parser.add_argument("--districts", type=int, default=8)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# benchmarks/bench_nearby_buildings.py
+"""
+/building/nearby-buildings 지연 시간 벤치마크 (요청마다 새 httpx 클라이언트 vs 앱 공유 클라이언트)
+
+로컬 stub 서버가 NAVER Reverse Geocoding / 지역 검색 API 를 흉내 내며,
+요청 1건당 외부 호출 7회(역지오코딩 1 + 카테고리 검색 6)가 그대로 발생합니다.
+geocode 캐시는 우회하여 매 요청이 외부 호출을 하도록 합니다.
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_nearby_buildings --requests 300 --concurrency 10
+"""
+import argparse
+import asyncio
+import socket
+import threading
+import time
+
+import httpx
+import numpy as np
+import uvicorn
+from fastapi import FastAPI
+
+from app.api import building
+from app.core.config import settings
+from app.core.http_client import http_clients
+from app.services import building_service, naver_api
+
+stub = FastAPI()
+
+
+@stub.get("/map-reversegeocode/v2/gc")
+async def stub_reverse_geocode():
+    region = {f"area{i}": {"name": name} for i, name in enumerate(["", "서울특별시", "강남구", "역삼동"])}
+    return {"status": {"code": 0}, "results": [{"region": region}]}
+
+
+@stub.get("/v1/search/local.json")
+async def stub_search():
+    return {"items": [{
+        "title": "<b>스타벅스</b> 강남R점",
+        "category": "카페",
+        "address": "서울특별시 강남구 역삼동 825",
+        "roadAddress": "서울특별시 강남구 강남대로 390",
+        "mapx": "1270276100", "mapy": "374980950",
+    }]}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub_server() -> str:
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(stub, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run_load(total: int, concurrency: int) -> np.ndarray:
+    app = FastAPI()
+    app.include_router(building.router)
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get("/building/nearby-buildings",
+                                            params={"latitude": 37.498095, "longitude": 127.027610})
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        await asyncio.gather(*(one() for _ in range(total)))
+    return np.array(latencies) * 1000
+
+
+async def main(total: int, concurrency: int):
+    base_url = start_stub_server()
+    naver_api.NAVER_REVERSE_GEOCODING_URL = f"{base_url}/map-reversegeocode/v2/gc"
+    naver_api.NAVER_SEARCH_URL = f"{base_url}/v1/search/local.json"
+    settings.NAVER_CLIENT_ID = settings.NAVER_CLIENT_ID or "bench"
+    settings.NAVER_CLIENT_SECRET = settings.NAVER_CLIENT_SECRET or "bench"
+    settings.NAVER_DEV_ID = settings.NAVER_DEV_ID or "bench"
+    settings.NAVER_DEV_SECRET = settings.NAVER_DEV_SECRET or "bench"
+
+    # geocode 캐시 우회 (매 요청 외부 호출)
+    building_service.geocode_cache.get_address = naver_api.get_address_from_coords
+
+    # 1. 변경 전: 외부 호출마다 새 클라이언트 (연결 재사용 없음)
+    shared_get = http_clients.get
+    per_call_clients = []
+
+    def new_client_per_call(name):
+        client = httpx.AsyncClient(timeout=settings.HTTP_TIMEOUT_SEC)
+        per_call_clients.append(client)
+        return client
+
+    http_clients.get = new_client_per_call
+    before = await run_load(total, concurrency)
+    for client in per_call_clients:
+        await client.aclose()
+
+    # 2. 변경 후: 앱 공유 클라이언트 (keep-alive 연결 풀)
+    http_clients.get = shared_get
+    await http_clients.start()
+    await run_load(concurrency, concurrency)  # 연결 풀 워밍업
+    after = await run_load(total, concurrency)
+    await http_clients.close()
+
+    print(f"requests={total}, concurrency={concurrency}")
+    for label, values in (("per-call client", before), ("shared client  ", after)):
+        print(f"{label}: p50={np.percentile(values, 50):7.2f} ms  p99={np.percentile(values, 99):7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
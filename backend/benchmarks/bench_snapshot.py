@@ -0,0 +1,111 @@
+# benchmarks/bench_snapshot.py
+"""
+워커 시작 시 메모리 인덱스 생성 비용 비교 (제한 구역 polygon + 소매점, DB 조회 시간 제외)
+
+- 기존: 워커마다 DB 결과 행(WKB, 좌표, 주소 문자열)을 받아 WKB 파싱 + 소매점 좌표 변환
+- 개선: 스냅샷 파일 mmap → WKB 바이트 테이블에서 polygon 생성, 미리 변환한 미터 좌표/문자열 테이블 그대로 사용
+워커 한 개 기준 시간과, 인덱스를 만든 뒤 늘어난 전용 메모리(공유 페이지 제외)를 각각 새 프로세스에서 측정합니다.
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_snapshot --zones 20000 --retailers 50000
+"""
+import argparse
+import multiprocessing as mp
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+import shapely
+
+from app.services import snapshot, spatial_index
+
+
+def _private_mb() -> float:
+    """
+    프로세스 전용 메모리 (다른 프로세스와 공유하는 파일 매핑 페이지 제외)
+    """
+    total_kb = 0
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                total_kb += int(line.split()[1])
+    return total_kb / 1024
+
+
+def make_data(n_zones: int, n_retailers: int, seed: int = 0):
+    """
+    서울 범위에 흩어진 isochrone 형태(꼭짓점 약 64개) 제한 구역과 소매점
+    """
+    rng = np.random.default_rng(seed)
+    centers = shapely.points(rng.uniform(126.8, 127.2, n_zones), rng.uniform(37.43, 37.7, n_zones))
+    polygons = shapely.buffer(centers, 0.001, quad_segs=16)
+    lon = rng.uniform(126.8, 127.2, n_retailers)
+    lat = rng.uniform(37.43, 37.7, n_retailers)
+    labels = [f"서울특별시 강남구 역삼동 {i}번지" for i in range(max(n_zones, n_retailers))]
+    return shapely.to_wkb(polygons), labels[:n_zones], lon, lat, labels[:n_retailers]
+
+
+def _legacy(payload, queue):
+    # DB 결과 행을 워커에서 새로 만드는 과정은 pickle 복원으로 대신함 (네트워크/드라이버 시간 제외)
+    base = _private_mb()
+    start = time.perf_counter()
+    zone_rows, retailer_rows = pickle.loads(payload)
+    del payload
+    zones = spatial_index.ZoneIndex(shapely.from_wkb([bytes(r[1]) for r in zone_rows]), [r[0] for r in zone_rows])
+    retailers = spatial_index.RetailerIndex([r[1] for r in retailer_rows], [r[2] for r in retailer_rows],
+                                            [r[0] for r in retailer_rows])
+    del zone_rows, retailer_rows
+    queue.put((time.perf_counter() - start, _private_mb() - base, len(zones) + len(retailers)))
+
+
+def _snapshot(path, queue):
+    base = _private_mb()
+    start = time.perf_counter()
+    snap = snapshot.open_snapshot(path)
+    zones = spatial_index._zone_index_from(snap)
+    retailers = spatial_index._retailer_index_from(snap)
+    queue.put((time.perf_counter() - start, _private_mb() - base, len(zones) + len(retailers)))
+
+
+def _run(target, arg):
+    queue = mp.get_context("fork").Queue()
+    process = mp.get_context("fork").Process(target=target, args=(arg, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--zones", type=int, default=20_000)
+    parser.add_argument("--retailers", type=int, default=50_000)
+    args = parser.parse_args()
+
+    data = make_data(args.zones, args.retailers)
+    wkbs, zone_labels, lon, lat, retailer_labels = data
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "snapshot-1-1.bin")
+        start = time.perf_counter()
+        arrays = {**snapshot.retailer_arrays(lon, lat, retailer_labels),
+                  **snapshot.zone_arrays(shapely.from_wkb(wkbs), zone_labels)}
+        snapshot.write_snapshot(path, {"address": 1, "impossible": 1}, arrays)
+        build_sec = time.perf_counter() - start
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        payload = pickle.dumps((list(zip(zone_labels, wkbs.tolist())),
+                                list(zip(retailer_labels, lon.tolist(), lat.tolist()))))
+        legacy_sec, legacy_rss, n_legacy = _run(_legacy, payload)
+        snap_sec, snap_rss, n_snap = _run(_snapshot, path)
+
+    assert n_legacy == n_snap
+    print(f"제한 구역 {args.zones:,}개, 소매점 {args.retailers:,}개 | 스냅샷 {size_mb:.1f}MB (생성 {build_sec:.2f}s, 1회)")
+    print(f"  워커당 인덱스 생성  기존 {legacy_sec * 1000:8.1f} ms | 스냅샷 {snap_sec * 1000:8.1f} ms | "
+          f"{legacy_sec / snap_sec:5.1f}x")
+    print(f"  워커당 전용 메모리 기존 {legacy_rss:8.1f} MB | 스냅샷 {snap_rss:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
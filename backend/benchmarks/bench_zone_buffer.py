@@ -0,0 +1,70 @@
+# benchmarks/bench_zone_buffer.py
+"""
+buffer 방식 제한 구역 생성 비용 비교 (DB 저장 시간 제외)
+
+- 반복: 매장마다 좌표 변환 → Point.buffer → 역변환 → _zone_params (ORS/로컬 경로와 같은 1건 단위 처리)
+- 배열: isochrone.buffer_polygons 로 전체 좌표를 한 번에 변환/버퍼링 → _zone_frame (COPY 용 행)
+두 방식의 polygon 이 같은지도 확인합니다.
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_zone_buffer --stores 50000
+"""
+import argparse
+import time
+
+import numpy as np
+import shapely
+from shapely.geometry import Point
+from shapely.ops import transform
+
+from app.core.config import settings
+from app.services import isochrone, zone_job
+from app.utils.geo import transformer_metric_to_wgs, transformer_wgs_to_metric
+
+
+def _loop(rows):
+    polygons = []
+    params = []
+    for landlot_addr, longitude, latitude in rows:
+        x, y = transformer_wgs_to_metric.transform(longitude, latitude)
+        circle = Point(x, y).buffer(settings.ISOCHRONE_DISTANCE_METER, quad_segs=settings.ZONE_BUFFER_QUAD_SEGS)
+        poly = transform(transformer_metric_to_wgs.transform, circle)
+        polygons.append(poly)
+        params.append(zone_job._zone_params(landlot_addr, longitude, latitude, poly, isochrone.BACKEND_BUFFER))
+    return polygons, params
+
+
+def _vectorized(rows):
+    polygons = isochrone.buffer_polygons([row[1] for row in rows], [row[2] for row in rows])
+    return polygons, zone_job._zone_frame(rows, polygons)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(126.8, 127.2, args.stores)
+    lat = rng.uniform(37.43, 37.7, args.stores)
+    rows = [(f"서울특별시 강남구 역삼동 {i}번지", x, y) for i, (x, y) in enumerate(zip(lon.tolist(), lat.tolist()))]
+
+    start = time.perf_counter()
+    loop_polygons, _ = _loop(rows)
+    loop_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    polygons = isochrone.buffer_polygons(lon, lat)
+    buffer_sec = time.perf_counter() - start
+    start = time.perf_counter()
+    zone_job._zone_frame(rows, polygons)
+    frame_sec = time.perf_counter() - start
+
+    same = shapely.equals_exact(np.array(loop_polygons, dtype=object), polygons, tolerance=1e-9).all()
+    print(f"매장 {args.stores:,}개 (반경 {settings.ISOCHRONE_DISTANCE_METER:.0f}m, 꼭짓점 {4 * settings.ZONE_BUFFER_QUAD_SEGS + 1}개, 결과 일치 {same})")
+    print(f"  반복 (1건씩)  {loop_sec:7.2f}s")
+    print(f"  배열 버퍼     {buffer_sec:7.2f}s + 저장용 행 {frame_sec:5.2f}s | {loop_sec / (buffer_sec + frame_sec):5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/load_test.py
+"""
+실행 중인 API 서버 부하 테스트 (초당 처리 요청 수 / 지연 시간)
+
+DB 계층 변경 전후 비교: 같은 DB 데이터로 이전 커밋과 현재 커밋 서버를 각각 띄운 뒤 같은 옵션으로 실행합니다.
+기본 대상:
+- /checkImpossible                 (메모리 인덱스, 인덱스가 없을 때만 DB)
+- /getcoordinates/toORS?bbox=...   (서버 측 커서 스트리밍, 강남역 주변 약 1km)
+- /getcoordinates/getPolygon       (화면 영역 polygon, 강남역 주변)
+
+실행 (backend 디렉토리에서, 서버가 떠 있는 상태):
+    python -m benchmarks.load_test --base-url http://localhost:8000 --concurrency 50 --duration 20
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+TARGETS = {
+    "checkImpossible": ("/checkImpossible", {"x": 127.027610, "y": 37.498095}),
+    "toORS": ("/getcoordinates/toORS", {"bbox": "127.0166,37.4891,127.0386,37.5071"}),
+    "getPolygon": ("/getcoordinates/getPolygon",
+                   {"min_x": 127.0166, "min_y": 37.4891, "max_x": 127.0386, "max_y": 37.5071, "zoom": 16}),
+}
+
+
+async def run_target(client: httpx.AsyncClient, path: str, params: dict, concurrency: int, duration: float):
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, params=params)
+                await response.aread()
+                if response.status_code != 200:
+                    errors += 1
+                    continue
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.monotonic() - start
+    return np.array(latencies), errors, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--targets", default=",".join(TARGETS))
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60.0) as client:
+        for name in args.targets.split(","):
+            path, params = TARGETS[name]
+            latencies, errors, elapsed = await run_target(client, path, params, args.concurrency, args.duration)
+            if not len(latencies):
+                print(f"{name:16s} 성공한 요청 없음 (오류 {errors}건)")
+                continue
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            print(f"{name:16s} {len(latencies) / elapsed:8.1f} req/s | p50 {p50:7.1f} ms | "
+                  f"p99 {p99:7.1f} ms | 오류 {errors}건")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
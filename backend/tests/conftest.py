@@ -3,13 +3,15 @@ import pytest
 import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
 from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock
 
 from app.main import app
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 
 # --- 1. 테스트용 DB 설정 (In-Memory SQLite 또는 별도 PostgreSQL 사용 권장) ---
 # CI 환경에서는 실제 PostgreSQL 서비스 컨테이너를 사용하므로, 
@@ -22,6 +24,11 @@ TEST_DATABASE_URL = os.getenv(
 engine = create_engine(TEST_DATABASE_URL, poolclass=StaticPool)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 라우트용 (asyncpg). TestClient 는 테스트마다 이벤트 루프가 달라 연결을 재사용하지 않음(NullPool)
+async_engine = create_async_engine(
+    make_url(TEST_DATABASE_URL).set(drivername="postgresql+asyncpg"), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 @pytest.fixture(scope="function")
 def db_session():
     """테스트용 DB 세션 Fixture (함수마다 롤백되어 격리됨)"""
@@ -43,7 +50,11 @@ def client(db_session):
             yield db_session
         finally:
             pass
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
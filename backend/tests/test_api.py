@@ -25,4 +25,152 @@ def test_get_nearby_buildings_gangnam(client: TestClient):
     # Mock 데이터가 잘 반영되었는지 확인
     if data["count"] > 0:
         first_building = data["buildings"][0]
-        assert "스타벅스" in first_building["stores"][0]["name"]
\ No newline at end of file
+        assert "스타벅스" in first_building["stores"][0]["name"]
+
+def test_hot_queries_use_indexes(db_session):
+    """자주 실행되는 쿼리(repository.HOT_QUERIES)가 인덱스를 사용하는지 EXPLAIN 으로 확인"""
+    import json
+    from sqlalchemy import text
+    from app.core import schema
+    from app.services import repository
+
+    for statement in schema.SCHEMA_STATEMENTS + schema.INDEX_STATEMENTS:
+        db_session.execute(text(statement))
+    # 이전 스키마로 만들어진 DB 에 남아 있는 중복 인덱스 제거 (테스트 트랜잭션과 함께 롤백)
+    schema._apply_migrations(db_session.connection())
+    # 빈 테스트 테이블에서는 순차 스캔이 더 싸므로, 인덱스를 쓸 수 있는지만 확인
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+
+    for name, statement, params, indexes in repository.HOT_QUERIES:
+        plan = db_session.execute(text(f"EXPLAIN (FORMAT JSON) {statement.text}"), params).scalar()
+        plan_text = json.dumps(plan)
+        assert any(f'"Index Name": "{index}"' in plan_text for index in indexes), f"{name}: {plan_text}"
+
+def test_coverage_layer_tracks_zone_changes(db_session):
+    """합집합 레이어: 겹치는 구역은 하나로 합쳐지고, 구역 삭제 시 바뀐 칸만 다시 계산되는지 확인"""
+    from sqlalchemy import text
+    from app.core import schema
+    from app.services import db_service, repository
+
+    for statement in schema.SCHEMA_STATEMENTS + schema.INDEX_STATEMENTS:
+        db_session.execute(text(statement))
+    conn = db_session.connection()
+    conn.execute(text("DELETE FROM impossible"))
+    db_service._refresh_coverage(conn)
+
+    # 강남역 주변 겹치는 두 구역 + 떨어진 한 구역 (칸 경계 127.03 에 걸침)
+    conn.execute(text("""
+        INSERT INTO impossible (landlot_address, polygon_geom) VALUES
+        ('a', ST_MakeEnvelope(127.0270, 37.4975, 127.0290, 37.4990, 4326)),
+        ('b', ST_MakeEnvelope(127.0280, 37.4980, 127.0310, 37.4995, 4326)),
+        ('c', ST_MakeEnvelope(127.0502, 37.5102, 127.0508, 37.5108, 4326))
+    """))
+    db_service._refresh_coverage(conn)
+
+    def coverage_area(min_x, min_y, max_x, max_y):
+        return conn.execute(text("""
+            SELECT COALESCE(SUM(ST_Area(geom)), 0) FROM impossible_coverage
+            WHERE geom && ST_MakeEnvelope(:a, :b, :c, :d, 4326)
+        """), {"a": min_x, "b": min_y, "c": max_x, "d": max_y}).scalar()
+
+    union_area = 0.0020 * 0.0015 + 0.0030 * 0.0015 - 0.0010 * 0.0010
+    assert abs(coverage_area(127.02, 37.49, 127.04, 37.50) - union_area) < 1e-12
+    assert conn.execute(repository.COVERAGE_CONTAINS_POINT, {"x": 127.0300, "y": 37.4985}).scalar()
+    assert not conn.execute(repository.COVERAGE_CONTAINS_POINT, {"x": 127.0275, "y": 37.4992}).scalar()
+    # 경계 처리는 원본 조회(ST_Within)와 같음: 구역 외곽선 위는 밖, 다른 구역 안에 있는 경계는 안
+    for x, y, inside in ((127.0502, 37.5105, False), (127.0270, 37.4980, False), (127.0290, 37.4985, True)):
+        assert conn.execute(repository.ZONE_CONTAINS_POINT, {"x": x, "y": y}).scalar() is inside
+        assert conn.execute(repository.COVERAGE_CONTAINS_POINT, {"x": x, "y": y}).scalar() is inside
+    c_ids = conn.execute(text(
+        "SELECT array_agg(id ORDER BY id) FROM impossible_coverage WHERE cell_x = 12705")).scalar()
+
+    conn.execute(text("DELETE FROM impossible WHERE landlot_address = 'b'"))
+    db_service._refresh_coverage(conn)
+    assert abs(coverage_area(127.02, 37.49, 127.04, 37.50) - 0.0020 * 0.0015) < 1e-12
+    # 바뀌지 않은 칸의 조각은 그대로
+    assert conn.execute(text(
+        "SELECT array_agg(id ORDER BY id) FROM impossible_coverage WHERE cell_x = 12705")).scalar() == c_ids
+    assert not conn.execute(text("SELECT EXISTS (SELECT 1 FROM impossible_coverage_dirty)")).scalar()
+
+def test_zone_reload_swaps_table(db_session):
+    """제한 구역 교체 적재: 새 테이블이 인덱스/트리거/합집합 레이어/version 까지 갖춘 채로 impossible 을 대체하는지 확인"""
+    from sqlalchemy import text
+    from app.core import schema
+    from app.services import db_service, repository
+
+    for statement in schema.SCHEMA_STATEMENTS + schema.INDEX_STATEMENTS:
+        db_session.execute(text(statement))
+    conn = db_session.connection()
+    conn.execute(text("DELETE FROM impossible"))
+    conn.execute(text("""
+        INSERT INTO impossible (landlot_address, polygon_geom)
+        VALUES ('old', ST_MakeEnvelope(127.0270, 37.4975, 127.0290, 37.4990, 4326))
+    """))
+    db_service._refresh_coverage(conn)
+    old_max_id = conn.execute(text("SELECT max(id) FROM impossible")).scalar()
+    version = conn.execute(text("SELECT version FROM data_version WHERE table_name = 'impossible'")).scalar()
+    indexes = set(conn.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = 'impossible'")).scalars())
+
+    conn.execute(text("""
+        CREATE TEMP TABLE impossible_staging (
+            landlot_address VARCHAR(500), centroid_x DOUBLE PRECISION, centroid_y DOUBLE PRECISION,
+            polygon_geom TEXT, vertices TEXT, method VARCHAR(16)
+        ) ON COMMIT DROP
+    """))
+    conn.execute(text("""
+        INSERT INTO impossible_staging (landlot_address, polygon_geom, vertices) VALUES
+        ('new', 'POLYGON((127.0502 37.5102, 127.0508 37.5102, 127.0508 37.5108, 127.0502 37.5108, 127.0502 37.5102))', '[]')
+    """))
+    db_service._replace_impossible_from_staging(conn)
+
+    rows = conn.execute(text("SELECT id, landlot_address, method FROM impossible")).fetchall()
+    assert [(r.landlot_address, r.method) for r in rows] == [("new", "csv")] and rows[0].id > old_max_id
+    assert set(conn.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = 'impossible'")).scalars()) == indexes
+    assert not conn.execute(text("SELECT to_regclass('public.impossible_swap')")).scalar()
+    assert conn.execute(text("SELECT version FROM data_version WHERE table_name = 'impossible'")).scalar() > version
+    assert conn.execute(repository.COVERAGE_CONTAINS_POINT, {"x": 127.0505, "y": 37.5105}).scalar()
+    assert not conn.execute(repository.COVERAGE_CONTAINS_POINT, {"x": 127.0280, "y": 37.4980}).scalar()
+    assert conn.execute(text("SELECT count(*) FROM impossible_lod")).scalar() > 0
+
+    # 새 테이블에도 트리거가 다시 걸려 이후 변경이 합집합 레이어에 반영
+    conn.execute(text("DELETE FROM impossible"))
+    db_service._refresh_coverage(conn)
+    assert not conn.execute(repository.COVERAGE_CONTAINS_POINT, {"x": 127.0505, "y": 37.5105}).scalar()
+
+def test_advisory_lock_is_exclusive_across_sessions():
+    """advisory lock: 다른 세션(인스턴스)은 잡을 수 없고, 해제하거나 연결이 끊기면 다시 잡을 수 있는지 확인"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import NullPool
+    from app.core import coordination
+    from tests.conftest import TEST_DATABASE_URL
+
+    engine = create_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    first = coordination.AdvisoryLock("test_lock", engine=engine)
+    second = coordination.AdvisoryLock("test_lock", engine=engine)
+    other = coordination.AdvisoryLock("test_other_lock", engine=engine)
+    try:
+        assert first.try_acquire()
+        assert not second.try_acquire() and not second.held
+        assert other.try_acquire()
+        first.release()
+        assert second.try_acquire()
+        # 세션이 끊기면 (프로세스 종료) DB 가 lock 을 해제
+        second._conn.invalidate()
+        second._conn = None
+        assert first.try_acquire()
+    finally:
+        for lock in (first, second, other):
+            lock.release()
+        engine.dispose()
+
+def test_shared_rate_limiter_spaces_reservations(db_session):
+    """공유 요청 제한기: 여러 인스턴스가 예약해도 다음 허용 시각이 간격만큼 밀리는지 확인"""
+    from sqlalchemy import text
+    from app.core import coordination, schema
+
+    for statement in schema.SCHEMA_STATEMENTS:
+        db_session.execute(text(statement))
+    params = {"name": "test_rate_limit", "interval": 10.0}
+    db_session.execute(text("DELETE FROM rate_limit WHERE name = :name"), params)
+    waits = [float(db_session.execute(coordination.RESERVE_RATE_SLOT, params).scalar()) for _ in range(3)]
+    assert waits[0] < 1 and 9 < waits[1] < 11 and 19 < waits[2] < 21
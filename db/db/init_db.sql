@@ -8,20 +8,219 @@ CREATE TABLE IF NOT EXISTS public.address (
   road_name_address VARCHAR(500),        -- 도로명주소 (중복 허용)
   x DOUBLE PRECISION NOT NULL,           -- 경도
   y DOUBLE PRECISION NOT NULL,           -- 위도
-  geom geometry(Point, 4326) GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(x, y), 4326)) STORED
+  geom geometry(Point, 4326) GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(x, y), 4326)) STORED,
+  row_hash VARCHAR(64),                  -- CSV 원본 행 지문 (증분 적재용)
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now() -- 추가/좌표 변경 시각 (toORS since 필터)
 );
 
-CREATE INDEX IF NOT EXISTS idx_address_geom ON public.address USING GIST (geom);
+-- 유효 좌표만 (x/y = -1 은 geocoding 전 행, geom 조회는 모두 이 조건 포함) / 좌표 backfill 대상 (부분 인덱스)
+CREATE INDEX IF NOT EXISTS idx_address_valid_geom ON public.address USING GIST (geom) WHERE x != -1 AND y != -1;
+CREATE INDEX IF NOT EXISTS idx_address_missing_coords ON public.address (row_hash) WHERE (x = -1 OR y = -1);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_address_row_hash ON public.address (row_hash);
+CREATE INDEX IF NOT EXISTS idx_address_landlot_address ON public.address (landlot_address);
+CREATE INDEX IF NOT EXISTS idx_address_updated_at ON public.address (updated_at);
 
 -- 3. impossible 테이블 생성
 CREATE TABLE IF NOT EXISTS public.impossible (
+  id BIGINT GENERATED BY DEFAULT AS IDENTITY,
   landlot_address VARCHAR(500) NOT NULL,
   centroid_x DOUBLE PRECISION,
   centroid_y DOUBLE PRECISION,
   polygon_geom geometry(Polygon, 4326),
-  vertices JSONB
+  vertices JSONB,
+  origin_x DOUBLE PRECISION,             -- 계산 당시 매장 경도 (좌표 변경 시 재계산)
+  origin_y DOUBLE PRECISION,             -- 계산 당시 매장 위도
+  method VARCHAR(16),                    -- 계산 방식 (ors / local / buffer / csv)
+  address_row_hash VARCHAR(64),          -- 계산 대상 매장 (address.row_hash, CSV 로 적재한 구역은 NULL)
+  computed_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
 CREATE INDEX IF NOT EXISTS idx_impossible_geom ON public.impossible USING GIST (polygon_geom);
+CREATE INDEX IF NOT EXISTS idx_impossible_landlot_address ON public.impossible (landlot_address);
+CREATE INDEX IF NOT EXISTS idx_impossible_address_row_hash ON public.impossible (address_row_hash);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_impossible_id ON public.impossible (id);
 
+-- 3-1. 줌 구간별 단순화 polygon (지도 표시용, refresh_polygon_lod 로 갱신)
+CREATE TABLE IF NOT EXISTS public.impossible_lod (
+  impossible_id BIGINT NOT NULL,
+  zoom_band SMALLINT NOT NULL,
+  geom geometry(Polygon, 4326) NOT NULL,
+  PRIMARY KEY (zoom_band, impossible_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_impossible_lod_geom ON public.impossible_lod USING GIST (geom);
+
+-- 4. CSV 적재 상태 테이블 (파일 해시가 같으면 적재 생략)
+CREATE TABLE IF NOT EXISTS public.ingest_state (
+  source VARCHAR(100) PRIMARY KEY,
+  content_hash VARCHAR(64) NOT NULL,
+  row_count INTEGER NOT NULL,
+  loaded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- 5. geocode / reverse geocode 캐시 (kind: geocode=정규화 주소, reverse=격자 좌표)
+CREATE TABLE IF NOT EXISTS public.geocode_cache (
+  kind VARCHAR(16) NOT NULL,
+  cache_key VARCHAR(500) NOT NULL,
+  payload JSONB NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (kind, cache_key)
+);
+
+-- 5-1. 로컬 상가(POI) 저장소 (덤프 적재 + 네이버 검색 결과 누적)
+CREATE TABLE IF NOT EXISTS public.poi (
+  id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  name VARCHAR(500) NOT NULL,
+  category VARCHAR(200),
+  address VARCHAR(500) NOT NULL DEFAULT '',
+  x DOUBLE PRECISION NOT NULL,           -- 경도
+  y DOUBLE PRECISION NOT NULL,           -- 위도
+  geom geometry(Point, 4326) GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(x, y), 4326)) STORED,
+  source VARCHAR(16) NOT NULL,           -- import / naver
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_poi_name_address ON public.poi (name, address);
+CREATE INDEX IF NOT EXISTS idx_poi_geom ON public.poi USING GIST (geom);
+
+-- 5-2. geohash 셀별 로컬 POI 보유 여부 (import: 덤프 적재, naver: samples 회 검색 누적)
+CREATE TABLE IF NOT EXISTS public.poi_coverage (
+  cell VARCHAR(12) PRIMARY KEY,
+  source VARCHAR(16) NOT NULL,
+  samples INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- 5-3. 적용된 스키마 마이그레이션 (app/core/schema.py MIGRATIONS)
+CREATE TABLE IF NOT EXISTS public.schema_migrations (
+  version INTEGER PRIMARY KEY,
+  description VARCHAR(200) NOT NULL,
+  applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- 5-4. 앱 시작 초기화 완료 기록 (app/core/coordination.py, 지문이 같으면 다른 인스턴스/재시작은 초기화 생략)
+CREATE TABLE IF NOT EXISTS public.init_state (
+  name VARCHAR(100) PRIMARY KEY,
+  fingerprint VARCHAR(64) NOT NULL,
+  completed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  completed_by VARCHAR(255)
+);
+
+-- 5-5. 제한 구역 계산 작업 상태 (app/services/zone_job.py, 어느 인스턴스에서든 조회/취소 요청)
+CREATE TABLE IF NOT EXISTS public.zone_job (
+  id VARCHAR(32) PRIMARY KEY,
+  status VARCHAR(16) NOT NULL,           -- pending / running / done / failed / cancelled
+  force BOOLEAN NOT NULL DEFAULT false,
+  method VARCHAR(16) NOT NULL,
+  total INTEGER NOT NULL DEFAULT 0,
+  succeeded INTEGER NOT NULL DEFAULT 0,
+  failed INTEGER NOT NULL DEFAULT 0,
+  retried INTEGER NOT NULL DEFAULT 0,
+  error TEXT,
+  owner VARCHAR(255),                    -- 실행 중인 인스턴스 (hostname)
+  cancel_requested BOOLEAN NOT NULL DEFAULT false,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  started_at TIMESTAMPTZ,
+  finished_at TIMESTAMPTZ,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- 5-6. 여러 인스턴스가 함께 쓰는 외부 API 요청 제한 (app/core/coordination.py SharedRateLimiter, 다음 허용 시각)
+CREATE TABLE IF NOT EXISTS public.rate_limit (
+  name VARCHAR(100) PRIMARY KEY,
+  next_at TIMESTAMPTZ NOT NULL
+);
+
+-- 6. 테이블 변경 version (벡터 타일 캐시 무효화용, 변경 구문마다 트리거가 1씩 증가)
+CREATE TABLE IF NOT EXISTS public.data_version (
+  table_name VARCHAR(100) PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION public.bump_data_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  INSERT INTO public.data_version (table_name, version, updated_at)
+  VALUES (TG_TABLE_NAME, 1, now())
+  ON CONFLICT (table_name)
+  DO UPDATE SET version = public.data_version.version + 1, updated_at = now();
+  RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER trg_address_data_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.address
+FOR EACH STATEMENT EXECUTE FUNCTION public.bump_data_version();
+
+CREATE OR REPLACE TRIGGER trg_impossible_data_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.impossible
+FOR EACH STATEMENT EXECUTE FUNCTION public.bump_data_version();
+
+-- 6-1. DB 별 고유 식별자 (DB 를 새로 만들면 바뀜, 메모리 인덱스 스냅샷 파일 이름에 사용, app/services/snapshot.py)
+CREATE TABLE IF NOT EXISTS public.db_identity (
+  singleton BOOLEAN PRIMARY KEY DEFAULT true CHECK (singleton),
+  token UUID NOT NULL DEFAULT gen_random_uuid(),
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+INSERT INTO public.db_identity DEFAULT VALUES ON CONFLICT DO NOTHING;
+
+-- 7. 제한 구역 합집합 레이어: 0.01도(약 1km) 격자 칸별로 ST_Union 후 ST_Subdivide 한 조각 (겹침 없음)
+--    칸 크기는 app/core/schema.py COVERAGE_CELL_DEG 와 같아야 합니다.
+CREATE TABLE IF NOT EXISTS public.impossible_coverage (
+  id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+  cell_x INTEGER NOT NULL,
+  cell_y INTEGER NOT NULL,
+  geom geometry(Polygon, 4326) NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_impossible_coverage_geom ON public.impossible_coverage USING GIST (geom);
+CREATE INDEX IF NOT EXISTS idx_impossible_coverage_cell ON public.impossible_coverage (cell_x, cell_y);
+
+-- 7-1. impossible 이 바뀐 칸 (트리거가 기록, 앱이 같은 트랜잭션에서 다시 계산 후 비움)
+CREATE TABLE IF NOT EXISTS public.impossible_coverage_dirty (
+  cell_x INTEGER NOT NULL,
+  cell_y INTEGER NOT NULL,
+  PRIMARY KEY (cell_x, cell_y)
+);
+
+CREATE OR REPLACE FUNCTION public.coverage_cells(g geometry)
+RETURNS TABLE (cell_x INTEGER, cell_y INTEGER)
+LANGUAGE sql IMMUTABLE AS $$
+  SELECT cx, cy
+  FROM generate_series(floor(ST_XMin(g) / 0.01)::int, floor(ST_XMax(g) / 0.01)::int) cx,
+       generate_series(floor(ST_YMin(g) / 0.01)::int, floor(ST_YMax(g) / 0.01)::int) cy
+$$;
+
+CREATE OR REPLACE FUNCTION public.mark_coverage_dirty() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.polygon_geom IS NOT NULL THEN
+    INSERT INTO public.impossible_coverage_dirty (cell_x, cell_y)
+    SELECT * FROM public.coverage_cells(OLD.polygon_geom)
+    ON CONFLICT DO NOTHING;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.polygon_geom IS NOT NULL THEN
+    INSERT INTO public.impossible_coverage_dirty (cell_x, cell_y)
+    SELECT * FROM public.coverage_cells(NEW.polygon_geom)
+    ON CONFLICT DO NOTHING;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.clear_coverage() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  DELETE FROM public.impossible_coverage;
+  DELETE FROM public.impossible_coverage_dirty;
+  RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE TRIGGER trg_impossible_coverage_dirty
+AFTER INSERT OR UPDATE OF polygon_geom OR DELETE ON public.impossible
+FOR EACH ROW EXECUTE FUNCTION public.mark_coverage_dirty();
 
+CREATE OR REPLACE TRIGGER trg_impossible_coverage_truncate
+AFTER TRUNCATE ON public.impossible
+FOR EACH STATEMENT EXECUTE FUNCTION public.clear_coverage();
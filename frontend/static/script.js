@@ -35,8 +35,9 @@ function initMap() {
     };
     map = new naver.maps.Map('map', mapOptions);
     
-    // 1. 다각형 데이터 로드
+    // 1. 다각형 데이터 로드 (지도 이동/확대가 끝날 때마다 현재 화면 영역 기준으로 다시 로드)
     loadPolygons();
+    naver.maps.Event.addListener(map, 'idle', scheduleLoadPolygons);
 
     // 2. 지도 클릭 이벤트
     naver.maps.Event.addListener(map, 'click', function(e) {
@@ -228,16 +229,39 @@ function moveToLocation(address) {
 
 // ---------------------------------------------------
 // [수정 1] 라이브러리 없이 네이버 공식 MultiPolygon 사용
+// [수정 2] 화면 영역 + 줌 레벨 기준으로 단순화된 다각형만 요청 (지도 이동/확대 시 다시 로드)
 // ---------------------------------------------------
+var polygonOverlay = null;
+var polygonRequestId = 0;
+var polygonReloadTimer = null;
+
+function scheduleLoadPolygons() {
+    clearTimeout(polygonReloadTimer);
+    polygonReloadTimer = setTimeout(loadPolygons, 200);
+}
+
 async function loadPolygons() {
+    const requestId = ++polygonRequestId; // 늦게 도착한 이전 요청 결과는 무시
     try {
-        // [수정] 통신 포트를 8000으로 명시하여 오류 해결
-        const response = await fetch(`${DATA_URL}/getcoordinates/getPolygon`); 
-        if (!response.ok) return;
-        const data = await response.json();
-        
-        if (data.polygons && Array.isArray(data.polygons)) {
-            let allPaths = []; // 모든 경로를 여기에 모음 (하나의 배열로 합치기)
+        const bounds = map.getBounds();
+        const sw = bounds.getSW();
+        const ne = bounds.getNE();
+        const params = new URLSearchParams({
+            min_x: sw.lng(), min_y: sw.lat(),
+            max_x: ne.lng(), max_y: ne.lat(),
+            zoom: map.getZoom(),
+            dissolved: true // 겹치는 구역을 합친 조각 (구멍은 반대 방향 ring 으로 옴)
+        });
+
+        let allPaths = []; // 모든 경로를 여기에 모음 (하나의 배열로 합치기)
+        let cursor = 0;
+        while (cursor !== null) {
+            params.set('cursor', cursor);
+            // [수정] 통신 포트를 8000으로 명시하여 오류 해결
+            const response = await fetch(`${DATA_URL}/getcoordinates/getPolygon?${params}`); 
+            if (!response.ok || requestId !== polygonRequestId) return;
+            const data = await response.json();
+            if (!data.polygons || !Array.isArray(data.polygons)) break;
 
             data.polygons.forEach(rawData => {
                 let pathData = rawData;
@@ -257,21 +281,29 @@ async function loadPolygons() {
                     allPaths.push(path); // 개별 다각형 경로를 전체 배열에 추가
                 }
             });
+            cursor = data.next_cursor ?? null;
+        }
+        if (requestId !== polygonRequestId) return;
 
-            // 네이버 지도 공식 기능: paths에 '배열의 배열'을 넣으면 멀티 폴리곤이 됨
-            // 중요: window.onload에서 주입한 'fill-rule: nonzero' CSS 덕분에 구멍이 안 뚫림
-            if (allPaths.length > 0) {
-                new naver.maps.Polygon({
-                    map: map,
-                    paths: allPaths, 
-                    fillColor: '#ff0000',
-                    fillOpacity: 0.3,
-                    strokeColor: '#ff0000',
-                    strokeOpacity: 0.0,
-                    strokeWeight: 0,
-                    clickable: false
-                });
-            }
+        // 이전 화면의 다각형 제거 후 다시 그림
+        if (polygonOverlay) {
+            polygonOverlay.setMap(null);
+            polygonOverlay = null;
+        }
+
+        // 네이버 지도 공식 기능: paths에 '배열의 배열'을 넣으면 멀티 폴리곤이 됨
+        // 중요: window.onload에서 주입한 'fill-rule: nonzero' CSS 덕분에 구멍이 안 뚫림
+        if (allPaths.length > 0) {
+            polygonOverlay = new naver.maps.Polygon({
+                map: map,
+                paths: allPaths, 
+                fillColor: '#ff0000',
+                fillOpacity: 0.3,
+                strokeColor: '#ff0000',
+                strokeOpacity: 0.0,
+                strokeWeight: 0,
+                clickable: false
+            });
         }
     } catch (error) { console.error("다각형 로드 중 오류:", error); }
 }